@@ -9,7 +9,7 @@ from data.vqa.blueprint_transforms import detect_direction_system
 from data.vqa.position_utils import normalize_position_references_in_qa
 from data.vqa.bounding_box_utils import calculate_blueprint_bounding_box
 from data.vqa.direction_utils import Direction
-from fle.agents.data.screenshots_from_run import create_factorio_instance
+from fle.env.tools.admin.render.batch import render_blueprint
 from fle.commons.models.rendered_image import RenderedImage
 from dotenv import load_dotenv
 
@@ -284,9 +284,8 @@ def render_blueprint_image() -> Solver:
     This solver ensures that only one image is generated per blueprint,
     preventing duplicate images when multiple solvers run on the same blueprint.
 
-    Should be run early in the solver chain.
+    Should be run early in the solver chain. Blueprints are rendered offline, without a Factorio server.
     """
-    instance = create_factorio_instance()
 
     async def solve(state: TaskState, generate: Generate) -> TaskState:
         # Check if image is already rendered
@@ -297,11 +296,8 @@ def render_blueprint_image() -> Solver:
         if not blueprint:
             return state
 
-        # Render the image (use a copy to avoid modifying the original blueprint)
-        import copy
-
-        blueprint_copy = copy.deepcopy(blueprint)
-        image: RenderedImage = instance.namespace._render(blueprint=blueprint_copy)
+        # Render the image (on a copy, so the original blueprint is not modified)
+        image: RenderedImage = render_blueprint(blueprint)
 
         # Save the image using the new folder structure
         from data.vqa.image_utils import save_rendered_image
@@ -1,8 +1,9 @@
 import json
 from pathlib import Path
 
-from fle.env.tools.admin.render.renderer import ImageResolver, Renderer
-from fle.env.tools.admin.render.utils import parse_blueprint
+from PIL import Image
+
+from fle.env.tools.admin.render.batch import MANIFEST_FILE, render_blueprints
 
 
 def render_blueprints_from_directory(
@@ -28,101 +29,18 @@ def render_blueprints_from_directory(
     else:
         output_path = Path(output_dir)
 
-    output_path.mkdir(exist_ok=True)
-
-    # Set up paths for resources
-    sprites_dir = Path(".fle/sprites")
-
-    # Try to import the enhanced resolver
-    try:
-        print("Using BasisImageResolver for .basis file support")
-        # base = "/Users/jackhopkins/PycharmProjects/PaperclipMaximiser/data/rendering"
-        # Load game data
-        # game_data, game_recipes = load_game_data(f"{base}/data.json")
-        image_resolver = ImageResolver(".fle/sprites")
-    except ImportError:
-        print("BasisImageResolver not found, using simple PNG resolver")
-        print("Place PNG files in 'images' directory")
-        # Fallback to simple resolver
-        # game_data, game_recipes = load_game_data("data.json")
-        image_resolver = ImageResolver(str(sprites_dir))
-
-    # Find all JSON files
-    json_files = list(blueprints_path.glob("*.json"))
-
-    if not json_files:
-        print(f"No JSON files found in {blueprints_dir}")
-        return
-
-    print(f"Found {len(json_files)} blueprint files to render")
-
-    # Process each blueprint
-    successful = 0
-    failed = 0
-
-    for json_file in json_files[:3]:
-        try:
-            print(f"\nProcessing: {json_file.name}")
-
-            # Load the JSON file
-            with open(json_file, "r") as f:
-                blueprint_data = json.load(f)
-
-            # Handle different blueprint formats
-            if "blueprint" in blueprint_data:
-                blueprint_content = blueprint_data["blueprint"]
-            elif "entities" in blueprint_data:
-                blueprint_content = blueprint_data
-            else:
-                # Try to parse as blueprint string
-                if isinstance(blueprint_data, str):
-                    parsed = parse_blueprint(blueprint_data)
-                    blueprint_content = parsed.get("blueprint", parsed)
-                else:
-                    print(f"  Warning: Unknown blueprint format in {json_file.name}")
-                    failed += 1
-                    continue
-
-            # Create blueprint object
-            blueprint = Renderer(
-                sprites_dir,
-                entities=blueprint_content["entities"],
-            )
-
-            # Calculate render size
-            size = blueprint.get_size()
-            if size["width"] == 0 or size["height"] == 0:
-                print("  Warning: Blueprint has no entities to render")
-                failed += 1
-                continue
-
-            scaling = 32
-            width = min((size["width"] + 2) * scaling, 2048)  # Cap max width
-            height = min((size["height"] + 2) * scaling, 2048)  # Cap max height
-
-            # Render the blueprint
-            image = blueprint.render(width, height, image_resolver)
-
-            # Save the image
-            output_filename = json_file.stem + ".png"
-            output_file = output_path / output_filename
-            image.save(output_file)
-            print(f"  Rendered to: {output_file} ({width}x{height})")
-
-            # Display the image if requested
-            if show_images:
-                image.show()
-
-            successful += 1
-
-        except Exception as e:
-            print(f"  Error processing {json_file.name}: {str(e)}")
-            failed += 1
-
-    print("\n=== Summary ===")
-    print(f"Successfully rendered: {successful}")
-    print(f"Failed: {failed}")
-    print(f"Output directory: {output_path}")
+    # The manifest is appended to, so only the entries after this offset are from this run
+    manifest_path = output_path / MANIFEST_FILE
+    start = manifest_path.stat().st_size if manifest_path.exists() else 0
+    render_blueprints([blueprints_path], output_path)
+
+    if show_images:
+        with open(manifest_path) as f:
+            f.seek(start)
+            for line in f:
+                entry = json.loads(line)
+                if "error" not in entry:
+                    Image.open(entry["image"]).show()
 
 
 def main():
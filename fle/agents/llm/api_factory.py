@@ -1,7 +1,13 @@
+import asyncio
+import importlib.util
+import json
 import os
 import logging
+import weakref
+from typing import Dict, Tuple
 
-from openai import AsyncOpenAI
+import httpx
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
 from tenacity import retry, wait_exponential, stop_after_attempt, stop_after_delay
 
 from fle.agents.llm.metrics import timing_tracker, track_timing_async
@@ -24,6 +30,57 @@ def _get_api_key_manager():
 
 API_KEY_MANAGER_AVAILABLE = True  # Assume available, handle at runtime
 
+# Upper bound on concurrent requests to each provider from this process, which is also the size of the
+# connection pool kept alive to it
+MAX_CONCURRENT_REQUESTS = int(os.getenv("FLE_LLM_MAX_CONCURRENT_REQUESTS", "64"))
+
+# HTTP/2 needs the optional h2 package (pip install 'httpx[http2]')
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+class ProviderPool:
+    """Clients, request limits and in-flight requests shared by every APIFactory on one event loop"""
+
+    def __init__(self):
+        self.clients: Dict[Tuple[str, str], AsyncOpenAI] = {}
+        self.semaphores: Dict[str, asyncio.Semaphore] = {}
+        self.in_flight: Dict[Tuple[str, str], asyncio.Future] = {}
+
+    def get_client(self, base_url: str, api_key: str) -> AsyncOpenAI:
+        """Client for the provider and key, reusing its keep-alive connections across calls"""
+        key = (base_url, api_key)
+        if key not in self.clients:
+            self.clients[key] = AsyncOpenAI(
+                base_url=base_url,
+                api_key=api_key,
+                max_retries=0,  # We handle retries ourselves
+                http_client=DefaultAsyncHttpxClient(
+                    http2=HTTP2_AVAILABLE,
+                    limits=httpx.Limits(
+                        max_connections=MAX_CONCURRENT_REQUESTS,
+                        max_keepalive_connections=MAX_CONCURRENT_REQUESTS,
+                    ),
+                ),
+            )
+        return self.clients[key]
+
+    def get_semaphore(self, base_url: str) -> asyncio.Semaphore:
+        if base_url not in self.semaphores:
+            self.semaphores[base_url] = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        return self.semaphores[base_url]
+
+
+# Clients are bound to the event loop they were first used on, so there is one pool per loop
+_provider_pools: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, ProviderPool]" = weakref.WeakKeyDictionary()
+
+
+def get_provider_pool() -> ProviderPool:
+    """Provider pool of the running event loop"""
+    loop = asyncio.get_running_loop()
+    if loop not in _provider_pools:
+        _provider_pools[loop] = ProviderPool()
+    return _provider_pools[loop]
+
 
 class APIFactory:
     # Provider configurations
@@ -71,16 +128,25 @@ class APIFactory:
         },
     }
 
-    def __init__(self, model: str, beam: int = 1, api_key_config_file: str = None):
+    def __init__(
+        self,
+        model: str,
+        beam: int = 1,
+        api_key_config_file: str = None,
+        coalesce_requests: bool = False,
+    ):
         """Initialize APIFactory
 
         Args:
             model: Model name to use
             beam: Beam size for sampling
             api_key_config_file: Optional path to API key config file
+            coalesce_requests: Share one API call between identical requests made while it is in flight,
+                instead of sending each (only useful when duplicate samples aren't wanted)
         """
         self.model = model
         self.beam = beam
+        self.coalesce_requests = coalesce_requests
         self.api_key_config_file = (
             api_key_config_file  # Store for child process reinitialization
         )
@@ -205,54 +271,73 @@ class APIFactory:
         messages = remove_whitespace_blocks(messages)
         messages = merge_contiguous_messages(messages)
 
-        # Get API key with rotation
-        api_key = self._get_api_key(provider_config)
+        # Build the API call parameters
+        api_params = {
+            "model": model_to_use,
+            "messages": messages,
+            "max_tokens": kwargs.get("max_tokens", 256),
+            "temperature": kwargs.get("temperature", 0.3),
+            "logit_bias": kwargs.get("logit_bias"),
+            "n": kwargs.get("n_samples"),
+            "stop": kwargs.get("stop_sequences"),
+            "presence_penalty": kwargs.get("presence_penalty"),
+            "frequency_penalty": kwargs.get("frequency_penalty"),
+            "stream": False,
+        }
+
+        # Remove None values to avoid API errors
+        api_params = {k: v for k, v in api_params.items() if v is not None}
+
+        pool = get_provider_pool()
+        base_url = provider_config["base_url"]
+        if self.coalesce_requests:
+            request_key = (
+                base_url,
+                json.dumps(api_params, sort_keys=True, default=str),
+            )
+            pending = pool.in_flight.get(request_key)
+            if pending is None:
+                pending = asyncio.ensure_future(
+                    self._create_completion(pool, provider_config, api_params)
+                )
+                pool.in_flight[request_key] = pending
+                pending.add_done_callback(
+                    lambda _: pool.in_flight.pop(request_key, None)
+                )
+            # Cancelling one caller mustn't cancel the request for the others
+            response = await asyncio.shield(pending)
+        else:
+            response = await self._create_completion(pool, provider_config, api_params)
+
+        # Track reasoning tokens if available
+        if hasattr(response, "usage") and hasattr(response.usage, "reasoning_tokens"):
+            async with timing_tracker.track_async(
+                "reasoning",
+                model=model_to_use,
+                tokens=response.usage.reasoning_tokens,
+            ):
+                pass
 
-        # Create client
-        client = AsyncOpenAI(
-            base_url=provider_config["base_url"],
-            api_key=api_key,
-            max_retries=0,  # We handle retries ourselves
-        )
+        return response
 
-        try:
-            # Build the API call parameters
-            api_params = {
-                "model": model_to_use,
-                "messages": messages,
-                "max_tokens": kwargs.get("max_tokens", 256),
-                "temperature": kwargs.get("temperature", 0.3),
-                "logit_bias": kwargs.get("logit_bias"),
-                "n": kwargs.get("n_samples"),
-                "stop": kwargs.get("stop_sequences"),
-                "presence_penalty": kwargs.get("presence_penalty"),
-                "frequency_penalty": kwargs.get("frequency_penalty"),
-                "stream": False,
-            }
-
-            # Remove None values to avoid API errors
-            api_params = {k: v for k, v in api_params.items() if v is not None}
-
-            # Standard API call for all providers
-            response = await client.chat.completions.create(**api_params)
-            # Mark key as successful
-            self._mark_key_result(provider_config, api_key, success=True)
-
-            # Track reasoning tokens if available
-            if hasattr(response, "usage") and hasattr(
-                response.usage, "reasoning_tokens"
-            ):
-                async with timing_tracker.track_async(
-                    "reasoning",
-                    model=model_to_use,
-                    tokens=response.usage.reasoning_tokens,
-                ):
-                    pass
-
-            return response
-
-        except Exception as e:
-            # Mark key as having an error
-            self._mark_key_result(provider_config, api_key, success=False, error=e)
-            # Re-raise the exception to trigger retry mechanism
-            raise
+    async def _create_completion(
+        self, pool: ProviderPool, provider_config: dict, api_params: dict
+    ):
+        """Send the request with a pooled client, within the provider's concurrency limit"""
+        # Get API key with rotation
+        api_key = self._get_api_key(provider_config)
+        client = pool.get_client(provider_config["base_url"], api_key)
+
+        async with pool.get_semaphore(provider_config["base_url"]):
+            try:
+                # Standard API call for all providers
+                response = await client.chat.completions.create(**api_params)
+            except Exception as e:
+                # Mark key as having an error
+                self._mark_key_result(provider_config, api_key, success=False, error=e)
+                # Re-raise the exception to trigger retry mechanism
+                raise
+
+        # Mark key as successful
+        self._mark_key_result(provider_config, api_key, success=True)
+        return response
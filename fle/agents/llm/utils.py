@@ -13,7 +13,13 @@ def merge_contiguous_messages(messages):
             if isinstance(merged_messages[-1]["content"], str) and isinstance(
                 message["content"], str
             ):
-                merged_messages[-1]["content"] += "\n\n" + message["content"]
+                # Copy rather than mutate the caller's message, which a retry would merge again
+                merged_messages[-1] = {
+                    **merged_messages[-1],
+                    "content": merged_messages[-1]["content"]
+                    + "\n\n"
+                    + message["content"],
+                }
             else:
                 # If either has complex content (like images), don't merge
                 merged_messages.append(message)
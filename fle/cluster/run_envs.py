@@ -15,6 +15,8 @@ from platformdirs import user_state_dir
 START_RCON_PORT = 27000
 START_GAME_PORT = 34197
 RCON_PASSWORD = "factorio"
+# Containers discovered by fle.commons.cluster_ips, kept in the state dir until the cluster changes
+CONTAINER_CACHE_FILE = "containers.json"
 
 
 def resolve_state_dir() -> Path:
@@ -355,6 +357,7 @@ class ClusterManager:
             f"Starting {num_instances} Factorio instance(s) with scenario {scenario}..."
         )
         self._run_compose(["-f", str(self.compose_path), "up", "-d"])
+        (self.state_dir / CONTAINER_CACHE_FILE).unlink(missing_ok=True)
         print(
             f"Factorio cluster started with {num_instances} instance(s) using scenario {scenario}"
         )
@@ -367,6 +370,7 @@ class ClusterManager:
             sys.exit(1)
         print("Stopping Factorio cluster...")
         self._run_compose(["-f", str(self.compose_path), "down"])
+        (self.state_dir / CONTAINER_CACHE_FILE).unlink(missing_ok=True)
         print("Cluster stopped.")
 
     def restart(self):
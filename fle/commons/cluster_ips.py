@@ -1,50 +1,213 @@
-import subprocess
+"""
+Discovery of the Factorio containers running in the local Docker setup.
+
+Asking the Docker CLI for the containers' ports takes a `docker ps` plus a `docker inspect`, which adds up
+when every environment of an eval looks its server up. `ContainerRegistry` caches the containers' addresses
+and ports in the FLE state directory for `FLE_CONTAINER_CACHE_TTL` seconds, refreshes them with a single
+batched `docker inspect`, and checks that a cached container is still up with an RCON handshake before
+handing it out. `fle cluster start`/`stop` remove the cache.
+"""
+
 import json
-from typing import List
+import os
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import List, Optional
 
+from factorio_rcon import RCONBaseError, RCONClient
 
-def get_local_container_ips() -> tuple[List[str], List[int], List[int]]:
-    """Get IP addresses of running Factorio containers in the local Docker setup."""
-    # Get container IDs for factorio containers
-    cmd = ["docker", "ps", "--filter", "name=factorio_", "--format", '"{{.ID}}"']
-    result = subprocess.run(cmd, capture_output=True, text=True)
-    container_ids = result.stdout.strip().split("\n")
-    container_ids = [id.strip('"') for id in container_ids]
+from fle.cluster.run_envs import (
+    CONTAINER_CACHE_FILE,
+    RCON_PASSWORD,
+    resolve_state_dir,
+)
 
-    if not container_ids or container_ids[0] == "":
-        print("No running Factorio containers found")
-        return []
-
-    ips = []
-    udp_ports = []
-    tcp_ports = []
-    for container_id in container_ids:
-        # Get container details in JSON format
-        cmd = ["docker", "inspect", container_id]
+DEFAULT_CACHE_TTL_SECONDS = 300
+# RCON handshakes are local, so a container that does not answer in time is down
+PROBE_TIMEOUT_SECONDS = 1.0
+
+
+@dataclass(frozen=True)
+class FactorioContainer:
+    """A running Factorio container and its host ports"""
+
+    name: str
+    address: str
+    tcp_port: int
+    udp_port: int
+
+
+def _parse_container(container_info: dict) -> Optional[FactorioContainer]:
+    """Container from its `docker inspect` entry, if it publishes an RCON and a game port"""
+    tcp_port = udp_port = None
+    for port, bindings in (container_info["NetworkSettings"]["Ports"] or {}).items():
+        if not bindings:
+            continue
+        if "/udp" in port and udp_port is None:
+            udp_port = int(bindings[0]["HostPort"])
+        if "/tcp" in port and tcp_port is None:
+            tcp_port = int(bindings[0]["HostPort"])
+    if tcp_port is None or udp_port is None:
+        return None
+    return FactorioContainer(
+        name=container_info["Name"].lstrip("/"),
+        address="127.0.0.1",
+        tcp_port=tcp_port,
+        udp_port=udp_port,
+    )
+
+
+class ContainerRegistry:
+    """Factorio containers by index (ordered by RCON port), cached in memory and on disk"""
+
+    def __init__(
+        self,
+        cache_path: Optional[Path] = None,
+        ttl_seconds: Optional[float] = None,
+        probe_timeout: float = PROBE_TIMEOUT_SECONDS,
+    ):
+        """
+        Args:
+            cache_path: File caching the containers (defaults to the FLE state directory)
+            ttl_seconds: Age after which the cache is refreshed (defaults to FLE_CONTAINER_CACHE_TTL)
+            probe_timeout: Timeout of the RCON handshake checking that a container is up
+        """
+        self.cache_path = cache_path or resolve_state_dir() / CONTAINER_CACHE_FILE
+        if ttl_seconds is None:
+            ttl_seconds = float(
+                os.getenv("FLE_CONTAINER_CACHE_TTL", DEFAULT_CACHE_TTL_SECONDS)
+            )
+        self.ttl_seconds = ttl_seconds
+        self.probe_timeout = probe_timeout
+        self._containers: Optional[List[FactorioContainer]] = None
+        self._discovered_at = 0.0
+        self._lock = threading.Lock()
+
+    def containers(self, refresh: bool = False) -> List[FactorioContainer]:
+        """Running containers, from the cache unless it expired or `refresh` is set"""
+        with self._lock:
+            if not refresh and self._containers is None:
+                self._load_cache()
+            expired = time.time() - self._discovered_at > self.ttl_seconds
+            if refresh or self._containers is None or expired:
+                self._containers = self._discover()
+                self._discovered_at = time.time()
+                self._save_cache()
+            return list(self._containers)
+
+    def get(self, index: int) -> FactorioContainer:
+        """
+        Container at `index`, rediscovering the containers once if it is missing or does not answer.
+        :raises RuntimeError: If there is no such container
+        """
+        containers = self.containers()
+        if index < len(containers) and self.is_alive(containers[index]):
+            return containers[index]
+
+        containers = self.containers(refresh=True)
+        if not containers:
+            raise RuntimeError("No Factorio containers available")
+        if index >= len(containers):
+            raise RuntimeError(
+                f"Container index {index} exceeds available containers ({len(containers)})"
+            )
+        return containers[index]
+
+    def is_alive(self, container: FactorioContainer) -> bool:
+        """Whether the container's server completes an RCON handshake"""
+        try:
+            client = RCONClient(
+                container.address,
+                container.tcp_port,
+                RCON_PASSWORD,
+                timeout=self.probe_timeout,
+            )
+        except (RCONBaseError, OSError):
+            return False
+        client.close()
+        return True
+
+    def alive(self, containers: List[FactorioContainer]) -> List[bool]:
+        """Probe the containers concurrently, returning whether each is up"""
+        if not containers:
+            return []
+        with ThreadPoolExecutor(max_workers=min(32, len(containers))) as executor:
+            return list(executor.map(self.is_alive, containers))
+
+    def invalidate(self):
+        """Forget the cached containers, so that the next lookup asks Docker"""
+        with self._lock:
+            self._containers = None
+            self._discovered_at = 0.0
+            self.cache_path.unlink(missing_ok=True)
+
+    def _discover(self) -> List[FactorioContainer]:
+        cmd = ["docker", "ps", "-q", "--filter", "name=factorio_"]
         result = subprocess.run(cmd, capture_output=True, text=True)
-        container_info = json.loads(result.stdout)
+        container_ids = result.stdout.split()
+        if not container_ids:
+            return []
+
+        # One inspect for all the containers
+        result = subprocess.run(
+            ["docker", "inspect", *container_ids], capture_output=True, text=True
+        )
+        containers = [
+            container
+            for container in map(_parse_container, json.loads(result.stdout or "[]"))
+            if container is not None
+        ]
+        return sorted(containers, key=lambda container: container.tcp_port)
+
+    def _load_cache(self):
+        try:
+            with open(self.cache_path) as f:
+                cache = json.load(f)
+            self._containers = [FactorioContainer(**c) for c in cache["containers"]]
+            self._discovered_at = cache["discovered_at"]
+        except (OSError, ValueError, KeyError, TypeError):
+            self._containers = None
+
+    def _save_cache(self):
+        cache = {
+            "discovered_at": self._discovered_at,
+            "containers": [asdict(container) for container in self._containers],
+        }
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            # Replaced atomically, as concurrent eval processes share the file
+            tmp_path = self.cache_path.with_suffix(f".{os.getpid()}.tmp")
+            tmp_path.write_text(json.dumps(cache))
+            tmp_path.replace(self.cache_path)
+        except OSError as e:
+            print(f"Could not cache Factorio containers in {self.cache_path}: {e}")
 
-        # Get host ports for UDP game port
-        ports = container_info[0]["NetworkSettings"]["Ports"]
 
-        # Find the UDP port mapping
-        for port, bindings in ports.items():
-            if "/udp" in port and bindings:
-                udp_port = bindings[0]["HostPort"]
-                udp_ports.append(int(udp_port))
+_container_registry: Optional[ContainerRegistry] = None
 
-            if "/tcp" in port and bindings:
-                tcp_port = bindings[0]["HostPort"]
-                tcp_ports.append(int(tcp_port))
 
-        # Append the IP address with the UDP port to the list
-        ips.append("127.0.0.1")
+def get_container_registry() -> ContainerRegistry:
+    """Container registry shared by the process"""
+    global _container_registry
+    if _container_registry is None:
+        _container_registry = ContainerRegistry()
+    return _container_registry
 
-    # order by port number
-    udp_ports.sort(key=lambda x: int(x))
-    tcp_ports.sort(key=lambda x: int(x))
 
-    return ips, udp_ports, tcp_ports
+def get_local_container_ips() -> tuple[List[str], List[int], List[int]]:
+    """Get IP addresses of running Factorio containers in the local Docker setup."""
+    containers = get_container_registry().containers()
+    if not containers:
+        print("No running Factorio containers found")
+    return (
+        [container.address for container in containers],
+        [container.udp_port for container in containers],
+        [container.tcp_port for container in containers],
+    )
 
 
 if __name__ == "__main__":
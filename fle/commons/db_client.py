@@ -1,3 +1,5 @@
+import asyncio
+import functools
 import json
 import logging
 import math
@@ -7,6 +9,7 @@ import sqlite3
 import statistics
 import threading
 from abc import ABC
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
 from pathlib import Path
 from typing import Any, Dict, List, Optional
@@ -16,6 +19,7 @@ from tenacity import retry_if_exception_type, wait_exponential, wait_random_expo
 
 from fle.commons.models.conversation import Conversation
 from fle.commons.models.game_state import GameState
+from fle.commons.models.message_store import MESSAGE_HASHES_KEY, message_store
 from fle.commons.models.program import Program
 
 
@@ -53,15 +57,37 @@ def get_sqlite_exceptions():
     return (sqlite3.OperationalError, sqlite3.InterfaceError, sqlite3.DatabaseError)
 
 
+def run_in_db_thread(method):
+    """
+    Make a blocking DBClient method awaitable by running it on the client's worker threads, so that queries
+    don't block the event loop and concurrent callers overlap (up to `max_connections` at a time).
+    """
+
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, functools.partial(method, self, *args, **kwargs)
+        )
+
+    return wrapper
+
+
 class DBClient(ABC):
     def __init__(
         self,
         max_conversation_length: int = 20,
         min_connections: int = 5,
         max_connections: int = 20,
+        deduplicate_conversations: bool = False,
         **db_config,
     ):
         self.max_conversation_length = max_conversation_length
+        # Whether to store conversations as hashes of messages in the messages table (see `message_store`)
+        self.deduplicate_conversations = deduplicate_conversations
+        self._stored_message_hashes = set()
+        # Conversations stored by reference can be read whether or not this client deduplicates
+        message_store.add_loader(self.load_messages)
         # Don't store connection as instance variable
         # Instead create connection pool
         # self.pool = []
@@ -70,6 +96,11 @@ class DBClient(ABC):
         self.min_connections = min_connections
         self.max_connections = max_connections
         self._lock = threading.Lock()
+        # One worker per pooled connection, so a worker never waits for (or exhausts) the pool. Methods must
+        # release their connection before building Programs, as `load_messages` takes one of its own.
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_connections, thread_name_prefix="db_client"
+        )
         self.db_config = db_config
 
     async def initialize(self):
@@ -81,16 +112,58 @@ class DBClient(ABC):
         """Regular context manager for database connections"""
         pass
 
-    async def get_beam_heads(self, version: int, beam_width: int) -> List[Program]:
+    def _encode_conversation(self, cur, conversation: Conversation, placeholder="%s"):
+        """
+        JSON for a program's conversation_json. When deduplicating, messages that aren't stored yet are
+        inserted into the messages table and the conversation is stored as the list of its message hashes.
+
+        Returns:
+            The JSON, and the hashes of the messages inserted (to remember once committed)
+        """
+        data = conversation.dict()
+        if not self.deduplicate_conversations:
+            return json.dumps(data), []
+
+        hashes = [message_store.add(message) for message in data["messages"]]
+        new_messages = {
+            key: message
+            for key, message in zip(hashes, data["messages"])
+            if key not in self._stored_message_hashes
+        }
+        if new_messages:
+            cur.executemany(
+                f"""
+                INSERT INTO messages (hash, message_json) VALUES ({placeholder}, {placeholder})
+                ON CONFLICT (hash) DO NOTHING
+                """,
+                [(key, json.dumps(message)) for key, message in new_messages.items()],
+            )
+        return json.dumps({MESSAGE_HASHES_KEY: hashes}), list(new_messages)
+
+    def load_messages(self, hashes: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Messages stored under these hashes, for `message_store`"""
+        with self.get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    "SELECT hash, message_json FROM messages WHERE hash = ANY(%s)",
+                    (hashes,),
+                )
+                messages = {key: json.loads(message) for key, message in cur.fetchall()}
+        self._stored_message_hashes.update(messages)
+        return messages
+
+    @run_in_db_thread
+    def get_beam_heads(self, version: int, beam_width: int) -> List[Program]:
         """Get the highest value programs across all depths for a given version."""
         try:
             with self.get_connection() as conn:
                 with conn.cursor(cursor_factory=DictCursor) as cur:
-                    # Use a CTE to get diverse set of programs
+                    # Use a CTE to get diverse set of programs. Only the ranking columns are read here, the
+                    # full rows (with their large state and conversation) are fetched for the heads alone.
                     cur.execute(
                         """
                         WITH ProgramsByDepth AS (
-                            SELECT DISTINCT ON (depth) *
+                            SELECT DISTINCT ON (depth) id, depth, value
                             FROM programs
                             WHERE version = %s
                             AND state_json IS NOT NULL
@@ -104,7 +177,7 @@ class DBClient(ABC):
                         ) as depth_diverse
                         UNION DISTINCT
                         SELECT * FROM (
-                            SELECT * FROM programs
+                            SELECT id, depth, value FROM programs
                             WHERE version = %s
                             AND state_json IS NOT NULL
                             AND value IS NOT NULL
@@ -117,22 +190,30 @@ class DBClient(ABC):
                         (version, beam_width, version, beam_width * 2, beam_width),
                     )
 
-                    results = cur.fetchall()
-                    if not results:
+                    heads = [row["id"] for row in cur.fetchall()]
+                    if not heads:
                         logger.warning(f"No programs found for version {version}")
                         return []
 
-                    programs = [Program.from_row(dict(row)) for row in results]
-                    depths = [p.depth for p in programs]
-                    logger.info(
-                        f"Found {len(programs)} beam heads for version {version} - {depths}"
+                    cur.execute(
+                        "SELECT * FROM programs WHERE id = ANY(%s) ORDER BY value DESC",
+                        (heads,),
                     )
-                    return programs
+                    results = [dict(row) for row in cur.fetchall()]
+
+            # Built once the connection is back in the pool, as loading their messages takes another one
+            programs = [Program.from_row(row) for row in results]
+            depths = [p.depth for p in programs]
+            logger.info(
+                f"Found {len(programs)} beam heads for version {version} - {depths}"
+            )
+            return programs
         except Exception as e:
             logger.error(f"Error fetching beam heads: {e}", exc_info=True)
             return []
 
-    async def version_exists(self, version: int) -> bool:
+    @run_in_db_thread
+    def version_exists(self, version: int) -> bool:
         """Check if a version exists in the database"""
         try:
             with self.get_connection() as conn:
@@ -150,7 +231,8 @@ class DBClient(ABC):
             print(f"Error checking version existence: {e}")
             return False
 
-    async def get_version_metadata(self, version: int) -> dict:
+    @run_in_db_thread
+    def get_version_metadata(self, version: int) -> dict:
         """Get metadata for a specific version"""
         try:
             with self.get_connection() as conn:
@@ -170,64 +252,100 @@ class DBClient(ABC):
             print(f"Error fetching version metadata: {e}")
             return {}
 
+    def _program_row(self, program: Program, conversation_json: str) -> tuple:
+        """Values of a program for the columns of `PROGRAM_INSERT_COLUMNS`"""
+        return (
+            program.code,
+            program.value,
+            0,
+            program.parent_id,
+            program.state.to_raw() if program.state else None,
+            conversation_json,
+            program.completion_token_usage,
+            program.prompt_token_usage,
+            program.token_usage,
+            program.response,
+            program.holdout_value,
+            program.raw_reward,
+            program.version,
+            program.version_description,
+            program.model,
+            json.dumps(program.meta),
+            json.dumps(program.achievements),
+            program.instance,
+            program.depth / 2,
+            program.advantage,
+            program.ticks,
+            json.dumps(program.timing_metrics) if program.timing_metrics else None,
+            len(program.conversation.messages),
+        )
+
+    def _insert_program(self, cur, program: Program) -> List[str]:
+        """
+        Insert a program without committing, and set its id and created_at.
+
+        Returns:
+            The hashes of the messages inserted with it
+        """
+        conversation_json, new_message_hashes = self._encode_conversation(
+            cur, program.conversation
+        )
+        cur.execute(
+            f"""
+            INSERT INTO programs ({", ".join(PROGRAM_INSERT_COLUMNS)})
+            VALUES ({", ".join(["%s"] * len(PROGRAM_INSERT_COLUMNS))})
+            RETURNING id, created_at
+            """,
+            self._program_row(program, conversation_json),
+        )
+        program.id, program.created_at = cur.fetchone()
+        return new_message_hashes
+
+    def _create_programs(self, programs: List[Program]) -> List[Program]:
+        """Insert programs in a single transaction"""
+        with self.get_connection() as conn:
+            try:
+                cur = conn.cursor()
+                new_message_hashes = []
+                for program in programs:
+                    new_message_hashes += self._insert_program(cur, program)
+                conn.commit()
+            except Exception as e:
+                conn.rollback()
+                print(f"Error creating program: {e}")
+                raise e
+        self._stored_message_hashes.update(new_message_hashes)
+        return programs
+
     @tenacity.retry(
-        retry=retry_if_exception_type(get_postgres_exceptions()),
+        retry=retry_if_exception_type(
+            get_postgres_exceptions() + get_sqlite_exceptions()
+        ),
         wait=wait_random_exponential(multiplier=1, min=4, max=10),
     )
-    async def create_program(self, program: Program) -> Program:
+    @run_in_db_thread
+    def create_program(self, program: Program) -> Program:
         """Create a new program, now with connection management"""
-        try:
-            with self.get_connection() as conn:
-                with conn.cursor() as cur:
-                    cur.execute(
-                        """
-                        INSERT INTO programs (code, value, visits, parent_id, state_json, conversation_json, 
-                                           completion_token_usage, prompt_token_usage, token_usage, response, 
-                                           holdout_value, raw_reward, version, version_description, model, meta, 
-                                           achievements_json, instance, depth, advantage, ticks, timing_metrics_json)
-                        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                        RETURNING id, created_at
-                    """,
-                        (
-                            program.code,
-                            program.value,
-                            0,
-                            program.parent_id,
-                            program.state.to_raw() if program.state else None,
-                            json.dumps(program.conversation.dict()),
-                            program.completion_token_usage,
-                            program.prompt_token_usage,
-                            program.token_usage,
-                            program.response,
-                            program.holdout_value,
-                            program.raw_reward,
-                            program.version,
-                            program.version_description,
-                            program.model,
-                            json.dumps(program.meta),
-                            json.dumps(program.achievements),
-                            program.instance,
-                            program.depth / 2,
-                            program.advantage,
-                            program.ticks,
-                            json.dumps(program.timing_metrics)
-                            if program.timing_metrics
-                            else None,
-                        ),
-                    )
+        return self._create_programs([program])[0]
 
-                    id, created_at = cur.fetchone()
-                    conn.commit()
-                    program.id = id
-                    program.created_at = created_at
-                    return program
-        except Exception as e:
-            conn.rollback()
-            print(f"Error creating program: {e}")
-            raise e
+    @tenacity.retry(
+        retry=retry_if_exception_type(
+            get_postgres_exceptions() + get_sqlite_exceptions()
+        ),
+        wait=wait_random_exponential(multiplier=1, min=4, max=10),
+    )
+    @run_in_db_thread
+    def create_programs(self, programs: List[Program]) -> List[Program]:
+        """Create several programs in one transaction on one connection, e.g. the evaluated children of a node"""
+        return self._create_programs(programs)
+
+    def _release_message_loader(self):
+        """Stop `message_store` from loading messages through this client"""
+        message_store.remove_loader(self.load_messages)
 
     async def cleanup(self):
         """Clean up database resources"""
+        self._release_message_loader()
         if self._pool is not None:
             with self._lock:
                 if self._pool is not None:
@@ -242,7 +360,8 @@ class DBClient(ABC):
         retry=retry_if_exception_type(get_postgres_exceptions()),
         wait=wait_exponential(multiplier=1, min=4, max=10),
     )
-    async def get_all_program_rewards(self, version: int = None) -> List[float]:
+    @run_in_db_thread
+    def get_all_program_rewards(self, version: int = None) -> List[float]:
         """Get all program rewards with proper connection management"""
         query = """
             SELECT value 
@@ -268,7 +387,8 @@ class DBClient(ABC):
         retry=retry_if_exception_type(get_postgres_exceptions()),
         wait=wait_exponential(multiplier=1, min=4, max=10),
     )
-    async def get_largest_version(self) -> int:
+    @run_in_db_thread
+    def get_largest_version(self) -> int:
         query = """
             SELECT MAX(version)
             FROM programs
@@ -284,7 +404,8 @@ class DBClient(ABC):
             print(f"Error fetching largest version: {e}")
             return 0
 
-    async def get_largest_depth_in_version(self, version):
+    @run_in_db_thread
+    def get_largest_depth_in_version(self, version):
         query = f"""
                     SELECT MAX(depth)
                     FROM programs
@@ -301,9 +422,8 @@ class DBClient(ABC):
             print(f"Error fetching largest depth: {e}")
             return 0
 
-    async def execute_query(
-        self, query: str, params: tuple = None
-    ) -> List[Dict[str, Any]]:
+    @run_in_db_thread
+    def execute_query(self, query: str, params: tuple = None) -> List[Dict[str, Any]]:
         """Execute a query and return results as list of dictionaries"""
         try:
             with self.get_connection() as conn:
@@ -322,7 +442,8 @@ class DBClient(ABC):
         retry=retry_if_exception_type(get_postgres_exceptions()),
         wait=wait_random_exponential(multiplier=1, min=4, max=10),
     )
-    async def sample_parent(
+    @run_in_db_thread
+    def sample_parent(
         self,
         version=1,
         compression_strength: Optional[float] = None,
@@ -355,19 +476,14 @@ class DBClient(ABC):
 
                     cur.execute(
                         """
-                        WITH recent AS (
-                            SELECT id, value, conversation_json
-                            FROM programs
-                            WHERE version = %s 
-                            AND advantage IS NOT NULL
-                            -- AND jsonb_array_length(conversation_json->'messages') < %s
-                            ORDER BY created_at DESC
-                            LIMIT 300
-                        )
-                        SELECT id, advantage 
-                        FROM recent
+                        SELECT id, advantage
+                        FROM programs
+                        WHERE version = %s
+                        AND advantage IS NOT NULL
+                        ORDER BY created_at DESC
+                        LIMIT 300
                         """,
-                        (version),
+                        (version,),
                     )
 
                     results = cur.fetchall()
@@ -427,12 +543,14 @@ class DBClient(ABC):
                     )
 
                     row = cur.fetchone()
-                    return Program.from_row(dict(row)) if row else None
+                    row = dict(row) if row else None
+            return Program.from_row(row) if row else None
         except Exception as e:
             print(f"Error sampling parent: {e}")
             raise e
 
-    async def update_program(self, program_id: int, updates: Dict[str, Any]) -> Program:
+    @run_in_db_thread
+    def update_program(self, program_id: int, updates: Dict[str, Any]) -> Program:
         """Update program with proper connection management"""
         try:
             with self.get_connection() as conn:
@@ -457,14 +575,14 @@ class DBClient(ABC):
 
                     conn.commit()
                     row = cur.fetchone()
-                    return Program.from_row(
-                        dict(zip([desc[0] for desc in cur.description], row))
-                    )
+                    row = dict(zip([desc[0] for desc in cur.description], row))
+            return Program.from_row(row)
         except Exception as e:
             print(f"Error updating program: {e}")
             raise e
 
-    async def get_resume_state(
+    @run_in_db_thread
+    def get_resume_state(
         self, resume_version, process_id, agent_idx=-1
     ) -> tuple[
         Optional[GameState], Optional[Conversation], Optional[int], Optional[int]
@@ -508,6 +626,7 @@ class PostgresDBClient(DBClient):
         max_conversation_length: int = 20,
         min_connections: int = 5,
         max_connections: int = 20,
+        deduplicate_conversations: bool = False,
         **db_config,
     ):
         if not PSYCOPG2_AVAILABLE:
@@ -516,7 +635,11 @@ class PostgresDBClient(DBClient):
                 "or set FLE_DB_TYPE=sqlite in your .env file to use SQLite instead."
             )
         super().__init__(
-            max_conversation_length, min_connections, max_connections, **db_config
+            max_conversation_length,
+            min_connections,
+            max_connections,
+            deduplicate_conversations,
+            **db_config,
         )
 
     async def initialize(self):
@@ -563,12 +686,20 @@ class SQLliteDBClient(DBClient):
         max_conversation_length: int = 20,
         min_connections: int = 5,
         max_connections: int = 20,
+        deduplicate_conversations: bool = False,
         **db_config,
     ):
         super().__init__(
-            max_conversation_length, min_connections, max_connections, **db_config
+            max_conversation_length,
+            min_connections,
+            max_connections,
+            deduplicate_conversations,
+            **db_config,
         )
         self.database_file = self.db_config.get("database_file")
+        # Each thread keeps its connection open (and its cache of prepared statements) between queries
+        self._local = threading.local()
+        self._connections = []
 
     async def initialize(self):
         """Initialize the connection pool"""
@@ -581,20 +712,39 @@ class SQLliteDBClient(DBClient):
 
     @contextmanager
     def get_connection(self):
-        """Context manager for SQLite database connections"""
-        conn = None
+        """Context manager for this thread's SQLite database connection"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # Only used by the thread that opened it, but closed from `cleanup`
+            conn = sqlite3.connect(self.database_file, check_same_thread=False)
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
         try:
-            conn = sqlite3.connect(self.database_file)
             yield conn
         finally:
-            if conn:
-                conn.close()
+            # Discard uncommitted changes, as closing the connection used to
+            if conn.in_transaction:
+                conn.rollback()
+
+    async def cleanup(self):
+        """Close the connections of all threads"""
+        self._release_message_loader()
+        with self._lock:
+            for conn in self._connections:
+                try:
+                    conn.close()
+                except Exception as e:
+                    logger.error(f"Error closing SQLite connection: {e}")
+            self._connections = []
+            self._local = threading.local()
 
     @tenacity.retry(
         retry=retry_if_exception_type(get_sqlite_exceptions()),
         wait=wait_exponential(multiplier=1, min=4, max=10),
     )
-    async def get_largest_version(self) -> int:
+    @run_in_db_thread
+    def get_largest_version(self) -> int:
         query = """
             SELECT MAX(version)
             FROM programs
@@ -610,7 +760,8 @@ class SQLliteDBClient(DBClient):
             print(f"Error fetching largest version: {e}")
             return 0
 
-    async def get_resume_state(
+    @run_in_db_thread
+    def get_resume_state(
         self, resume_version, process_id, agent_idx=-1
     ) -> tuple[
         Optional[GameState], Optional[Conversation], Optional[int], Optional[int]
@@ -659,77 +810,47 @@ class SQLliteDBClient(DBClient):
             print(f"Error getting resume state: {e}")
             return None, None, None, None
 
-    @tenacity.retry(
-        retry=retry_if_exception_type(get_sqlite_exceptions()),
-        wait=wait_random_exponential(multiplier=1, min=4, max=10),
-    )
-    async def create_program(self, program: Program) -> Program:
-        """Create a new program, now with connection management"""
-        try:
-            with self.get_connection() as conn:
-                cur = conn.cursor()
-
-                # Insert the program data
+    def _insert_program(self, cur, program: Program) -> List[str]:
+        conversation_json, new_message_hashes = self._encode_conversation(
+            cur, program.conversation, placeholder="?"
+        )
+        cur.execute(
+            f"""
+            INSERT INTO programs ({", ".join(PROGRAM_INSERT_COLUMNS)})
+            VALUES ({", ".join(["?"] * len(PROGRAM_INSERT_COLUMNS))})
+            """,
+            self._program_row(program, conversation_json),
+        )
+        program.id = cur.lastrowid
+        cur.execute("SELECT created_at FROM programs WHERE id = ?", (program.id,))
+        program.created_at = cur.fetchone()[0]
+        return new_message_hashes
+
+    def load_messages(self, hashes: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Messages stored under these hashes, for `message_store`"""
+        messages = {}
+        with self.get_connection() as conn:
+            cur = conn.cursor()
+            # Stay under SQLite's limit on the number of query parameters
+            for start in range(0, len(hashes), 500):
+                chunk = hashes[start : start + 500]
                 cur.execute(
-                    """
-                    INSERT INTO programs (code, value, visits, parent_id, state_json, conversation_json, 
-                                          completion_token_usage, prompt_token_usage, token_usage, response, 
-                                          holdout_value, raw_reward, version, version_description, model, meta, 
-                                          achievements_json, instance, depth, advantage, ticks, timing_metrics_json)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                    (
-                        program.code,
-                        program.value,
-                        0,  # Assuming visits is initially set to 0
-                        program.parent_id,
-                        program.state.to_raw() if program.state else None,
-                        json.dumps(program.conversation.dict()),
-                        program.completion_token_usage,
-                        program.prompt_token_usage,
-                        program.token_usage,
-                        program.response,
-                        program.holdout_value,
-                        program.raw_reward,
-                        program.version,
-                        program.version_description,
-                        program.model,
-                        json.dumps(program.meta),
-                        json.dumps(program.achievements),
-                        program.instance,
-                        program.depth / 2,
-                        program.advantage,
-                        program.ticks,
-                        json.dumps(program.timing_metrics)
-                        if program.timing_metrics
-                        else None,
-                    ),
+                    f"SELECT hash, message_json FROM messages WHERE hash IN ({', '.join('?' * len(chunk))})",
+                    chunk,
                 )
-
-                # Get the last inserted row ID
-                program.id = cur.lastrowid
-
-                # Retrieve the created_at timestamp
-                cur.execute(
-                    "SELECT created_at FROM programs WHERE id = ?", (program.id,)
+                messages.update(
+                    (key, json.loads(message)) for key, message in cur.fetchall()
                 )
-                program.created_at = cur.fetchone()[0]
-                conn.commit()
-                # Return the updated program object
-                return program
-        except Exception as e:
-            conn.rollback()
-            print(f"Error creating program: {e}")
-            raise e
+        self._stored_message_hashes.update(messages)
+        return messages
 
-    async def execute_query(
-        self, query: str, params: tuple = None
-    ) -> List[Dict[str, Any]]:
+    @run_in_db_thread
+    def execute_query(self, query: str, params: tuple = None) -> List[Dict[str, Any]]:
         """Execute a query and return results as list of dictionaries (SQLite version)"""
         try:
             with self.get_connection() as conn:
-                conn.row_factory = sqlite3.Row  # Enable dict-like access
                 cur = conn.cursor()
+                cur.row_factory = sqlite3.Row  # Enable dict-like access
                 if params:
                     cur.execute(query, params)
                 else:
@@ -741,6 +862,88 @@ class SQLliteDBClient(DBClient):
             return []
 
 
+# Columns set when a program is created, in the order of `DBClient._program_row`
+PROGRAM_INSERT_COLUMNS = (
+    "code",
+    "value",
+    "visits",
+    "parent_id",
+    "state_json",
+    "conversation_json",
+    "completion_token_usage",
+    "prompt_token_usage",
+    "token_usage",
+    "response",
+    "holdout_value",
+    "raw_reward",
+    "version",
+    "version_description",
+    "model",
+    "meta",
+    "achievements_json",
+    "instance",
+    "depth",
+    "advantage",
+    "ticks",
+    "timing_metrics_json",
+    "conversation_length",
+)
+
+# Indexes for the sampling queries, which filter programs by version and rank them by value or recency
+PROGRAM_INDEXES = {
+    "idx_programs_version_value": "(version, value)",
+    "idx_programs_version_created_at": "(version, created_at)",
+}
+
+# Number of messages in `conversation_json`, per database type, to backfill `conversation_length` with
+CONVERSATION_LENGTH_SQL = {
+    "sqlite": "json_array_length(conversation_json, '$.messages')",
+    "postgres": "jsonb_array_length(conversation_json::jsonb -> 'messages')",
+}
+
+
+def migrate_programs_table(conn, db_type: str) -> None:
+    """
+    Bring an existing programs table up to date with the current schema: add the `conversation_length`
+    column (backfilled from `conversation_json`), the sampling indexes and the messages table. Does nothing
+    if already applied.
+
+    Args:
+        conn: Open connection to the database
+        db_type: "sqlite" or "postgres"
+    """
+    cursor = conn.cursor()
+    if db_type == "sqlite":
+        cursor.execute("PRAGMA table_info(programs)")
+        columns = {row[1] for row in cursor.fetchall()}
+    else:
+        cursor.execute(
+            """
+            SELECT column_name FROM information_schema.columns
+            WHERE table_schema = 'public' AND table_name = 'programs'
+        """
+        )
+        columns = {row[0] for row in cursor.fetchall()}
+
+    if "conversation_length" not in columns:
+        print("Adding conversation_length to programs")
+        cursor.execute("ALTER TABLE programs ADD COLUMN conversation_length INTEGER")
+        cursor.execute(
+            f"UPDATE programs SET conversation_length = {CONVERSATION_LENGTH_SQL[db_type]}"
+        )
+
+    # Content-addressed messages of conversations stored by reference (see `DBClient._encode_conversation`)
+    cursor.execute(
+        "CREATE TABLE IF NOT EXISTS messages (hash TEXT PRIMARY KEY, message_json TEXT NOT NULL)"
+    )
+
+    for name, indexed_columns in PROGRAM_INDEXES.items():
+        cursor.execute(
+            f"CREATE INDEX IF NOT EXISTS {name} ON programs {indexed_columns}"
+        )
+    conn.commit()
+
+
 def create_default_sqlite_db(db_file: str) -> None:
     """Create SQLite database with required schema if it doesn't exist"""
     db_path = Path(db_file)
@@ -786,12 +989,15 @@ def create_default_sqlite_db(db_file: str) -> None:
                     advantage REAL DEFAULT 0.0,
                     ticks INTEGER DEFAULT 0,
                     created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-                    timing_metrics_json TEXT
+                    timing_metrics_json TEXT,
+                    conversation_length INTEGER
                 )
             """)
             conn.commit()
             print("SQLite database schema created successfully!")
 
+        migrate_programs_table(conn, "sqlite")
+
     finally:
         conn.close()
 
@@ -841,12 +1047,15 @@ def create_default_postgres_db(**db_config) -> None:
                     advantage REAL DEFAULT 0.0,
                     ticks INTEGER DEFAULT 0,
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    timing_metrics_json TEXT
+                    timing_metrics_json TEXT,
+                    conversation_length INTEGER
                 )
             """)
             conn.commit()
             print("PostgreSQL database schema created successfully!")
 
+        migrate_programs_table(conn, "postgres")
+
     except Exception as e:
         print(f"Error creating PostgreSQL schema: {e}")
         if conn:
@@ -868,6 +1077,9 @@ async def create_db_client(
     """
     # Check for database type preference
     db_type = os.getenv("FLE_DB_TYPE", "sqlite").lower()
+    deduplicate_conversations = (
+        os.getenv("FLE_DEDUPLICATE_CONVERSATIONS", "false").lower() == "true"
+    )
 
     if db_type == "postgres":
         # Check if psycopg2 is available
@@ -906,6 +1118,7 @@ async def create_db_client(
             max_conversation_length=max_conversation_length,
             min_connections=min_connections,
             max_connections=max_connections,
+            deduplicate_conversations=deduplicate_conversations,
             **db_config,
         )
     elif db_type == "sqlite":
@@ -920,6 +1133,7 @@ async def create_db_client(
             max_conversation_length=max_conversation_length,
             min_connections=min_connections,
             max_connections=max_connections,
+            deduplicate_conversations=deduplicate_conversations,
             database_file=sqlite_file,
         )
     else:
@@ -3,6 +3,7 @@ from typing import Dict, List, Any
 from pydantic import BaseModel, Field
 
 from fle.commons.models.message import Message
+from fle.commons.models.message_store import MESSAGE_HASHES_KEY, message_store
 
 
 class Conversation(BaseModel):
@@ -12,6 +13,9 @@ class Conversation(BaseModel):
 
     @classmethod
     def parse_raw(cls, data: Dict[str, Any]) -> "Conversation":
+        if MESSAGE_HASHES_KEY in data:
+            # Stored by reference (see `message_store`)
+            data = {"messages": message_store.get_many(data[MESSAGE_HASHES_KEY])}
         messages = [
             Message(**msg) if isinstance(msg, dict) else msg for msg in data["messages"]
         ]
@@ -0,0 +1,104 @@
+import base64
+import json
+import zlib
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+
+@dataclass
+class EntityDelta:
+    """Entity states that changed since a baseline recorded on the server (see `_save_entity_delta`)"""
+
+    # Id the current entity state was recorded under, if it was
+    id: Optional[str]
+    # Id `changed`/`removed` are relative to, None if `changed` is a full state
+    base: Optional[str]
+    changed: List[Dict[str, Any]] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+
+    @property
+    def is_full(self) -> bool:
+        return self.base is None
+
+    def to_load_list(self) -> List[Dict[str, Any]]:
+        """
+        Entity list for `_load_entity_state` that applies this delta to a map that is exactly at the base
+        state: removed and changed entities are destroyed in place and changed ones re-created.
+        """
+        states = [
+            {"name": name, "position": position, "removed": True}
+            for name, position in map(_parse_key, self.removed)
+            if position is not None
+        ]
+        states.extend({**state, "replace": True} for state in self.changed)
+        return states
+
+
+def _format_number(value) -> str:
+    # Matches `string.format("%.14g", ...)` on the server
+    return format(float(value), ".14g")
+
+
+def entity_group(state: Dict[str, Any]) -> str:
+    """Entities are identified by name and position (characters by agent index), as on the server"""
+    name = str(state["name"]).strip('"')
+    if name == "character":
+        return f"character@{state.get('agent_index', -1)}"
+    position = state["position"]
+    return f"{name}@{_format_number(position['x'])},{_format_number(position['y'])}"
+
+
+def _group_of(key: str) -> str:
+    return key.rsplit("#", 1)[0]
+
+
+def _parse_key(key: str):
+    name, _, position = _group_of(key).rpartition("@")
+    if name == "character" or "," not in position:
+        return name, None
+    x, y = position.split(",")
+    return name, {"x": float(x), "y": float(y)}
+
+
+def keyed_entities(states: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Key entity states by group, numbering entities that share a position (e.g. items on the ground)"""
+    counts: Dict[str, int] = {}
+    keyed = {}
+    for state in states:
+        group = entity_group(state)
+        counts[group] = counts.get(group, 0) + 1
+        keyed[f"{group}#{counts[group]}"] = state
+    return keyed
+
+
+def apply_entity_delta(
+    states: List[Dict[str, Any]], delta: EntityDelta
+) -> List[Dict[str, Any]]:
+    """
+    Apply a delta to the entity states of its base snapshot. The server reports every entity of a group
+    that changed, so dirty groups are replaced wholesale.
+    """
+    if delta.is_full:
+        return list(delta.changed)
+    dirty = {entity_group(state) for state in delta.changed}
+    dirty.update(_group_of(key) for key in delta.removed)
+    unchanged = [
+        state
+        for key, state in keyed_entities(states).items()
+        if _group_of(key) not in dirty
+    ]
+    return unchanged + list(delta.changed)
+
+
+def encode_entities(entities: Any, compress: bool = True) -> str:
+    encoded = json.dumps(entities).encode()
+    if compress:
+        encoded = zlib.compress(encoded)
+    return base64.b64encode(encoded).decode()
+
+
+def decode_entities(entities: str, decompress: bool = True) -> Any:
+    decoded = base64.b64decode(entities)
+    if decompress:
+        decoded = zlib.decompress(decoded)
+    return json.loads(decoded)
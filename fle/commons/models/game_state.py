@@ -5,6 +5,12 @@ from dataclasses import asdict, dataclass, field
 from enum import Enum
 from typing import Any, Dict, List, Optional
 
+from fle.commons.models.entity_delta import (
+    EntityDelta,
+    apply_entity_delta,
+    decode_entities,
+    encode_entities,
+)
 from fle.commons.models.research_state import ResearchState
 from fle.commons.models.technology_state import TechnologyState
 
@@ -21,6 +27,61 @@ class GameState:
     agent_messages: List[Any] = field(
         default_factory=list
     )  # Can be List[Dict] or List[List[Dict]]
+    # Snapshot id the server recorded these entities under
+    entities_id: Optional[str] = None
+    # If set, `entities` is a delta against the snapshot with this id (held in `base`)
+    entities_base: Optional[str] = None
+    base: Optional["GameState"] = field(default=None, repr=False, compare=False)
+    _resolved_entities: Optional[str] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    # Delta chains longer than this are re-based on a full snapshot
+    MAX_DELTA_CHAIN = 32
+
+    @property
+    def is_delta(self) -> bool:
+        return self.entities_base is not None
+
+    @property
+    def delta_depth(self) -> int:
+        depth, state = 0, self
+        while state is not None and state.is_delta:
+            depth, state = depth + 1, state.base
+        return depth
+
+    @property
+    def entity_delta(self) -> Optional[EntityDelta]:
+        if not self.is_delta:
+            return None
+        delta = decode_entities(self.entities)
+        return EntityDelta(
+            id=self.entities_id,
+            base=self.entities_base,
+            changed=delta["changed"],
+            removed=delta["removed"],
+        )
+
+    def resolve_entities(self) -> str:
+        """
+        Get the full (compressed and encoded) entity state, applying the delta chain to its base snapshot.
+        """
+        if not self.is_delta:
+            return self.entities
+        if self._resolved_entities is None:
+            chain, state = [], self
+            while state.is_delta:
+                if state.base is None or state.base.entities_id != state.entities_base:
+                    raise ValueError(
+                        f"Base snapshot {state.entities_base} of this delta game state is not available"
+                    )
+                chain.append(state.entity_delta)
+                state = state.base
+            entities = decode_entities(state.entities)
+            for delta in reversed(chain):
+                entities = apply_entity_delta(entities, delta)
+            self._resolved_entities = encode_entities(entities)
+        return self._resolved_entities
 
     @property
     def is_multiagent(self) -> bool:
@@ -55,14 +116,46 @@ class GameState:
         return agent_messages
 
     @classmethod
-    def from_instance(cls, instance) -> "GameState":
-        """Capture current game state from Factorio instances"""
-        entities = instance.first_namespace._save_entity_state(
-            compress=True, encode=True
-        )
+    def from_instance(
+        cls, instance, snapshot=None, base: "GameState" = None, delta: bool = False
+    ) -> "GameState":
+        """Capture current game state from Factorio instances
+
+        If a batched observation `snapshot` of the first agent is given (see the `observe` admin
+        tool), its entity state, research state and inventories are reused instead of queried again.
+
+        With `delta` (implied by `base`), the entities are recorded as a snapshot on the server. If
+        the server's last snapshot is `base`, only the entities that changed since are fetched and
+        stored, as a delta against `base`.
+        """
+        entities_id = entities_base = None
+        if delta or base is not None:
+            if base is not None and base.delta_depth >= cls.MAX_DELTA_CHAIN:
+                base = None
+            entity_delta = instance.first_namespace._save_entity_delta(
+                expected_base=base.entities_id if base is not None else None
+            )
+            entities_id = entity_delta.id
+            if entity_delta.is_full:
+                base = None
+                entities = encode_entities(entity_delta.changed)
+            else:
+                entities_base = entity_delta.base
+                entities = encode_entities(
+                    {"changed": entity_delta.changed, "removed": entity_delta.removed}
+                )
+        elif snapshot is not None and snapshot.entity_state is not None:
+            entities = snapshot.entity_state
+        else:
+            entities = instance.first_namespace._save_entity_state(
+                compress=True, encode=True
+            )
 
         # Get research state
-        research_state = instance.first_namespace._save_research_state()
+        if snapshot is not None:
+            research_state = snapshot.research
+        else:
+            research_state = instance.first_namespace._save_research_state()
 
         # Filter and pickle only serializable variables
         namespaces = []
@@ -74,9 +167,12 @@ class GameState:
                 namespaces.append(bytes())
 
         # Get inventories for all players
-        inventories = [
-            namespace.inspect_inventory() for namespace in instance.namespaces
-        ]
+        if snapshot is not None and len(snapshot.inventories) == instance.num_agents:
+            inventories = list(snapshot.inventories)
+        else:
+            inventories = [
+                namespace.inspect_inventory() for namespace in instance.namespaces
+            ]
         agent_messages = [namespace.get_messages() for namespace in instance.namespaces]
 
         return cls(
@@ -85,6 +181,9 @@ class GameState:
             namespaces=namespaces,
             research=research_state,
             agent_messages=agent_messages,
+            entities_id=entities_id,
+            entities_base=entities_base,
+            base=base,
         )
 
     def __repr__(self):
@@ -92,7 +191,8 @@ class GameState:
         return f"GameState(entities={self.entities}, inventories={self.inventories}, timestamp={self.timestamp}, namespace={{{readable_namespaces}}}, agent_messages={self.agent_messages})"
 
     @classmethod
-    def parse_raw(cls, json_str: str) -> "GameState":
+    def parse_raw(cls, json_str: str, base: "GameState" = None) -> "GameState":
+        """Parse a state written by `to_raw`. A delta state needs its `base` to be resolved."""
         data = json.loads(json_str)
         namespaces = []
         if "namespaces" in data:
@@ -125,10 +225,13 @@ class GameState:
             namespaces=namespaces,
             research=research,
             agent_messages=cls.parse_agent_messages(data),
+            entities_id=data.get("entities_id"),
+            entities_base=data.get("entities_base"),
+            base=base if data.get("entities_base") else None,
         )
 
     @classmethod
-    def parse(cls, data) -> "GameState":
+    def parse(cls, data, base: "GameState" = None) -> "GameState":
         if "namespace" in data:
             data["namespaces"] = [data["namespace"]]
             data["inventories"] = [data["inventory"]]
@@ -165,12 +268,19 @@ class GameState:
             namespaces=namespaces,
             research=research,
             agent_messages=cls.parse_agent_messages(data),
+            entities_id=data.get("entities_id"),
+            entities_base=data.get("entities_base"),
+            base=base if data.get("entities_base") else None,
         )
 
-    def to_raw(self) -> str:
-        """Convert state to JSON string"""
+    def to_raw(self, delta: bool = False) -> str:
+        """Convert state to JSON string
+
+        Delta states are written with their full entity state, unless `delta` is set. Then only the
+        delta is written and `parse_raw` needs the base state to resolve it.
+        """
         data = {
-            "entities": self.entities,
+            "entities": self.entities if delta else self.resolve_entities(),
             "inventories": [
                 inventory.__dict__ if hasattr(inventory, "__dict__") else inventory
                 for inventory in self.inventories
@@ -179,6 +289,10 @@ class GameState:
             "namespaces": [ns.hex() if ns else "" for ns in self.namespaces],
             "agent_messages": self.agent_messages,
         }
+        if self.entities_id:
+            data["entities_id"] = self.entities_id
+        if delta and self.is_delta:
+            data["entities_base"] = self.entities_base
 
         # Add research state if present
         if self.research:
@@ -201,7 +315,9 @@ class GameState:
         assert instance.num_agents == self.num_agents, (
             f"GameState can only be restored to a multiagent instance with the same number of agents (num_agents={self.num_agents})"
         )
-        instance.first_namespace._load_entity_state(self.entities, decompress=True)
+        instance.first_namespace._load_entity_state(
+            self.resolve_entities(), decompress=True
+        )
 
         # Set inventory for each player
         if self.inventories:
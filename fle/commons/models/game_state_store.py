@@ -0,0 +1,129 @@
+"""
+Bounded storage for the game states of a trajectory, kept for rolling back after errors.
+
+A trajectory of thousands of steps that keeps every step's full game state in a list grows by gigabytes.
+`GameStateStore` keeps only the most recent states in memory. Older ones are written to gzip-compressed files
+in a temporary directory (removed with the store), or dropped when spilling is disabled.
+"""
+
+import gzip
+import os
+import shutil
+import tempfile
+import weakref
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional
+
+from fle.commons.models.game_state import GameState
+
+DEFAULT_MAX_IN_MEMORY = 16
+
+
+class GameStateStore:
+    """Game states by step index: the latest `max_in_memory` in memory, older ones spilled to disk or dropped"""
+
+    def __init__(
+        self,
+        max_in_memory: int = DEFAULT_MAX_IN_MEMORY,
+        spill: bool = True,
+        spill_dir: Optional[str] = None,
+    ):
+        """
+        Args:
+            max_in_memory: Number of most recent states kept in memory
+            spill: Whether to write older states to disk (otherwise they are dropped)
+            spill_dir: Directory to create the spill directory in (defaults to the system's temporary directory)
+        """
+        if max_in_memory < 1:
+            raise ValueError("max_in_memory must be at least 1")
+        self.max_in_memory = max_in_memory
+        self.spill = spill
+        self.spill_dir = spill_dir
+        self._in_memory: "OrderedDict[int, GameState]" = OrderedDict()
+        self._spilled: Dict[int, Path] = {}
+        self._next_index = 0
+        self._directory: Optional[Path] = None
+
+    @classmethod
+    def from_env(cls) -> "GameStateStore":
+        """Store configured by FLE_GAME_STATES_IN_MEMORY and FLE_SPILL_GAME_STATES"""
+        return cls(
+            max_in_memory=int(
+                os.environ.get("FLE_GAME_STATES_IN_MEMORY", DEFAULT_MAX_IN_MEMORY)
+            ),
+            spill=os.environ.get("FLE_SPILL_GAME_STATES", "true").lower() == "true",
+        )
+
+    def __len__(self) -> int:
+        """Number of states that can still be rolled back to"""
+        return len(self._in_memory) + len(self._spilled)
+
+    def __contains__(self, index: int) -> bool:
+        return index in self._in_memory or index in self._spilled
+
+    @property
+    def last_index(self) -> Optional[int]:
+        """Step index of the most recent state, if any"""
+        if self._in_memory:
+            return next(reversed(self._in_memory))
+        if self._spilled:
+            return max(self._spilled)
+        return None
+
+    def append(self, state: GameState) -> int:
+        """Store the state of the next step, returning its step index"""
+        index = self._next_index
+        self._next_index += 1
+        self._in_memory[index] = state
+        while len(self._in_memory) > self.max_in_memory:
+            self._evict(*self._in_memory.popitem(last=False))
+        return index
+
+    def get(self, index: int) -> GameState:
+        """
+        State of a step.
+        :raises KeyError: If the state was dropped, discarded by a rollback or never stored
+        """
+        if index in self._in_memory:
+            return self._in_memory[index]
+        if index in self._spilled:
+            with gzip.open(self._spilled[index], "rt") as f:
+                return GameState.parse_raw(f.read())
+        raise KeyError(f"No game state for step {index}")
+
+    def rollback(self, index: int) -> GameState:
+        """Discard the states after step `index` and return its state, which becomes the latest"""
+        state = self.get(index)
+        for later in [i for i in self._in_memory if i > index]:
+            del self._in_memory[later]
+        for later in [i for i in self._spilled if i > index]:
+            self._spilled.pop(later).unlink(missing_ok=True)
+        self._next_index = index + 1
+        return state
+
+    def pop(self) -> GameState:
+        """Remove and return the most recent state"""
+        index = self.last_index
+        if index is None:
+            raise IndexError("pop from empty GameStateStore")
+        state = self.get(index)
+        if index in self._in_memory:
+            del self._in_memory[index]
+        else:
+            self._spilled.pop(index).unlink(missing_ok=True)
+        return state
+
+    def _evict(self, index: int, state: GameState) -> None:
+        if not self.spill:
+            return
+        if self._directory is None:
+            self._directory = Path(
+                tempfile.mkdtemp(prefix="fle_game_states_", dir=self.spill_dir)
+            )
+            weakref.finalize(self, shutil.rmtree, self._directory, ignore_errors=True)
+        path = self._directory / f"{index}.json.gz"
+        # Written in full (not as a delta), so it can be read back without its base state
+        with gzip.open(path, "wt", compresslevel=1) as f:
+            f.write(state.to_raw())
+        self._spilled[index] = path
@@ -0,0 +1,104 @@
+"""
+Content-addressed storage for conversation messages.
+
+A program's conversation repeats the whole conversation of its parent, so storing each one in full grows
+quadratically with the depth of a trajectory. Instead, messages can be stored once under the hash of their
+content (see `DBClient.create_program`) and conversations as the list of their message hashes.
+`Conversation.parse_raw` resolves those hashes through the process-wide `message_store`, which keeps recently
+used messages in memory (so the shared prefixes of sibling conversations are only loaded once) and loads the
+rest through the loaders registered by the database clients that are open.
+"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List
+
+DEFAULT_MAX_MESSAGES = 50_000
+
+# Key that conversations stored by reference have in place of "messages"
+MESSAGE_HASHES_KEY = "message_hashes"
+
+# Loads {hash: message} for as many of the hashes as it can find
+MessageLoader = Callable[[List[str]], Dict[str, Dict[str, Any]]]
+
+
+def message_hash(message: Dict[str, Any]) -> str:
+    """Hash of a message's content, independent of key order"""
+    encoded = json.dumps(message, sort_keys=True, default=str).encode()
+    return hashlib.sha256(encoded).hexdigest()
+
+
+class MessageStore:
+    """LRU cache of messages by hash, in front of an optional loader for the ones it doesn't hold"""
+
+    def __init__(self, maxsize: int = DEFAULT_MAX_MESSAGES):
+        self.maxsize = maxsize
+        # Newest last, as clients register theirs on creation and remove them on cleanup
+        self.loaders: List[MessageLoader] = []
+        self._messages: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, message: Dict[str, Any]) -> str:
+        """Cache a message and return its hash"""
+        key = message_hash(message)
+        with self._lock:
+            self._put(key, message)
+        return key
+
+    def get_many(self, hashes: List[str]) -> List[Dict[str, Any]]:
+        """
+        Messages for the hashes, in order.
+        :raises KeyError: If any of them is neither cached nor found by the loader
+        """
+        found = {}
+        with self._lock:
+            for key in hashes:
+                if key in self._messages:
+                    self._messages.move_to_end(key)
+                    found[key] = self._messages[key]
+
+        missing = [key for key in dict.fromkeys(hashes) if key not in found]
+        if missing:
+            loaded = {}
+            for loader in reversed(list(self.loaders)):
+                loaded.update(loader([key for key in missing if key not in loaded]))
+                if len(loaded) == len(missing):
+                    break
+            not_found = [key for key in missing if key not in loaded]
+            if not_found:
+                raise KeyError(f"Messages not found: {not_found[:5]}")
+            with self._lock:
+                for key, message in loaded.items():
+                    self._put(key, message)
+            found.update(loaded)
+
+        return [found[key] for key in hashes]
+
+    def add_loader(self, loader: MessageLoader) -> None:
+        """Load the messages that aren't cached through `loader`, before the loaders added earlier"""
+        with self._lock:
+            self.loaders.append(loader)
+
+    def remove_loader(self, loader: MessageLoader) -> None:
+        """Stop loading messages through `loader`, leaving the other loaders in place"""
+        with self._lock:
+            if loader in self.loaders:
+                self.loaders.remove(loader)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._messages.clear()
+
+    def __len__(self) -> int:
+        return len(self._messages)
+
+    def _put(self, key: str, message: Dict[str, Any]) -> None:
+        self._messages[key] = message
+        self._messages.move_to_end(key)
+        while len(self._messages) > self.maxsize:
+            self._messages.popitem(last=False)
+
+
+message_store = MessageStore()
@@ -133,17 +133,21 @@ class SerializableFunction:
     @staticmethod
     def reconstruct(instance, func_data):
         """Reconstruct a function with proper globals from the instance"""
-        globals_dict = {}
-
-        # Add builtins first (so instance attributes can override them)
-        for name in dir(builtins):
-            if not name.startswith("_"):
-                globals_dict[name] = getattr(builtins, name)
-
-        # Add instance attributes (includes tools, log, etc.)
-        for name in dir(instance):
-            if not name.startswith("_"):
-                globals_dict[name] = getattr(instance, name)
+        if hasattr(instance, "_base_globals"):
+            # Namespaces cache their builtins and attributes (see FactorioNamespace._base_globals)
+            globals_dict = dict(instance._base_globals())
+        else:
+            globals_dict = {}
+
+            # Add builtins first (so instance attributes can override them)
+            for name in dir(builtins):
+                if not name.startswith("_"):
+                    globals_dict[name] = getattr(builtins, name)
+
+            # Add instance attributes (includes tools, log, etc.)
+            for name in dir(instance):
+                if not name.startswith("_"):
+                    globals_dict[name] = getattr(instance, name)
 
         # Add persistent variables to ensure global statements work correctly
         if hasattr(instance, "persistent_vars"):
@@ -154,9 +158,11 @@ class SerializableFunction:
         if hasattr(instance, "log"):
             globals_dict["print"] = instance.log
 
-        code = marshal.loads(func_data.code_bytes)
+        return func_data.to_function(globals_dict)
 
-        new_func = types.FunctionType(
-            code, globals_dict, func_data.name, func_data.defaults, func_data.closure
+    def to_function(self, globals_dict):
+        """Rebuild the function with the given globals"""
+        code = marshal.loads(self.code_bytes)
+        return types.FunctionType(
+            code, globals_dict, self.name, self.defaults, self.closure
         )
-        return new_func
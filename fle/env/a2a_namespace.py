@@ -1,5 +1,5 @@
 import logging
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 from a2a.types import AgentCard, Message, Part, TextPart
 from fle.agents.agent_abc import create_default_agent_card
@@ -84,27 +84,36 @@ class A2AFactorioNamespace(FactorioNamespace):
 
             # Get messages using the A2A handler (now returns List[Message])
             messages = self.a2a_handler.get_messages()
+            return [self._format_message(msg) for msg in messages]
 
-            # Convert Message objects to our expected dictionary format
-            formatted_messages = []
-            for msg in messages:
-                # Extract text content from the first part
-                content = msg.parts[0].root.text if msg.parts else ""
-
-                formatted_messages.append(
-                    {
-                        "messageId": msg.messageId,
-                        "sender": msg.metadata.get("sender", ""),
-                        "message": content,
-                        "timestamp": int(msg.metadata.get("timestamp", 0)),
-                        "recipient": msg.metadata.get("recipient"),
-                    }
-                )
-
-            return formatted_messages
+        except Exception as e:
+            raise Exception(f"Error getting messages: {str(e)}")
 
+    def get_messages_since(self, since: int) -> Tuple[List[Dict], int]:
+        """
+        Get the messages sent to this agent after the cursor `since`, without fetching the whole history.
+        :return: List of message dictionaries, and the cursor to pass to get only later messages
+        """
+        if not self.a2a_handler:
+            raise Exception("A2A handler not found in namespace")
+        try:
+            messages, cursor = self.a2a_handler.get_messages_since(since)
         except Exception as e:
             raise Exception(f"Error getting messages: {str(e)}")
+        return [self._format_message(msg) for msg in messages], cursor
+
+    @staticmethod
+    def _format_message(msg: Message) -> Dict:
+        """Convert a Message object to our expected dictionary format"""
+        # Extract text content from the first part
+        content = msg.parts[0].root.text if msg.parts else ""
+        return {
+            "messageId": msg.messageId,
+            "sender": msg.metadata.get("sender", ""),
+            "message": content,
+            "timestamp": int(msg.metadata.get("timestamp", 0)),
+            "recipient": msg.metadata.get("recipient"),
+        }
 
     def load_messages(self, messages: List[Dict]) -> None:
         """
@@ -1,5 +1,6 @@
 from __future__ import annotations
 import enum
+from typing import NamedTuple, Optional
 from difflib import get_close_matches
 from fle.env import entities as ent
 
@@ -305,6 +306,30 @@ prototype_by_name = {prototype.value[0]: prototype for prototype in Prototype}
 prototype_by_title = {str(prototype): prototype for prototype in Prototype}
 
 
+class PrototypeEntry(NamedTuple):
+    prototype: Prototype
+    # Entity class that server responses for the prototype are loaded into
+    entity_class: type
+
+
+def _entity_class(prototype: Prototype) -> type:
+    entity_class = prototype.value[1]
+    while isinstance(entity_class, tuple):
+        entity_class = entity_class[1]
+    return entity_class
+
+
+prototype_entries = {
+    name: PrototypeEntry(prototype, _entity_class(prototype))
+    for name, prototype in prototype_by_name.items()
+}
+
+
+def prototype_entry(name: str) -> Optional[PrototypeEntry]:
+    """Look up a prototype by the entity name the server reports (e.g. `stone-furnace` or `stone_furnace`)"""
+    return prototype_entries.get(name.replace("_", "-"))
+
+
 class Technology(enum.Enum):
     # Science pack technologies (Factorio 2.0 prerequisites)
     SteamPower = "steam-power"  # Starting tech, no prerequisites
@@ -14,6 +14,7 @@ from fle.env.gym_env.action import Action
 from fle.commons.models.achievements import ProductionFlows
 from fle.commons.constants import REWARD_OVERRIDE_KEY
 from fle.env.utils.achievements import calculate_achievements
+from fle.env.tools.admin.observe.client import ObservationSnapshot
 from fle.agents import Response, TaskResponse
 from fle.env.gym_env.observation import (
     Observation,
@@ -230,6 +231,8 @@ class FactorioGymEnv(gym.Env):
         error_penalty: float = 0.0,
         pause_after_action: bool = True,
         enable_vision: bool = True,
+        batched_observation: bool = True,
+        delta_snapshots: bool = False,
     ):
         super().__init__()
 
@@ -239,6 +242,11 @@ class FactorioGymEnv(gym.Env):
         self.instance_speed = instance.get_speed()
         self.pause_after_action = pause_after_action
         self.enable_vision = enable_vision
+        # Fetch score, flows, ticks, entities, inventories and research in one RCON round trip
+        self.batched_observation = batched_observation
+        # Store each output game state as a delta against the previous one (see GameState.from_instance)
+        self.delta_snapshots = delta_snapshots
+        self._last_game_state = None
 
         # Define action space - a dictionary containing agent index and code
         self.action_space = spaces.Dict(
@@ -292,12 +300,35 @@ class FactorioGymEnv(gym.Env):
         self.last_observation = None
         # Track last message timestamp for each agent
         self.last_message_timestamps = {i: 0.0 for i in range(instance.num_agents)}
+        # Inbox cursor of each agent, so that observations only fetch new messages
+        self.message_cursors = {i: 0 for i in range(instance.num_agents)}
+
+    def _observe(
+        self, agent_idx: int = 0, include_entity_state: bool = True
+    ) -> Optional[ObservationSnapshot]:
+        """Fetch a batched observation snapshot, or None if batching is disabled or failed"""
+        if not self.batched_observation:
+            return None
+        try:
+            return self.instance.namespaces[agent_idx]._observe(
+                include_entity_state=include_entity_state
+            )
+        except Exception as e:
+            logger.warning(
+                f"Batched observation failed, falling back to individual queries: {e}"
+            )
+            return None
 
     def get_observation(
-        self, agent_idx: int = 0, response: Optional[Response] = None
+        self,
+        agent_idx: int = 0,
+        response: Optional[Response] = None,
+        snapshot: Optional[ObservationSnapshot] = None,
     ) -> Observation:
         """Convert the current game state into a gym observation"""
         namespace = self.instance.namespaces[agent_idx]
+        if snapshot is None:
+            snapshot = self._observe(agent_idx, include_entity_state=False)
 
         # Render map image if vision is enabled
         map_image = ""
@@ -305,53 +336,67 @@ class FactorioGymEnv(gym.Env):
             map_image = namespace._render().to_base64()
 
         # Get entity observations
-        try:
-            entities = namespace.get_entities()
-        except Exception as e:
-            logger.warning(f"Error getting entities: {e}")
-            raise Exception("Error getting entities while getting observation") from e
+        if snapshot is not None and snapshot.entities is not None:
+            entities = snapshot.entities
+        else:
+            try:
+                entities = namespace.get_entities()
+            except Exception as e:
+                logger.warning(f"Error getting entities: {e}")
+                raise Exception(
+                    "Error getting entities while getting observation"
+                ) from e
 
         entity_obs = [e.__dict__ for e in entities]
 
-        # Get inventory observations
-        inventory_obs = namespace.inspect_inventory()
+        if snapshot is not None:
+            inventory_obs = snapshot.inventories[agent_idx]
+            research_obs = snapshot.research
+            ticks = snapshot.elapsed_ticks
+        else:
+            # Get inventory observations
+            inventory_obs = namespace.inspect_inventory()
+
+            # Get research observations
+            research_obs = namespace._save_research_state()
 
-        # Get research observations
-        research_obs = namespace._save_research_state()
+            ticks = self.instance.get_elapsed_ticks()
 
         # Get game info
         game_info = GameInfo(
-            tick=self.instance.get_elapsed_ticks(),
-            time=self.instance.get_elapsed_ticks() / 60,
+            tick=ticks,
+            time=ticks / 60,
             speed=self.instance.get_speed(),
         )
 
         # Get flows
         if response:
             flows_obs = response.flows
+        elif snapshot is not None:
+            flows_obs = ProductionFlows.from_dict(snapshot.production_stats)
         else:
             flows = namespace._get_production_stats()
             flows_obs = ProductionFlows.from_dict(flows)
 
-        # Get messages
-        messages = namespace.get_messages()
-        messages_obs = []
-        latest_timestamp = self.last_message_timestamps[agent_idx]
-
-        for msg in messages:
-            if msg["timestamp"] > self.last_message_timestamps[agent_idx]:
-                messages_obs.append(
-                    AgentMessage(
-                        sender=msg["sender"],
-                        content=msg["message"],
-                        timestamp=msg["timestamp"],
-                    )
-                )
-                latest_timestamp = max(latest_timestamp, msg["timestamp"])
+        # Get the messages received since the last observation
+        messages, self.message_cursors[agent_idx] = namespace.get_messages_since(
+            self.message_cursors[agent_idx]
+        )
+        messages_obs = [
+            AgentMessage(
+                sender=msg["sender"],
+                content=msg["message"],
+                timestamp=msg["timestamp"],
+            )
+            for msg in messages
+        ]
 
         # Update last message timestamp
         if messages_obs:
-            self.last_message_timestamps[agent_idx] = latest_timestamp
+            self.last_message_timestamps[agent_idx] = max(
+                self.last_message_timestamps[agent_idx],
+                *(msg.timestamp for msg in messages_obs),
+            )
 
         # Get task verification if available
         task_verification = None
@@ -435,7 +480,9 @@ class FactorioGymEnv(gym.Env):
 
         self.instance.set_speed_and_unpause(self.instance_speed)
         if action.game_state:
-            self.reset_instance(GameState.parse_raw(action.game_state.to_raw()))
+            game_state = GameState.parse_raw(action.game_state.to_raw())
+            self.reset_instance(game_state)
+            self._last_game_state = game_state
 
         namespace = self.instance.namespaces[agent_idx]
         # Calculate fresh production flows at the beginning of the step
@@ -463,7 +510,15 @@ class FactorioGymEnv(gym.Env):
             )
             terminated = task_success.success
 
-        production_score, automated_production_score = namespace.score()
+        # Read back score, flows, ticks and the output game state in a single round trip
+        snapshot = self._observe(
+            agent_idx, include_entity_state=not self.delta_snapshots
+        )
+        if snapshot is not None:
+            production_score = snapshot.production_score
+            automated_production_score = snapshot.automated_score
+        else:
+            production_score, automated_production_score = namespace.score()
         if not automated_production_score:
             automated_production_score = 0
         # Calculate reward
@@ -473,9 +528,20 @@ class FactorioGymEnv(gym.Env):
             reward = production_score - initial_score
         reward = float(reward) - self.error_penalty
 
-        output_game_state = GameState.from_instance(self.instance)
+        output_game_state = GameState.from_instance(
+            self.instance,
+            snapshot=snapshot,
+            base=self._last_game_state if self.delta_snapshots else None,
+            delta=self.delta_snapshots,
+        )
+        self._last_game_state = output_game_state
         # Get post-execution flows and calculate achievements
-        current_flows = ProductionFlows.from_dict(namespace._get_production_stats())
+        if snapshot is not None:
+            current_flows = ProductionFlows.from_dict(snapshot.production_stats)
+            ticks = snapshot.elapsed_ticks
+        else:
+            current_flows = ProductionFlows.from_dict(namespace._get_production_stats())
+            ticks = self.instance.get_elapsed_ticks()
         achievements = calculate_achievements(start_production_flows, current_flows)
 
         # Create response object for observation
@@ -486,7 +552,7 @@ class FactorioGymEnv(gym.Env):
             automated_score=automated_production_score,
             achievements=achievements,
             step=0,
-            ticks=self.instance.get_elapsed_ticks(),
+            ticks=ticks,
             flows=start_production_flows.get_new_flows(current_flows),
             response=task_response if task_response else result,
             task=task_success if task_success else TaskResponse(success=False, meta={}),
@@ -496,7 +562,9 @@ class FactorioGymEnv(gym.Env):
 
         # Get observation for the acting agent
         try:
-            observation = self.get_observation(action.agent_idx, response)
+            observation = self.get_observation(
+                action.agent_idx, response, snapshot=snapshot
+            )
         except Exception as e:
             raise Exception(f"Error getting observation: {e}") from e
 
@@ -504,7 +572,7 @@ class FactorioGymEnv(gym.Env):
         info = {
             "error_occurred": error_occurred,
             "result": result,
-            "ticks": self.instance.get_elapsed_ticks(),
+            "ticks": ticks,
             "flows": response.flows,
             "agent_idx": agent_idx,
             "last_message_timestamp": self.last_message_timestamps[agent_idx],
@@ -543,13 +611,19 @@ class FactorioGymEnv(gym.Env):
             options = {}
         game_state = options.get("game_state")
         self.reset_instance(game_state)
+        self._last_game_state = game_state
 
-        self.initial_score, _ = self.instance.namespaces[0].score()
+        snapshot = self._observe(0, include_entity_state=False)
+        if snapshot is not None:
+            self.initial_score = snapshot.production_score
+        else:
+            self.initial_score, _ = self.instance.namespaces[0].score()
         self.last_observation = None  # Reset last observation
         # Reset message timestamps
         self.last_message_timestamps = {i: 0.0 for i in range(self.instance.num_agents)}
+        self.message_cursors = {i: 0 for i in range(self.instance.num_agents)}
         # Convert observation to dictionary to match gym standards
-        observation = self.get_observation(0).to_dict()
+        observation = self.get_observation(0, snapshot=snapshot).to_dict()
         info = {}  # Additional info dict per Gym API
         return observation, info  # Return (observation, info) tuple per Gym API
 
@@ -5,7 +5,7 @@ from typing import Any, Dict, List, Optional
 from fle.env.a2a_instance import A2AFactorioInstance
 import gym
 
-from fle.commons.cluster_ips import get_local_container_ips
+from fle.commons.cluster_ips import get_container_registry
 from fle.commons.asyncio_utils import run_async_safely
 from fle.env import FactorioInstance
 from fle.env.gym_env.environment import FactorioGymEnv
@@ -93,11 +93,27 @@ class FactorioGymRegistry:
 _registry = FactorioGymRegistry()
 
 
-def make_factorio_env(spec: GymEnvironmentSpec, run_idx: int) -> FactorioGymEnv:
-    """Factory function to create a Factorio gym environment"""
+def make_factorio_env(
+    spec: GymEnvironmentSpec, run_idx: int, instance: Optional[FactorioInstance] = None
+) -> FactorioGymEnv:
+    """Factory function to create a Factorio gym environment
+
+    Args:
+        spec: Environment to create
+        run_idx: Index of the run, selecting the container when no server is configured
+        instance: Already connected instance to reuse (with its tools loaded), instead of connecting a new one.
+            The task's setup resets it.
+    """
     # Create task from the task definition
     task = TaskFactory.create_task(spec.task_config_path)
 
+    if instance is not None:
+        instance.set_speed_and_unpause(10)
+        task.setup(instance)
+        return FactorioGymEnv(
+            instance=instance, task=task, enable_vision=spec.enable_vision
+        )
+
     # Create Factorio instance
     try:
         # Check for external server configuration via environment variables
@@ -105,23 +121,17 @@ def make_factorio_env(spec: GymEnvironmentSpec, run_idx: int) -> FactorioGymEnv:
         tcp_port = os.getenv("FACTORIO_SERVER_PORT")
 
         if not address and not tcp_port:
-            try:
-                ips, udp_ports, tcp_ports = get_local_container_ips()
-            except ValueError:
-                raise RuntimeError("No Factorio containers available")
-
-            if len(tcp_ports) == 0:
-                raise RuntimeError("No Factorio containers available")
-
             # Apply port offset for multiple terminal sessions
             container_idx = PORT_OFFSET + run_idx
-            if container_idx >= len(tcp_ports):
+            try:
+                container = get_container_registry().get(container_idx)
+            except RuntimeError as e:
                 raise RuntimeError(
-                    f"Container index {container_idx} (PORT_OFFSET={PORT_OFFSET} + run_idx={run_idx}) exceeds available containers ({len(tcp_ports)})"
+                    f"{e} (PORT_OFFSET={PORT_OFFSET} + run_idx={run_idx})"
                 )
 
-            address = ips[container_idx]
-            tcp_port = tcp_ports[container_idx]
+            address = container.address
+            tcp_port = container.tcp_port
 
         common_kwargs = {
             "address": address,
@@ -1,6 +1,8 @@
+import asyncio
 import atexit
 import datetime
 import enum
+import functools
 import os
 import signal
 from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
@@ -8,7 +10,7 @@ import threading
 import time
 from pathlib import Path
 from timeit import default_timer as timer
-from typing import Dict
+from typing import Any, Callable, Dict, List
 
 from typing_extensions import Optional
 import uuid
@@ -18,7 +20,7 @@ from dotenv import load_dotenv
 from fle.env.lua_manager import LuaScriptManager
 from fle.env.namespace import FactorioNamespace
 from fle.env.utils.rcon import _lua2python
-from factorio_rcon import RCONClient
+from fle.env.utils.rcon_transport import PipelinedRCONClient
 from fle.commons.models.game_state import GameState
 from fle.env.utils.controller_loader.system_prompt_generator import (
     SystemPromptGenerator,
@@ -63,6 +65,16 @@ class GameControl:
             # If render_message fails, fall back to console print
             print(f"Could not render message '{message}': {e}")
 
+    def _is_at_entity_snapshot(self, snapshot_id: str) -> bool:
+        """Whether no entity changed since the server recorded the entity snapshot `snapshot_id`"""
+        try:
+            delta = self.first_namespace._save_entity_delta(
+                expected_base=snapshot_id, record=False, full_on_mismatch=False
+            )
+        except Exception:
+            return False
+        return delta.base == snapshot_id and not delta.changed and not delta.removed
+
     def set_speed(self, speed: float):
         """Set game speed (only affects speed when unpaused)"""
         if speed <= 0:
@@ -216,7 +228,7 @@ class FactorioInstance:
         self.pre_tool_hooks = {}
         self.post_tool_hooks = {}
 
-        # Load the python controllers that correspond to the Lua scripts
+        # Load the Lua scripts of the tools, and add their python controllers (created on first use) to the namespaces
         self.lua_script_manager.load_init_into_game("initialise")
         self.lua_script_manager.setup_tools(self)
 
@@ -253,6 +265,52 @@ class FactorioInstance:
             FactorioInstance._cleanup_registered = True
 
         self._executor = ThreadPoolExecutor(max_workers=2)
+        self._query_executor = ThreadPoolExecutor(
+            max_workers=8, thread_name_prefix=f"fle-query-{tcp_port}"
+        )
+        # Blocking work (resets, program evaluation) for this instance runs here, so that event loops
+        # driving several instances can overlap them
+        self._worker = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix=f"fle-worker-{tcp_port}"
+        )
+
+    def gather(self, *queries: Callable[[], Any]) -> List[Any]:
+        """
+        Run independent read-only queries (e.g. `namespace.score`, `namespace.inspect_inventory`,
+        `get_elapsed_ticks`) concurrently. Their commands are pipelined over the single RCON connection,
+        so the round trips overlap instead of adding up.
+        :param queries: Zero-argument callables
+        :return: Their results, in the same order
+        """
+        futures = [self._query_executor.submit(query) for query in queries]
+        return [future.result() for future in futures]
+
+    async def gather_async(self, *queries: Callable[[], Any]) -> List[Any]:
+        """Asyncio variant of `gather`"""
+        loop = asyncio.get_running_loop()
+        return list(
+            await asyncio.gather(
+                *(
+                    loop.run_in_executor(self._query_executor, query)
+                    for query in queries
+                )
+            )
+        )
+
+    async def run_async(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Run a blocking call against this instance (e.g. `reset`, `eval`, `GameState.from_instance`) on its
+        worker thread. Calls for the same instance are serialised; calls for different instances run
+        concurrently.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._worker, functools.partial(fn, *args, **kwargs)
+        )
+
+    async def reset_async(self, game_state: Optional[GameState] = None, **kwargs):
+        """Asyncio variant of `reset`"""
+        return await self.run_async(self.reset, game_state, **kwargs)
 
     @property
     def namespace(self):
@@ -303,18 +361,34 @@ class FactorioInstance:
                 inventories, reset_position, all_technologies_researched, clear_entities
             )
         else:
+            # A delta state only needs its diff applied if the map is still exactly at its base
+            apply_delta = game_state.is_delta and self._is_at_entity_snapshot(
+                game_state.entities_base
+            )
+
             # Reset the game instance with the correct player's inventory and messages if multiagent
             self.first_namespace._reset(
                 game_state.inventories,
                 reset_position,
                 all_technologies_researched,
-                clear_entities,
+                clear_entities and not apply_delta,
             )
 
             # Load entities into the game
-            self.first_namespace._load_entity_state(
-                game_state.entities, decompress=True
-            )
+            if apply_delta:
+                self.first_namespace._load_entity_state(
+                    game_state.entity_delta.to_load_list()
+                )
+            else:
+                self.first_namespace._load_entity_state(
+                    game_state.resolve_entities(), decompress=True
+                )
+
+            # Record the restored map as this snapshot, so the next capture can be a delta against it
+            if game_state.entities_id:
+                self.first_namespace._save_entity_delta(
+                    record_as=game_state.entities_id, full_on_mismatch=False
+                )
 
             # Load research state into the game
             self.first_namespace._load_research_state(game_state.research)
@@ -380,13 +454,13 @@ class FactorioInstance:
     @staticmethod
     def connect_to_server(address, tcp_port):
         try:
-            rcon_client = RCONClient(
+            rcon_client = PipelinedRCONClient(
                 address, tcp_port, RCON_PASSWORD
             )  #'quai2eeha3Lae7v')
             address = address
         except ConnectionError as e:
             print(e)
-            rcon_client = RCONClient("localhost", tcp_port, RCON_PASSWORD)
+            rcon_client = PipelinedRCONClient("localhost", tcp_port, RCON_PASSWORD)
             address = "localhost"
 
         try:
@@ -424,7 +498,7 @@ class FactorioInstance:
 
         # Submit the evaluation to the thread pool
         future = self._executor.submit(
-            self.namespaces[agent_idx].eval_with_timeout, expr
+            self.namespaces[agent_idx].eval_with_timeout, expr, timeout
         )
 
         try:
@@ -620,6 +694,12 @@ class FactorioInstance:
         if hasattr(self, "rcon_client") and self.rcon_client:
             self.rcon_client.close()
 
+        # Idle query and worker threads would otherwise hold up the thread joins below
+        if hasattr(self, "_query_executor"):
+            self._query_executor.shutdown(wait=False, cancel_futures=True)
+        if hasattr(self, "_worker"):
+            self._worker.shutdown(wait=False, cancel_futures=True)
+
         self.post_tool_hooks = {}
         self.pre_tool_hooks = {}
 
@@ -1,9 +1,13 @@
+import functools
 import hashlib
+import importlib.util
 import json
-
-import importlib
 import os
+import threading
+from dataclasses import dataclass
 from pathlib import Path
+from types import ModuleType
+from typing import Dict, Tuple
 
 from lupa.lua54 import LuaRuntime
 
@@ -12,12 +16,101 @@ from fle.env.utils.rcon import (
     _get_dir,
     _get_mods_dir,
     _get_lib_names,
-    _get_tool_names,
     _load_mods,
     _load_script,
 )
 
 
+@dataclass(frozen=True)
+class ToolSpec:
+    """A tool directory, containing both client.py and server.lua"""
+
+    name: str
+    # "agent" or "admin"
+    directory_name: str
+    class_name: str
+    client_file: str
+    lua_files: Tuple[str, ...]
+
+
+# Client modules of the tools by the path of their client.py, so each is imported once per process
+_tool_modules: Dict[str, ModuleType] = {}
+# Contents and checksums of Lua scripts by path, with the (mtime, size) of the file they were read from
+_script_cache: Dict[str, Tuple[Tuple[int, int], str, str]] = {}
+_cache_lock = threading.Lock()
+
+
+def _snake_to_camel(snake_str):
+    return "".join(word.capitalize() for word in snake_str.split("_"))
+
+
+@functools.lru_cache(maxsize=None)
+def find_tools(tool_dir: str) -> Tuple[ToolSpec, ...]:
+    """Tools under `tool_dir`, found once per process"""
+    tools = []
+    # Walk through all subdirectories
+    for dirpath, _, filenames in os.walk(tool_dir):
+        # Skip the root directory
+        if dirpath == tool_dir:
+            continue
+
+        # Check if this is a valid tool directory
+        server_file = os.path.join(dirpath, "server.lua")
+        client_file = os.path.join(dirpath, "client.py")
+        if not (os.path.isfile(server_file) and os.path.isfile(client_file)):
+            continue
+
+        tool_name = os.path.basename(dirpath).lower()
+        class_name = _snake_to_camel(tool_name)
+        # Handle special case renames
+        if tool_name == "place_entity":
+            class_name = "PlaceObject"
+        if tool_name == "score":
+            class_name = "Reward"
+
+        tools.append(
+            ToolSpec(
+                name=tool_name,
+                directory_name=Path(dirpath).parent.name,
+                class_name=class_name,
+                client_file=client_file,
+                lua_files=tuple(
+                    os.path.join(dirpath, filename)
+                    for filename in filenames
+                    if filename.endswith(".lua")
+                ),
+            )
+        )
+    return tuple(tools)
+
+
+def import_tool_module(tool: ToolSpec) -> ModuleType:
+    """Client module of a tool, imported on first use"""
+    with _cache_lock:
+        module = _tool_modules.get(tool.client_file)
+        if module is None:
+            module_spec = importlib.util.spec_from_file_location(
+                tool.name, tool.client_file
+            )
+            module = importlib.util.module_from_spec(module_spec)
+            module_spec.loader.exec_module(module)
+            _tool_modules[tool.client_file] = module
+        return module
+
+
+def read_script(filename: str) -> Tuple[str, str]:
+    """Contents and MD5 checksum of a Lua script, only read again when the file changes"""
+    stat = os.stat(filename)
+    version = (stat.st_mtime_ns, stat.st_size)
+    cached = _script_cache.get(filename)
+    if cached is not None and cached[0] == version:
+        return cached[1], cached[2]
+    _, content = _load_script(filename)
+    checksum = hashlib.md5(content.encode()).hexdigest()
+    _script_cache[filename] = (version, content, checksum)
+    return content, checksum
+
+
 class LuaScriptManager:
     def __init__(self, rcon_client: RCONClient, cache_scripts: bool = False):
         self.rcon_client = rcon_client
@@ -31,6 +124,8 @@ class LuaScriptManager:
             self.init_action_checksums()
             self.game_checksums = self._get_game_checksums(rcon_client)
 
+        # Tools whose scripts were sent to the game by this manager
+        self._loaded_tools = set()
         self.tool_scripts = self.get_tools_to_load()
 
         self.lib_scripts = self.get_libs_to_load()
@@ -52,6 +147,9 @@ class LuaScriptManager:
             return False, e.args[0]
 
     def load_tool_into_game(self, name):
+        # Tools create the tools they use, so the same tool is loaded many times per instance
+        if name in self._loaded_tools:
+            return
         # Select scripts by exact tool directory, not prefix
         tool_dirs = {
             f"agent/{name}",
@@ -93,6 +191,8 @@ class LuaScriptManager:
             if response and "error" in response.lower():
                 raise Exception(response)
 
+        self._loaded_tools.add(name)
+
     def load_init_into_game(self, name):
         if name not in self.lib_scripts:
             # attempt to load the script from the filesystem
@@ -118,10 +218,10 @@ class LuaScriptManager:
 
     def get_tools_to_load(self):
         scripts_to_load = {}
-        lua_files = (
-            _get_tool_names()
-        )  # This returns all .lua files from previous modification
         tool_dir = _get_dir("tools")
+        lua_files = [
+            lua_file for tool in find_tools(tool_dir) for lua_file in tool.lua_files
+        ]
         for lua_file in lua_files:
             # Get the tool name from the directory path
             rel_path = os.path.relpath(lua_file, Path(tool_dir))
@@ -129,13 +229,12 @@ class LuaScriptManager:
             script_name = os.path.basename(lua_file)
 
             # Load the lua script content
-            _, content = _load_script(lua_file)
+            content, checksum = read_script(lua_file)
 
             # Create a unique key combining tool and script name
             script_key = f"{tool_name}/{script_name}" if tool_name else script_name
 
             if self.cache_scripts:
-                checksum = self.calculate_checksum(content)
                 if (
                     script_key not in self.game_checksums
                     or self.game_checksums[script_key] != checksum
@@ -149,10 +248,9 @@ class LuaScriptManager:
     def get_libs_to_load(self):
         scripts_to_load = {}
         for filename in _get_lib_names():
-            name, content = _load_script(filename)
+            name = Path(filename).name[:-4]
+            content, checksum = read_script(filename)
             if self.cache_scripts:
-                checksum = self.calculate_checksum(content)
-
                 if (
                     name not in self.game_checksums
                     or self.game_checksums[name] != checksum
@@ -179,107 +277,74 @@ class LuaScriptManager:
 
     def setup_tools(self, instance):
         """
-        Load Python controllers from valid tool directories (those containing both client.py and server.lua)
+        Add the Python controllers of valid tool directories (those containing both client.py and server.lua)
+        to the namespaces. The Lua scripts of every tool are loaded into the game now, as tools call each
+        other's actions, but each controller is only created when its namespace first uses it.
         """
-        tool_dir = _get_dir("tools")
         instance.controllers = {}
+        tools = find_tools(_get_dir("tools"))
+        for tool in tools:
+            self.load_tool_into_game(tool.name)
+
+        for tool in tools:
+            controller_class = getattr(import_tool_module(tool), tool.class_name, None)
+            if controller_class is None:
+                raise Exception(
+                    f"Could not instantiate {tool.class_name} from {tool.client_file}. "
+                    f"The module has no {tool.class_name}"
+                )
+            # If this is an admin method, we hide it in the namespace by adding a shebang
+            attribute = f"_{tool.name}" if tool.directory_name == "admin" else tool.name
+            for namespace in instance.namespaces:
+                namespace._register_tool(
+                    attribute,
+                    functools.partial(
+                        self._create_controller,
+                        instance,
+                        namespace,
+                        tool,
+                        controller_class,
+                    ),
+                )
 
-        def snake_to_camel(snake_str):
-            return "".join(word.capitalize() for word in snake_str.split("_"))
-
-        # Create a function that wraps a tool's call method to execute hooks
-        def create_hook_wrapper(tool_name, original_callable):
-            from functools import wraps
-
-            @wraps(original_callable)
-            def wrapper(*args, **kwargs):
-                # Execute pre-tool hooks
-                try:
-                    self.execute_pre_tool_hooks(
-                        instance, tool_name, original_callable, *args, **kwargs
-                    )
-                except Exception as e:
-                    print(f"Error in pre-tool hook for {tool_name}: {e}")
-
-                # Execute the original callable
-                result = original_callable(*args, **kwargs)
-
-                # Execute post-tool hooks
-                try:
-                    self.execute_post_tool_hooks(
-                        instance, tool_name, original_callable, result
-                    )
-                except Exception as e:
-                    print(f"Error in post-tool hook for {tool_name}: {e}")
-
-                return result
-
-            return wrapper
-
-        # Walk through all subdirectories
-        for dirpath, _, filenames in os.walk(tool_dir):
-            # Skip the root directory
-            if dirpath == tool_dir:
-                continue
-
-            # Check if this is a valid tool directory
-            server_file = os.path.join(dirpath, "server.lua")
-            client_file = os.path.join(dirpath, "client.py")
-
-            if os.path.isfile(server_file) and os.path.isfile(client_file):
-                # Get the tool name from the directory
-                tool_name = os.path.basename(dirpath)
-
-                directory_name = Path(dirpath).parent.name
-                # Load the Python module
-                module_spec = importlib.util.spec_from_file_location(
-                    tool_name,
-                    client_file,
-                    # str(Path(client_file))
+    def _create_controller(self, instance, namespace, tool: ToolSpec, controller_class):
+        """Instantiate a tool's controller for a namespace, wrapped to execute its hooks"""
+        try:
+            controller = controller_class(self, namespace)
+        except Exception as e:
+            raise Exception(
+                f"Could not instantiate {tool.class_name} from {tool.client_file}. {e}"
+            )
+        instance.controllers[tool.name] = controller
+        return self._wrap_with_hooks(instance, tool.name, controller)
+
+    def _wrap_with_hooks(self, instance, tool_name, original_callable):
+        """Wrap a tool's call method to execute hooks"""
+
+        @functools.wraps(original_callable)
+        def wrapper(*args, **kwargs):
+            # Execute pre-tool hooks
+            try:
+                self.execute_pre_tool_hooks(
+                    instance, tool_name, original_callable, *args, **kwargs
                 )
-                module = importlib.util.module_from_spec(module_spec)
-                module_spec.loader.exec_module(module)
+            except Exception as e:
+                print(f"Error in pre-tool hook for {tool_name}: {e}")
 
-                class_name = snake_to_camel(tool_name)
+            # Execute the original callable
+            result = original_callable(*args, **kwargs)
 
-                # Handle special case renames
-                if tool_name == "place_entity":
-                    class_name = "PlaceObject"
-                if tool_name == "score":
-                    class_name = "Reward"
+            # Execute post-tool hooks
+            try:
+                self.execute_post_tool_hooks(
+                    instance, tool_name, original_callable, result
+                )
+            except Exception as e:
+                print(f"Error in post-tool hook for {tool_name}: {e}")
 
-                try:
-                    for i in range(instance.num_agents):
-                        # Get and instantiate the controller class
-                        callable_class = getattr(module, class_name)
-                        callable_instance = callable_class(self, instance.namespaces[i])
-
-                        # Create a wrapper that will execute hooks
-                        wrapped_instance = create_hook_wrapper(
-                            tool_name.lower(), callable_instance
-                        )
-
-                        # Store the controller and add it to namespace
-                        instance.controllers[tool_name.lower()] = callable_instance
-
-                        if directory_name == "admin":
-                            # If this is an admin method, we hide it in the namespace by adding a shebang
-                            setattr(
-                                instance.namespaces[i],
-                                f"_{tool_name.lower()}",
-                                wrapped_instance,
-                            )
-                        else:
-                            setattr(
-                                instance.namespaces[i],
-                                tool_name.lower(),
-                                wrapped_instance,
-                            )
+            return result
 
-                except Exception as e:
-                    raise Exception(
-                        f"Could not instantiate {class_name} from {client_file}. {e}"
-                    )
+        return wrapper
 
     @staticmethod
     def register_post_tool_hook(instance, tool_name, callback=None):
@@ -191,19 +191,112 @@ storage.utils.ensure_valid_character = function(player_index)
     return char
 end
 
-function dump(o)
+-- Serializers for tool responses (see `Controller._execute_once`). Both append to a buffer that is joined once,
+-- as concatenating strings while recursing is quadratic in the size of the response.
+
+local function dump_into(o, buffer)
    if type(o) == 'table' then
-      local s = '{ '
+      buffer[#buffer + 1] = '{ '
       for k,v in pairs(o) do
          if type(k) ~= 'number' then k = '"'..k..'"' end
-         s = s .. '['..k..'] = ' .. dump(v) .. ','
+         buffer[#buffer + 1] = '['..k..'] = '
+         dump_into(v, buffer)
+         buffer[#buffer + 1] = ','
+      end
+      buffer[#buffer + 1] = '} '
+   else
+      buffer[#buffer + 1] = tostring(o)
+   end
+end
+
+-- Lua table literal, with strings printed as they are
+function dump(o)
+   local buffer = {}
+   dump_into(o, buffer)
+   return table.concat(buffer)
+end
+
+local json_escapes = {
+   ['"'] = '\\"', ['\\'] = '\\\\', ['\b'] = '\\b', ['\f'] = '\\f', ['\n'] = '\\n', ['\r'] = '\\r', ['\t'] = '\\t'
+}
+
+local function json_escape_char(c)
+   return json_escapes[c] or string.format('\\u%04x', c:byte())
+end
+
+local function json_quote(s)
+   return '"' .. s:gsub('[%c"\\]', json_escape_char) .. '"'
+end
+
+-- Tables keyed by 1..n are arrays; holes become nulls
+local function is_json_array(t)
+   local n = #t
+   if n == 0 then return false end
+   for k in pairs(t) do
+      if type(k) ~= 'number' or k < 1 or k > n or k % 1 ~= 0 then return false end
+   end
+   return true
+end
+
+local function dump_json_into(o, buffer)
+   local o_type = type(o)
+   if o_type == 'table' then
+      if is_json_array(o) then
+         buffer[#buffer + 1] = '['
+         for i = 1, #o do
+            if i > 1 then buffer[#buffer + 1] = ',' end
+            dump_json_into(o[i], buffer)
+         end
+         buffer[#buffer + 1] = ']'
+      else
+         buffer[#buffer + 1] = '{'
+         local first = true
+         for k,v in pairs(o) do
+            if not first then buffer[#buffer + 1] = ',' end
+            first = false
+            buffer[#buffer + 1] = json_quote(tostring(k)) .. ':'
+            dump_json_into(v, buffer)
+         end
+         buffer[#buffer + 1] = '}'
+      end
+   elseif o_type == 'number' then
+      if o ~= o then
+         buffer[#buffer + 1] = 'null'
+      elseif o == math.huge then
+         -- Out of range for a double, so JSON decoders read it back as infinity
+         buffer[#buffer + 1] = '1e999'
+      elseif o == -math.huge then
+         buffer[#buffer + 1] = '-1e999'
+      else
+         buffer[#buffer + 1] = tostring(o)
+      end
+   elseif o_type == 'string' then
+      local first_char = o:sub(1, 1)
+      if (first_char == '{' or first_char == '[') and helpers.json_to_table(o) ~= nil then
+         -- JSON returned by tools (`helpers.table_to_json`) is embedded as is, as `dump()` does
+         buffer[#buffer + 1] = o
+      elseif #o >= 2 and first_char == '"' and o:sub(-1) == '"' then
+         -- Strings are pre-quoted for `dump()` throughout the tools, so that layer of quotes is dropped
+         buffer[#buffer + 1] = json_quote(o:sub(2, -2))
+      else
+         buffer[#buffer + 1] = json_quote(o)
       end
-      return s .. '} '
+   elseif o_type == 'boolean' then
+      buffer[#buffer + 1] = tostring(o)
+   elseif o == nil then
+      buffer[#buffer + 1] = 'null'
    else
-      return tostring(o)
+      buffer[#buffer + 1] = json_quote(tostring(o))
    end
 end
 
+-- Strict JSON, decoding to the same values as `dump()` except that sequences become arrays
+function dump_json(o)
+   local buffer = {}
+   dump_json_into(o, buffer)
+   return table.concat(buffer)
+end
+
 function storage.utils.inspect(player, radius, position)
     local surface = player.surface
     local bounding_box = {
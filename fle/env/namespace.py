@@ -4,10 +4,11 @@ import inspect
 import math
 import pickle
 import sys
+import time
 import traceback
 import types
 from difflib import get_close_matches
-from typing import Dict, List, Optional, Set, Tuple, Union
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Union
 
 from pydantic import BaseModel
 
@@ -16,6 +17,14 @@ from fle.env import entities as ent
 
 from fle.env.entities import Entity
 from fle.env.exceptions.hinting_name_error import get_value_type_str
+from fle.env.utils.program_compiler import (
+    CHECK_PROTECTED,
+    CHECKPOINT,
+    RETURN,
+    TICK,
+    ProgramReturn,
+    compile_program,
+)
 from fle.env.game_types import (
     Prototype,
     RecipeName,
@@ -54,8 +63,16 @@ class LoopContext:
         return False
 
 
+# Value in `_execute_compiled` of names a program has not set, distinct from None
+_UNSET = object()
+
+
 class FactorioNamespace:
     def __init__(self, instance, agent_index):
+        # Globals seen by agent code, built on first use (see `_base_globals`)
+        self._globals_cache = None
+        # Tools that are created on first access, by name (see `_register_tool`)
+        self._tool_factories: Dict[str, Callable[[], Any]] = {}
         self.logging_results = {}
         self.line_value = 0
         self.persistent_vars = {}
@@ -124,6 +141,12 @@ class FactorioNamespace:
         # We capture prints in order of them being run
         self.execution_trace = True
 
+        # Compile whole programs instead of interpreting them node by node (see `_execute_compiled`).
+        # Not used when capturing whole output, which needs each expression's value.
+        self.compiled_execution = False
+        # Code object of the compiled program being run, for line tracking in `log`
+        self._running_code = None
+
         # Available objects that the agent can interact with
         self.Prototype = Prototype
         self.Resource = Resource
@@ -202,6 +225,96 @@ class FactorioNamespace:
         # will get an error instead of silently shadowing an FLE tool/builtin.
         self._protected_names = set()
 
+    def __getattr__(self, name):
+        # Only called for names that are not set, which includes the tools that were not used yet
+        factories = self.__dict__.get("_tool_factories")
+        if factories and name in factories:
+            value = factories[name]()
+            setattr(self, name, value)
+            factories.pop(name, None)
+            return value
+        raise AttributeError(
+            f"'{type(self).__name__}' object has no attribute '{name}'"
+        )
+
+    def __dir__(self):
+        return sorted(
+            set(super().__dir__()) | set(self.__dict__.get("_tool_factories", ()))
+        )
+
+    def _register_tool(self, name: str, factory: Callable[[], Any]):
+        """
+        Add a tool to the namespace that is created by `factory` when it is first accessed,
+        replacing any tool already set under `name`.
+        """
+        self.__dict__.pop(name, None)
+        self._tool_factories[name] = factory
+        if self._globals_cache is not None and not name.startswith("_"):
+            self._globals_cache[name] = self._lazy_tool(name)
+
+    def _lazy_tool(self, name: str):
+        """Stand-in for a tool that was not created yet, which creates it when called"""
+
+        def call(*args, **kwargs):
+            return getattr(self, name)(*args, **kwargs)
+
+        call.__name__ = name
+        return call
+
+    def _member(self, name: str):
+        """Attribute `name`, without creating the tool if it was not used yet"""
+        if name in self._tool_factories:
+            return self._lazy_tool(name)
+        return getattr(self, name)
+
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        # Keep the cached globals in step with the namespace, e.g. when tools are loaded
+        cache = self.__dict__.get("_globals_cache")
+        if cache is not None and not name.startswith("_"):
+            cache[name] = self._bind(value)
+
+    def __delattr__(self, name):
+        super().__delattr__(name)
+        cache = self.__dict__.get("_globals_cache")
+        if cache is not None:
+            cache.pop(name, None)
+            if name.startswith("_"):
+                pass
+            elif hasattr(self, name):
+                cache[name] = self._bind(getattr(self, name))
+            elif hasattr(builtins, name):
+                cache[name] = getattr(builtins, name)
+
+    def _bind(self, value):
+        if isinstance(value, SerializableFunction):
+            return value.bind(self)
+        return value
+
+    def _base_globals(self) -> Dict:
+        """
+        Builtins and all public members of the namespace (tools, entity classes, agent variables).
+        Built once from `dir(self)` and then kept up to date by `__setattr__`, so callers must copy it
+        before executing code against it.
+        """
+        if self._globals_cache is None:
+            cache = {
+                name: getattr(builtins, name)
+                for name in dir(builtins)
+                if not name.startswith("_")
+            }
+            for name in dir(self):
+                if not name.startswith("_"):
+                    cache[name] = self._bind(self._member(name))
+            self._globals_cache = cache
+        return self._globals_cache
+
+    def _sync_persistent_vars(self, eval_dict):
+        """Copy variables persisted by the last statement into `eval_dict`, binding any new functions"""
+        for name, value in self.persistent_vars.items():
+            if eval_dict.get(name) is not value:
+                eval_dict[name] = self._bind(value)
+
     def _freeze_protected_names(self):
         """Snapshot all current namespace names as protected.
 
@@ -288,7 +401,7 @@ class FactorioNamespace:
         # Clear agent-created attributes (non-callable, non-private, non-static)
         for attr in dir(self):
             if (
-                not callable(getattr(self, attr))
+                not callable(self._member(attr))
                 and attr[0] != "_"
                 and attr not in self._static_members
             ):
@@ -303,6 +416,9 @@ class FactorioNamespace:
         setattr(self, key, value)
 
     def log(self, *arg):
+        if self._running_code is not None:
+            self.line_value = self._current_program_line()
+
         if self.execution_trace:
             self.log_counter += 1  # Increment counter
             self.logging_results[self.log_counter] = [
@@ -320,6 +436,25 @@ class FactorioNamespace:
         #     print(f"\033[0m{self.tcp_port}: {repr(arg)}\x1b[0m")
         return None  # Return None instead of the args
 
+    def _current_program_line(self) -> int:
+        """Line of the compiled program's top-level code being run, like `line_value` when interpreting"""
+        frame = sys._getframe(1)
+        while frame is not None:
+            if frame.f_code is self._running_code:
+                return frame.f_lineno
+            frame = frame.f_back
+        return self.line_value
+
+    def _program_line_of(self, exception, code) -> int:
+        """Top-level line of a compiled program an exception was raised from"""
+        line = self.line_value
+        tb = exception.__traceback__
+        while tb is not None:
+            if tb.tb_frame.f_code is code:
+                line = tb.tb_lineno
+            tb = tb.tb_next
+        return line
+
     def _get_suggestions_from_name_error(
         self, eval_dict, error_msg
     ) -> List[Tuple[str, str]]:
@@ -336,7 +471,7 @@ class FactorioNamespace:
         # Add class attributes
         for name in dir(self):
             if not name.startswith("_"):
-                available_vars[name] = getattr(self, name)
+                available_vars[name] = self._member(name)
 
         # Get close matches using difflib
         matches = get_close_matches(var_name, available_vars.keys(), n=3, cutoff=0.6)
@@ -1049,10 +1184,146 @@ class FactorioNamespace:
             exec(compiled, eval_dict)
             return True
 
-    def eval_with_timeout(self, expr):
+    def _log_error(self, expr, e, eval_dict):
+        """Log the error a program stopped with, along with the offending lines"""
+        self._sequential_exception_count += 1
+        error_traceback = traceback.format_exc()
+        error_lines = self._extract_error_lines(expr, error_traceback)
+
+        error_message = ""
+        if error_lines:
+            error_message += "Error occurred:\n"
+            for line_num, line_content in error_lines:
+                error_message += f"  Line {line_num}: {line_content}\n"
+        error_type = error_traceback.strip().split("\n")[-1]
+
+        if (
+            isinstance(e, NameError)
+            and "name '" in str(e)
+            and "' is not defined" in str(e)
+        ):
+            suggestions = [
+                f"{sug} ({_type})"
+                for sug, _type in self._get_suggestions_from_name_error(
+                    eval_dict, str(e)
+                )
+            ]
+            error_message += f"\n{error_type}"
+            if suggestions:
+                error_message += f"\nDid you mean one of these?\n{suggestions}"
+        else:
+            error_message += f"\n{error_type}"
+
+        self.log(error_message)
+
+    def _execute_interpreted(self, expr, tree, eval_dict):
+        """Run a program one top-level statement at a time through `execute_node`"""
+        last_successful_state = None
+
+        # Execute the expression
+        for index, node in enumerate(tree.body):
+            try:
+                node = self._change_print_to_log(node)
+                result = self.execute_node(node, eval_dict)
+
+                # Handle return statement at top level
+                if (
+                    isinstance(result, tuple)
+                    and len(result) == 2
+                    and result[0] == "RETURN"
+                ):
+                    # If we hit a return statement at top level, log the return value and stop execution
+                    return_value = result[1]
+                    if return_value is not None:
+                        self.log(return_value)
+                    return
+
+                last_successful_state = dict(self.persistent_vars)
+            except (Exception, NameError, SystemExit) as e:
+                self._log_error(expr, e, eval_dict)
+
+                if last_successful_state is not None:
+                    self.persistent_vars = last_successful_state.copy()
+
+                # if self._sequential_exception_count >= self.max_sequential_exception_count:
+                return
+
+            self._sync_persistent_vars(eval_dict)
+
+    def _execute_compiled(self, expr, program, eval_dict, timeout=None):
+        """
+        Run a program as a single code object (see `fle.env.utils.program_compiler`). Variables are persisted
+        after every top-level statement and rolled back on errors as in `_execute_interpreted`, but loops and
+        nested blocks run natively.
+        """
+        # Agent functions are rebuilt against this program's globals, so they run natively as well
+        for name, value in self.persistent_vars.items():
+            if isinstance(value, SerializableFunction) and eval_dict.get(name) is value:
+                eval_dict[name] = value.to_function(eval_dict)
+        # Values the program's names had before each checkpoint, to only persist what changed
+        seen = {name: eval_dict.get(name, _UNSET) for name in program.names}
+        state = {"last_successful": None}
+
+        def checkpoint():
+            for name in program.names:
+                value = eval_dict.get(name, seen[name])
+                if value is seen[name]:
+                    continue
+                seen[name] = value
+                persisted = self._bind(wrap_for_serialization(value))
+                self.persistent_vars[name] = persisted
+                setattr(self, name, persisted)
+            state["last_successful"] = dict(self.persistent_vars)
+
+        def check_protected(names):
+            for name in names:
+                self._check_protected(name)
+
+        deadline = time.monotonic() + timeout if timeout else None
+
+        def tick():
+            if deadline is not None and time.monotonic() > deadline:
+                raise TimeoutError(f"Program timed out after {timeout}s")
+
+        def return_(value):
+            raise ProgramReturn(value)
+
+        eval_dict.update(
+            {
+                CHECKPOINT: checkpoint,
+                CHECK_PROTECTED: check_protected,
+                TICK: tick,
+                RETURN: return_,
+                # Prints are logged, including from functions (see `SerializableFunction.reconstruct`)
+                "print": self.log,
+            }
+        )
+
+        self._running_code = program.code
+        try:
+            exec(program.code, eval_dict)
+        except ProgramReturn as e:
+            checkpoint()
+            self._running_code = None
+            self.line_value = self._program_line_of(e, program.code)
+            if e.value is not None:
+                self.log(e.value)
+        except (Exception, NameError, SystemExit) as e:
+            # Attribute the error to the top-level line it happened on, as the interpreter does
+            self._running_code = None
+            self.line_value = self._program_line_of(e, program.code)
+            self._log_error(expr, e, eval_dict)
+
+            if state["last_successful"] is not None:
+                self.persistent_vars = state["last_successful"].copy()
+        finally:
+            self._running_code = None
+
+    def eval_with_timeout(self, expr, timeout: Optional[float] = None):
         """
         Executes a Python expression with a timeout and returns the result.
         Supports try-except blocks, type annotations, and nested control flows.
+        :param timeout: Seconds after which loops in compiled programs stop with a TimeoutError
         """
 
         def parse_result_into_str(data, max_lines=512):
@@ -1077,93 +1348,23 @@ class FactorioNamespace:
 
             return node.lineno
 
-        tree = ast.parse(expr)
+        compiled = self.compiled_execution and not self.capture_whole_output
+        if compiled:
+            program = compile_program(expr)
+        else:
+            tree = ast.parse(expr)
         self.logging_results = {}
         self.line_value = 0
         self.loop_context = LoopContext()
 
-        eval_dict = {
-            **{
-                name: getattr(builtins, name)
-                for name in dir(builtins)
-                if not name.startswith("_")
-            },
-            **{
-                name: getattr(self, name)
-                for name in dir(self)
-                if not name.startswith("_")
-            },
-            **self.persistent_vars,
-        }
-
-        # Bind any SerializableFunction objects
-        for key, value in eval_dict.items():
-            if isinstance(value, SerializableFunction):
-                eval_dict[key] = value.bind(self)
-
-        last_successful_state = None
-
-        # Execute the expression
-        for index, node in enumerate(tree.body):
-            try:
-                node = self._change_print_to_log(node)
-                result = self.execute_node(node, eval_dict)
-
-                # Handle return statement at top level
-                if (
-                    isinstance(result, tuple)
-                    and len(result) == 2
-                    and result[0] == "RETURN"
-                ):
-                    # If we hit a return statement at top level, log the return value and stop execution
-                    return_value = result[1]
-                    if return_value is not None:
-                        self.log(return_value)
-                    break
-
-                last_successful_state = dict(self.persistent_vars)
-            except (Exception, NameError, SystemExit) as e:
-                self._sequential_exception_count += 1
-                error_traceback = traceback.format_exc()
-                error_lines = self._extract_error_lines(expr, error_traceback)
-
-                error_message = ""
-                if error_lines:
-                    error_message += "Error occurred:\n"
-                    for line_num, line_content in error_lines:
-                        error_message += f"  Line {line_num}: {line_content}\n"
-                error_type = error_traceback.strip().split("\n")[-1]
-
-                if (
-                    isinstance(e, NameError)
-                    and "name '" in str(e)
-                    and "' is not defined" in str(e)
-                ):
-                    suggestions = [
-                        f"{sug} ({_type})"
-                        for sug, _type in self._get_suggestions_from_name_error(
-                            eval_dict, str(e)
-                        )
-                    ]
-                    error_message += f"\n{error_type}"
-                    if suggestions:
-                        error_message += f"\nDid you mean one of these?\n{suggestions}"
-                else:
-                    error_message += f"\n{error_type}"
-
-                self.log(error_message)
+        # Agent variables are layered over a copy of the cached globals
+        eval_dict = dict(self._base_globals())
+        self._sync_persistent_vars(eval_dict)
 
-                if last_successful_state is not None:
-                    self.persistent_vars = last_successful_state.copy()
-
-                # if self._sequential_exception_count >= self.max_sequential_exception_count:
-                break
-
-            eval_dict.update(self.persistent_vars)
-            # Re-bind any new SerializableFunction objects after dict update
-            for key, value in eval_dict.items():
-                if isinstance(value, SerializableFunction):
-                    eval_dict[key] = value.bind(self)
+        if compiled:
+            self._execute_compiled(expr, program, eval_dict, timeout)
+        else:
+            self._execute_interpreted(expr, tree, eval_dict)
 
         score, automated_score = self.score()
         result_output = parse_result_into_str(self.logging_results)
@@ -1176,6 +1377,9 @@ class FactorioNamespace:
     def get_messages(self) -> List[Dict]:
         return []
 
+    def get_messages_since(self, since: int) -> Tuple[List[Dict], int]:
+        return [], since
+
     def load_messages(self, messages: List[Dict]):
         pass
 
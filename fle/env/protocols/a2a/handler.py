@@ -1,4 +1,4 @@
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 import time
 import uuid
 import aiohttp
@@ -39,6 +39,8 @@ class A2AProtocolHandler:
         self.retry_delay = retry_delay
         self._is_registered = False
         self._session: Optional[aiohttp.ClientSession] = None
+        # Keeps the connection to the server alive between the synchronous requests made every step
+        self._http = requests.Session()
         self._cleanup_lock = asyncio.Lock()
 
     async def __aenter__(self):
@@ -63,10 +65,13 @@ class A2AProtocolHandler:
                         print(f"Warning: Error closing session: {str(e)}")
                     finally:
                         self._session = None
+                self._http.close()
             except Exception as e:
                 print(f"Warning: Error during cleanup: {str(e)}")
 
-    def _make_sync_request(self, method: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    def _make_sync_request(
+        self, method: str, params: Dict[str, Any], timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
         if not self._is_registered:
             raise RuntimeError("Agent must be registered before making requests")
 
@@ -80,7 +85,9 @@ class A2AProtocolHandler:
 
         for attempt in range(self.max_retries):
             try:
-                response = requests.post(self.server_url, json=request)
+                response = self._http.post(
+                    self.server_url, json=request, timeout=timeout
+                )
 
                 if response.status_code == 404:
                     raise Exception(f"Endpoint not found: {self.server_url}")
@@ -183,18 +190,35 @@ class A2AProtocolHandler:
         )
 
     def get_messages(self) -> List[Message]:
-        """Get messages sent to this agent"""
-        result = self._make_sync_request("get_messages", {"agent_id": self.agent_id})
-        messages = result.get("messages", [])
-        return [
+        """Get all messages sent to this agent that the server retains"""
+        messages, _ = self.get_messages_since(0)
+        return messages
+
+    def get_messages_since(
+        self, since: int, wait: float = 0.0
+    ) -> Tuple[List[Message], int]:
+        """
+        Get the messages sent to this agent after sequence number `since`.
+        :param since: Cursor returned by the previous call (0 for all messages)
+        :param wait: Seconds the server waits for a message to arrive if there are none yet
+        :return: The messages, and the cursor to pass to get only later messages
+        """
+        result = self._make_sync_request(
+            "get_messages",
+            {"agent_id": self.agent_id, "since": since, "wait": wait},
+            # Leave the server time to answer after waiting
+            timeout=wait + 30,
+        )
+        messages = [
             Message(
                 messageId=msg.get("messageId", str(uuid.uuid4())),
                 role=Role.agent,  # Default to "agent" if not specified
                 parts=[Part(root=TextPart(text=msg.get("content", "")))],
                 metadata=msg.get("metadata", {}),
             )
-            for msg in messages
+            for msg in result.get("messages", [])
         ]
+        return messages, result.get("cursor", since)
 
     def load_messages(self, messages: List[Message]) -> None:
         """
@@ -1,6 +1,6 @@
 from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel
-from typing import Dict, Any, List, Optional
+from typing import Deque, Dict, Any, List, Optional, Tuple
 import uvicorn
 from datetime import datetime
 import requests
@@ -8,11 +8,20 @@ import multiprocessing
 import time
 import socket
 import logging
+from collections import deque
 from contextlib import contextmanager
+from itertools import islice
+import asyncio
+import os
 import uuid
 
 app = FastAPI()
 
+# Messages kept per agent; older ones are dropped
+DEFAULT_MAX_MESSAGES = 1000
+# Longest a get_messages call can wait for new messages
+MAX_WAIT_SECONDS = 30.0
+
 
 # Add health check endpoint
 @app.get("/health")
@@ -105,9 +114,25 @@ class ServerManager:
 
 
 class AgentRegistry:
-    def __init__(self):
+    """
+    Registered agents and their inboxes.
+
+    Every message gets a sequence number, increasing per agent, so that agents can ask for the messages after
+    the last one they have seen instead of their whole history. Inboxes keep the latest `max_messages`.
+    """
+
+    def __init__(self, max_messages: Optional[int] = None):
+        if max_messages is None:
+            max_messages = int(
+                os.environ.get("FLE_A2A_MAX_MESSAGES", DEFAULT_MAX_MESSAGES)
+            )
+        self.max_messages = max_messages
         self.agents: Dict[str, Dict[str, Any]] = {}
-        self.messages: Dict[str, List[Dict[str, Any]]] = {}
+        self.messages: Dict[str, Deque[Dict[str, Any]]] = {}
+        # Sequence number of the last message stored for each agent
+        self._sequences: Dict[str, int] = {}
+        # Set when a message arrives for an agent with a pending get_messages call
+        self._new_message: Dict[str, asyncio.Event] = {}
 
     def register_agent(self, agent_id: str, agent_card: Dict[str, Any]) -> None:
         self.agents[agent_id] = {
@@ -116,7 +141,7 @@ class AgentRegistry:
             "status": "available",
         }
         if agent_id not in self.messages:
-            self.messages[agent_id] = []
+            self.messages[agent_id] = deque(maxlen=self.max_messages)
 
     def unregister_agent(self, agent_id: str) -> None:
         if agent_id in self.agents:
@@ -131,12 +156,22 @@ class AgentRegistry:
             for agent_id, agent_data in self.agents.items()
         ]
 
+    def _append(self, agent_id: str, message: Dict[str, Any]) -> None:
+        if agent_id not in self.messages:
+            self.messages[agent_id] = deque(maxlen=self.max_messages)
+        sequence = self._sequences.get(agent_id, 0) + 1
+        self._sequences[agent_id] = sequence
+        self.messages[agent_id].append({**message, "sequence": sequence})
+
+        event = self._new_message.pop(agent_id, None)
+        if event is not None:
+            event.set()
+
     def store_message(
         self, sender_id: str, recipient_id: str, message: Dict[str, Any]
     ) -> None:
-        if recipient_id not in self.messages:
-            self.messages[recipient_id] = []
-        self.messages[recipient_id].append(
+        self._append(
+            recipient_id,
             {
                 "sender": sender_id,
                 "messageId": message.get("messageId", str(uuid.uuid4())),
@@ -146,32 +181,64 @@ class AgentRegistry:
                 ],
                 "metadata": message.get("metadata", {}),
                 "timestamp": datetime.utcnow().isoformat(),
-            }
+            },
         )
 
-    def get_messages(self, agent_id: str) -> List[Dict[str, Any]]:
-        messages = self.messages.get(agent_id, [])
-        return messages
+    def get_messages(
+        self, agent_id: str, since: int = 0
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Messages of an agent after sequence number `since` (all retained messages by default).
+
+        Returns:
+            The messages, and the sequence number to pass as `since` to get only later ones
+        """
+        messages = self.messages.get(agent_id, ())
+        cursor = self._sequences.get(agent_id, 0)
+        # Sequence numbers are consecutive, so the new messages are the last `cursor - since`
+        count = min(max(cursor - since, 0), len(messages))
+        new_messages = list(islice(reversed(messages), count))
+        new_messages.reverse()
+        return new_messages, cursor
+
+    async def wait_for_messages(
+        self, agent_id: str, since: int = 0, timeout: float = 0.0
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """As `get_messages`, waiting up to `timeout` seconds for a message if there are none yet"""
+        deadline = time.monotonic() + timeout
+        while True:
+            messages, cursor = self.get_messages(agent_id, since)
+            remaining = deadline - time.monotonic()
+            if messages or remaining <= 0:
+                return messages, cursor
+            event = self._new_message.setdefault(agent_id, asyncio.Event())
+            try:
+                await asyncio.wait_for(event.wait(), remaining)
+            except asyncio.TimeoutError:
+                pass
 
-    def load_messages(self, agent_id: str, messages: List[Dict[str, Any]]) -> None:
+    def load_messages(self, agent_id: str, messages: List[Dict[str, Any]]) -> int:
         """
         Load messages into an agent's message queue.
         :param agent_id: The ID of the agent to load messages for
         :param messages: List of message dictionaries in A2A Message format
+        :return: Sequence number of the last loaded message
         """
-        self.messages[agent_id] = []
-
-        # Validate and store messages
+        # Validate before replacing the queue
         for msg in messages:
             if not all(k in msg for k in ["messageId", "role", "parts", "metadata"]):
                 raise ValueError(
                     "Message missing required fields: messageId, role, parts, metadata"
                 )
 
+        # Sequence numbers keep increasing, so cursors of the previous messages stay valid
+        self.messages[agent_id] = deque(maxlen=self.max_messages)
+        for msg in messages:
             # Extract text content from the first part
             content = msg["parts"][0]["root"]["text"] if msg["parts"] else ""
 
-            self.messages[agent_id].append(
+            self._append(
+                agent_id,
                 {
                     "sender": msg["metadata"].get("sender", ""),
                     "recipient": msg["metadata"].get("recipient", ""),
@@ -182,8 +249,9 @@ class AgentRegistry:
                     "timestamp": msg["metadata"].get(
                         "timestamp", datetime.utcnow().isoformat()
                     ),
-                }
+                },
             )
+        return self._sequences.get(agent_id, 0)
 
 
 registry = AgentRegistry()
@@ -296,8 +364,13 @@ async def handle_jsonrpc(request: JSONRPCRequest) -> JSONRPCResponse:
             if not agent_id:
                 raise HTTPException(status_code=400, detail="Missing agent_id")
 
-            messages = registry.get_messages(agent_id)
-            return JSONRPCResponse(result={"messages": messages}, id=request.id)
+            # Messages after the `since` sequence number, long-polling for up to `wait` seconds
+            since = int(request.params.get("since") or 0)
+            wait = min(float(request.params.get("wait") or 0), MAX_WAIT_SECONDS)
+            messages, cursor = await registry.wait_for_messages(agent_id, since, wait)
+            return JSONRPCResponse(
+                result={"messages": messages, "cursor": cursor}, id=request.id
+            )
 
         elif request.method == "load_messages":
             agent_id = request.params.get("agent_id")
@@ -309,9 +382,10 @@ async def handle_jsonrpc(request: JSONRPCRequest) -> JSONRPCResponse:
                 raise HTTPException(status_code=400, detail="Messages must be a list")
 
             try:
-                registry.load_messages(agent_id, messages)
+                cursor = registry.load_messages(agent_id, messages)
                 return JSONRPCResponse(
-                    result={"status": "messages_loaded"}, id=request.id
+                    result={"status": "messages_loaded", "cursor": cursor},
+                    id=request.id,
                 )
             except ValueError as e:
                 raise HTTPException(status_code=400, detail=str(e))
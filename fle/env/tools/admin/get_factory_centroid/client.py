@@ -4,6 +4,8 @@ from fle.env.utils.camera import Camera
 
 
 class GetFactoryCentroid(Tool):
+    mutates_state = False
+
     def __init__(self, lua_script_manager, game_state):
         self.state = {"input": {}, "output": {}}
         super().__init__(lua_script_manager, game_state)
@@ -0,0 +1,26 @@
+from typing import Dict, Optional
+
+from fle.env.tools import Tool
+
+
+class GetPriceList(Tool):
+    mutates_state = False
+
+    def __init__(self, connection, game_state):
+        super().__init__(connection, game_state)
+        self.game_state = game_state
+        # Prices only change with the server's mods, so they are fetched once
+        self._price_list: Optional[Dict[str, float]] = None
+
+    def __call__(self, refresh: bool = False) -> Dict[str, float]:
+        """
+        Gets the price of every item and fluid, as used by the production score.
+        :param refresh: Whether to fetch the prices from the server again instead of using the cached ones
+        :return: Dictionary of item/fluid name to price
+        """
+        if self._price_list is None or refresh:
+            response, _ = self.execute()
+            if not isinstance(response, dict):
+                raise Exception("Could not get the price list", response)
+            self._price_list = response
+        return dict(self._price_list)
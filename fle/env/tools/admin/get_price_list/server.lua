@@ -0,0 +1,4 @@
+storage.actions.get_price_list = function()
+    -- Generated and cached in storage by the score tool
+    return storage.get_price_list()
+end
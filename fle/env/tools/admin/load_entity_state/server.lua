@@ -11,11 +11,32 @@ storage.actions.load_entity_state = function(player, stored_json_data)
     local created_entities = {}
     local stored_data = helpers.json_to_table(stored_json_data)
     local character_states = {}
+
+    -- Delta snapshots (see save_entity_delta) are applied in place: entities they remove or replace are
+    -- destroyed first. Characters are always replaced by agent index below.
+    for _, state in pairs(stored_data) do
+        local name = unquote_string(state.name)
+        if (state.replace or state.removed) and name ~= "character" and state.position then
+            local existing = surface.find_entities_filtered({
+                name = name,
+                position = {
+                    x = tonumber(state.position.x),
+                    y = tonumber(state.position.y)
+                }
+            })
+            for _, entity in pairs(existing) do
+                entity.destroy()
+            end
+        end
+    end
+
     -- First pass: Create all non-character entities and store character states
     for _, state in pairs(stored_data) do
         local name = unquote_string(state.name)
 
-        if name == "character" then
+        if state.removed then
+            -- Only destroyed above
+        elseif name == "character" then
             table.insert(character_states, state)
         elseif name == "item-on-ground" then
             local item_name = unquote_string(state.type)
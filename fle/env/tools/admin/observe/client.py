@@ -0,0 +1,139 @@
+import inspect
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Union
+
+from fle.commons.models.research_state import ResearchState
+from fle.env.entities import Entity, EntityGroup, Inventory
+from fle.env.tools import Tool
+from fle.env.utils.rcon import _remove_numerical_keys
+
+
+@dataclass
+class ObservationSnapshot:
+    """Everything the gym environment reads back after a step, fetched in one round trip"""
+
+    production_score: float
+    automated_score: float
+    elapsed_ticks: int
+    production_stats: Dict[str, Any]
+    research: ResearchState
+    inventories: List[Inventory] = field(default_factory=list)
+    entities: Optional[List[Union[Entity, EntityGroup]]] = None
+    entity_state: Optional[str] = None
+
+
+class Observe(Tool):
+    mutates_state = False
+
+    def __init__(self, connection, game_state):
+        super().__init__(connection, game_state)
+
+    def __call__(
+        self,
+        include_entities: bool = True,
+        include_entity_state: bool = True,
+        radius: float = 1000,
+    ) -> ObservationSnapshot:
+        """
+        Collects the score, production stats, elapsed ticks, research state, the inventories of all
+        agents and (optionally) the entities around the player and the serialized entity state in a
+        single RCON round trip.
+
+        Sections that fail on the server are re-fetched with their individual tool.
+        :param include_entities: Whether to include `get_entities()` around the player
+        :param include_entity_state: Whether to include the compressed `_save_entity_state()` blob
+        :param radius: Radius passed to `get_entities`
+        :return: ObservationSnapshot
+        """
+        num_agents = self.game_state.instance.num_agents
+        response, _ = self.execute(
+            self.player_index,
+            num_agents,
+            radius,
+            include_entities,
+            include_entity_state,
+        )
+
+        if not isinstance(response, dict):
+            raise Exception("Could not observe the game state", response)
+
+        production_score, automated_score = self._section(
+            response.get("score"),
+            lambda raw: self._tool("score")._parse(raw),
+            lambda: self.game_state.score(),
+        )
+        production_stats = self._section(
+            response.get("production_stats"),
+            lambda raw: raw,
+            lambda: self.game_state._get_production_stats(),
+        )
+        research = self._section(
+            response.get("research"),
+            lambda raw: self._tool("_save_research_state")._parse(raw),
+            lambda: self.game_state._save_research_state(),
+        )
+
+        raw_inventories = _remove_numerical_keys(response.get("inventories") or {})
+        if not isinstance(raw_inventories, list):
+            raw_inventories = []
+        inventories = []
+        for agent_idx in range(num_agents):
+            namespace = self.game_state.instance.namespaces[agent_idx]
+            raw = raw_inventories[agent_idx] if agent_idx < len(raw_inventories) else ""
+            inventories.append(
+                self._section(
+                    raw,
+                    lambda inventory: (
+                        Inventory(**inventory)
+                        if isinstance(inventory, dict)
+                        else Inventory()
+                    ),
+                    lambda: namespace.inspect_inventory(),
+                )
+            )
+
+        entities = None
+        if include_entities:
+            entities = self._section(
+                response.get("entities"),
+                lambda raw: self._tool("get_entities")._materialize(raw),
+                lambda: self.game_state.get_entities(radius=radius),
+            )
+
+        entity_state = None
+        if include_entity_state:
+            entity_state = self._section(
+                response.get("entity_state"),
+                lambda raw: self._tool("_save_entity_state")._encode(
+                    raw, encode=True, compress=True
+                ),
+                lambda: self.game_state._save_entity_state(compress=True, encode=True),
+            )
+
+        return ObservationSnapshot(
+            production_score=production_score,
+            automated_score=automated_score or 0,
+            elapsed_ticks=int(response.get("elapsed_ticks") or 0),
+            production_stats=production_stats,
+            research=research,
+            inventories=inventories,
+            entities=entities,
+            entity_state=entity_state,
+        )
+
+    def _tool(self, name: str) -> Tool:
+        """Get the (unwrapped) tool instance registered in this agent's namespace"""
+        return inspect.unwrap(getattr(self.game_state, name))
+
+    def _section(self, raw, parse, fallback):
+        """
+        Parse one section of the batched response the same way its own tool would, falling back to
+        a separate call of that tool if the section is missing or failed on the server (in which
+        case it holds the quoted error string).
+        """
+        if raw is None or isinstance(raw, str):
+            return fallback()
+        try:
+            return parse(_remove_numerical_keys(raw))
+        except Exception:
+            return fallback()
@@ -0,0 +1,39 @@
+-- Batched observation: gathers everything the gym environment reads back after a step
+-- in a single RCON round trip. Each section is evaluated independently, so a failure in
+-- one of them is returned as a quoted error string instead of losing the whole observation.
+
+local function observe_section(fn, ...)
+    local ok, result = pcall(fn, ...)
+    if not ok then
+        return '"' .. tostring(result):gsub('["\n]', "'") .. '"'
+    end
+    return result
+end
+
+storage.actions.observe = function(player_index, num_agents, radius, include_entities, include_entity_state)
+    local observation = {
+        elapsed_ticks = storage.elapsed_ticks or 0,
+        score = observe_section(storage.actions.score),
+        production_stats = observe_section(storage.actions.production_stats, player_index),
+        research = observe_section(storage.actions.save_research_state, player_index),
+        inventories = {}
+    }
+
+    for agent_index = 1, num_agents do
+        observation.inventories[agent_index] = observe_section(
+            storage.actions.inspect_inventory, agent_index, true, 0, 0, ""
+        )
+    end
+
+    if include_entities then
+        observation.entities = observe_section(storage.actions.get_entities, player_index, radius, "[]")
+    end
+
+    if include_entity_state then
+        observation.entity_state = observe_section(
+            storage.actions.save_entity_state, player_index, 500, false, false, true
+        )
+    end
+
+    return observation
+end
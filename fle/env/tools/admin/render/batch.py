@@ -0,0 +1,268 @@
+"""
+Offline batch rendering of blueprints.
+
+Blueprints only need `Renderer`, so they are rendered here without a Factorio server. `render_blueprints` fans
+the files out over a process pool in which each worker keeps one `ImageResolver`. When the sprite directory
+has an atlas (see `build_sprite_atlas`), every worker memory-maps the same file, so the sprites are read from
+the shared page cache instead of being decoded from PNGs by each process. Images are written as soon as they
+are rendered, and a JSON-lines manifest records the outcome of every blueprint.
+"""
+
+import copy
+import json
+import multiprocessing
+import os
+import time
+from dataclasses import asdict
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from fle.commons.models.rendered_image import RenderedImage, Viewport
+from fle.env.tools.admin.render.constants import DEFAULT_SCALING
+from fle.env.tools.admin.render.image_resolver import ImageResolver
+from fle.env.tools.admin.render.renderer import Renderer
+from fle.env.tools.admin.render.sprite_cache import (
+    atlas_is_current,
+    build_sprite_atlas,
+)
+from fle.env.tools.admin.render.utils import find_fle_sprites_dir, parse_blueprint
+
+MANIFEST_FILE = "manifest.jsonl"
+
+# Largest side of a rendered image, in pixels
+MAX_DIMENSION = 1024
+
+# Resolver of the current worker process, created by `_init_worker`
+_image_resolver: Optional[ImageResolver] = None
+
+
+def renderer_from_blueprint(blueprint: Union[str, Dict]) -> Renderer:
+    """Renderer for a decoded blueprint, or a blueprint string"""
+    if isinstance(blueprint, str):
+        blueprint = parse_blueprint(blueprint)
+    blueprint = blueprint.get("blueprint", blueprint)
+    if "entities" not in blueprint:
+        raise ValueError("Blueprint passed with no entities")
+    return Renderer(entities=blueprint["entities"])
+
+
+def render_renderer(
+    renderer: Renderer,
+    image_resolver: ImageResolver,
+    max_dimension: int = MAX_DIMENSION,
+) -> RenderedImage:
+    """
+    Render at DEFAULT_SCALING pixels per tile, scaled down to fit in `max_dimension` pixels.
+
+    Args:
+        renderer: Renderer holding what to draw
+        image_resolver: Resolver loading the sprites
+        max_dimension: Largest side of the image, in pixels
+
+    Returns:
+        RenderedImage with the viewport mapping its pixels to world coordinates
+    """
+    size = renderer.get_size()
+    if size["width"] == 0 or size["height"] == 0:
+        raise Exception("Nothing to render.")
+
+    # Calculate the ideal dimensions
+    width = size["width"] * DEFAULT_SCALING
+    height = size["height"] * DEFAULT_SCALING
+
+    # Cap the resolution, maintaining the aspect ratio
+    if width > max_dimension or height > max_dimension:
+        aspect_ratio = width / height
+        if width > height:
+            width = max_dimension
+            height = int(max_dimension / aspect_ratio)
+        else:
+            height = max_dimension
+            width = int(max_dimension * aspect_ratio)
+
+    # Ensure dimensions are at least 1
+    width = max(1, width)
+    height = max(1, height)
+
+    # Calculate the actual scaling used for rendering
+    actual_scaling = min(width / size["width"], height / size["height"])
+
+    image = renderer.render(width, height, image_resolver)
+
+    # The renderer normalizes coordinates by subtracting offset_x/offset_y,
+    # so to get world coordinates, we add the offset back
+    viewport = Viewport(
+        world_min_x=size["minX"] + renderer.offset_x,
+        world_min_y=size["minY"] + renderer.offset_y,
+        world_max_x=size["maxX"] + renderer.offset_x,
+        world_max_y=size["maxY"] + renderer.offset_y,
+        center_x=renderer.offset_x,  # The center is at the offset (player position)
+        center_y=renderer.offset_y,
+        width_tiles=size["width"],
+        height_tiles=size["height"],
+        image_width=width,
+        image_height=height,
+        scaling=actual_scaling,
+    )
+    return RenderedImage(image, viewport)
+
+
+def render_blueprint(
+    blueprint: Union[str, Dict],
+    image_resolver: Optional[ImageResolver] = None,
+    max_dimension: int = MAX_DIMENSION,
+) -> RenderedImage:
+    """Render a blueprint without a Factorio server. The blueprint is not modified."""
+    if image_resolver is None:
+        image_resolver = _get_image_resolver()
+    if isinstance(blueprint, dict):
+        # The renderer rewrites the positions of the entities it is given
+        blueprint = copy.deepcopy(blueprint)
+    return render_renderer(
+        renderer_from_blueprint(blueprint), image_resolver, max_dimension
+    )
+
+
+def load_blueprint(path: Path) -> Union[str, Dict]:
+    """Blueprint stored in a JSON file, either decoded or as a blueprint string"""
+    with open(path) as f:
+        content = f.read()
+    try:
+        return json.loads(content)
+    except json.JSONDecodeError:
+        # Not JSON, so a raw blueprint string
+        return content.strip()
+
+
+def find_blueprints(paths: Iterable[Union[str, Path]]) -> List[Tuple[Path, Path]]:
+    """
+    Blueprint files among `paths`, searching directories recursively for JSON files.
+
+    Returns:
+        (blueprint file, image path relative to the output directory) pairs
+    """
+    blueprints = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            for file in sorted(path.rglob("*.json")):
+                blueprints.append((file, file.relative_to(path).with_suffix(".png")))
+        else:
+            blueprints.append((path, Path(path.name).with_suffix(".png")))
+    return blueprints
+
+
+def _get_image_resolver() -> ImageResolver:
+    global _image_resolver
+    if _image_resolver is None:
+        _image_resolver = ImageResolver()
+    return _image_resolver
+
+
+def _init_worker():
+    _get_image_resolver()
+
+
+def _render_file(job: Tuple[Path, Path, int]) -> Dict:
+    """Render one blueprint file to `image_path`, returning its manifest entry"""
+    blueprint_path, image_path, max_dimension = job
+    entry = {"blueprint": str(blueprint_path), "image": str(image_path)}
+    start = time.perf_counter()
+    try:
+        rendered = render_blueprint(
+            load_blueprint(blueprint_path), max_dimension=max_dimension
+        )
+        image_path.parent.mkdir(parents=True, exist_ok=True)
+        rendered.save(str(image_path))
+        entry["viewport"] = asdict(rendered.viewport)
+    except Exception as e:
+        entry["error"] = f"{type(e).__name__}: {e}"
+    entry["seconds"] = round(time.perf_counter() - start, 4)
+    return entry
+
+
+def iter_render_blueprints(
+    paths: Iterable[Union[str, Path]],
+    output_dir: Union[str, Path],
+    workers: Optional[int] = None,
+    overwrite: bool = False,
+    max_dimension: int = MAX_DIMENSION,
+) -> Iterator[Dict]:
+    """
+    Render blueprint files in a process pool, yielding the manifest entry of each as it finishes.
+
+    Args:
+        paths: Blueprint files, or directories of them
+        output_dir: Directory to write the images to, mirroring the layout of the input directories
+        workers: Number of worker processes (defaults to the number of CPUs)
+        overwrite: Whether to render blueprints whose image already exists
+        max_dimension: Largest side of the images, in pixels
+    """
+    output_dir = Path(output_dir)
+    jobs = [
+        (blueprint_path, output_dir / image_path, max_dimension)
+        for blueprint_path, image_path in find_blueprints(paths)
+        if overwrite or not (output_dir / image_path).exists()
+    ]
+    if not jobs:
+        return
+
+    workers = min(workers or os.cpu_count() or 1, len(jobs))
+    if workers == 1:
+        yield from map(_render_file, jobs)
+        return
+
+    with multiprocessing.Pool(workers, initializer=_init_worker) as pool:
+        # Small chunks keep the workers busy when blueprint sizes vary
+        chunksize = max(1, min(16, len(jobs) // (workers * 8)))
+        yield from pool.imap_unordered(_render_file, jobs, chunksize=chunksize)
+
+
+def render_blueprints(
+    paths: Iterable[Union[str, Path]],
+    output_dir: Union[str, Path],
+    workers: Optional[int] = None,
+    overwrite: bool = False,
+    max_dimension: int = MAX_DIMENSION,
+    build_atlas: bool = True,
+) -> Path:
+    """
+    Render blueprint files to `output_dir` in a process pool, appending an entry per blueprint to its manifest.
+
+    Args:
+        paths: Blueprint files, or directories of them
+        output_dir: Directory to write the images and manifest to
+        workers: Number of worker processes (defaults to the number of CPUs)
+        overwrite: Whether to render blueprints whose image already exists
+        max_dimension: Largest side of the images, in pixels
+        build_atlas: Whether to build the sprite atlas first if it is missing or older than the sprites
+
+    Returns:
+        Path of the manifest
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    sprites_dir = find_fle_sprites_dir()
+    if build_atlas and sprites_dir.exists() and not atlas_is_current(sprites_dir):
+        print(f"Building sprite atlas in {sprites_dir}")
+        try:
+            build_sprite_atlas(sprites_dir)
+        except OSError as e:
+            print(f"Could not build sprite atlas, workers will load PNGs: {e}")
+
+    manifest_path = output_dir / MANIFEST_FILE
+    rendered = failed = 0
+    with open(manifest_path, "a") as manifest:
+        for entry in iter_render_blueprints(
+            paths, output_dir, workers, overwrite, max_dimension
+        ):
+            manifest.write(json.dumps(entry) + "\n")
+            manifest.flush()
+            if "error" in entry:
+                failed += 1
+                print(f"Failed to render {entry['blueprint']}: {entry['error']}")
+            else:
+                rendered += 1
+
+    print(f"Rendered {rendered} blueprints ({failed} failed) to {output_dir}")
+    return manifest_path
@@ -1,9 +1,12 @@
 from typing import Dict, Optional, Union, List, Tuple
 
-from fle.commons.models.rendered_image import RenderedImage, Viewport
+from fle.commons.models.rendered_image import RenderedImage
 from fle.env import Position, Layer
 from fle.env.tools import Tool
-from fle.env.tools.admin.render.constants import DEFAULT_SCALING
+from fle.env.tools.admin.render.batch import (
+    render_renderer,
+    renderer_from_blueprint,
+)
 from fle.env.tools.admin.render.decoder import Decoder
 from fle.env.tools.admin.render.image_resolver import ImageResolver
 from fle.env.tools.admin.render.profiler import profile_method
@@ -12,6 +15,8 @@ from fle.env.tools.agent.get_entities.client import GetEntities
 
 
 class Render(Tool):
+    mutates_state = False
+
     def __init__(self, *args):
         super().__init__(*args)
         self.image_resolver = ImageResolver(".fle/sprites")
@@ -78,73 +83,15 @@ class Render(Tool):
         else:
             renderer = self.get_renderer_from_blueprint(blueprint)
 
-        # Calculate render size
-        size = renderer.get_size()
-        if size["width"] == 0 or size["height"] == 0:
-            raise Exception("Nothing to render.")
-
-        # Calculate the ideal dimensions
-        width = size["width"] * DEFAULT_SCALING
-        height = size["height"] * DEFAULT_SCALING
-
-        # Cap the resolution at 1024x1024
-        max_dimension = 1024
-        if width > max_dimension or height > max_dimension:
-            # Calculate new dimensions while maintaining aspect ratio
-            aspect_ratio = width / height
-            if width > height:
-                width = max_dimension
-                height = int(max_dimension / aspect_ratio)
-            else:
-                height = max_dimension
-                width = int(max_dimension * aspect_ratio)
-
-        # Ensure dimensions are at least 1
-        width = max(1, width)
-        height = max(1, height)
-
-        # Calculate the actual scaling used for rendering
-        actual_scaling = min(width / size["width"], height / size["height"])
-
-        # Render the blueprint - the renderer will calculate the appropriate scaling
-        image = renderer.render(width, height, self.image_resolver)
-
-        # Create viewport with world coordinates
-        # The renderer normalizes coordinates by subtracting offset_x/offset_y
-        # So to get world coordinates, we add the offset back
-        viewport = Viewport(
-            world_min_x=size["minX"] + renderer.offset_x,
-            world_min_y=size["minY"] + renderer.offset_y,
-            world_max_x=size["maxX"] + renderer.offset_x,
-            world_max_y=size["maxY"] + renderer.offset_y,
-            center_x=renderer.offset_x,  # The center is at the offset (player position)
-            center_y=renderer.offset_y,
-            width_tiles=size["width"],
-            height_tiles=size["height"],
-            image_width=width,
-            image_height=height,
-            scaling=actual_scaling,
-        )
+        rendered = render_renderer(renderer, self.image_resolver)
 
         if return_renderer:
-            return RenderedImage(image, viewport), renderer
+            return rendered, renderer
         else:
-            return RenderedImage(image, viewport)
+            return rendered
 
     def get_renderer_from_blueprint(self, blueprint):
-        if isinstance(blueprint, str):
-            raise NotImplementedError()
-            # entities = blueprint['entities']
-            # renderer = Renderer(
-            #     entities=entities
-            # )
-        else:
-            if "entities" not in blueprint:
-                raise ValueError("Blueprint passed with no entities")
-
-            entities = blueprint["entities"]
-            renderer = Renderer(entities=entities)
-        return renderer
+        return renderer_from_blueprint(blueprint)
 
     def get_renderer_from_map(
         self,
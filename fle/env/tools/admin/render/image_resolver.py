@@ -1,11 +1,12 @@
 """Image resolution and caching functionality."""
 
 import logging
-from typing import Optional, Dict
+from typing import Optional
 from PIL import Image
 
 from .utils import find_fle_sprites_dir
-from .profiler import profiler, profile_method
+from .profiler import profile_method
+from .sprite_cache import get_sprite_store
 
 logger = logging.getLogger(__name__)
 
@@ -20,7 +21,8 @@ class ImageResolver:
             images_dir: Directory containing sprite images
         """
         self.images_dir = find_fle_sprites_dir()
-        self.cache: Dict[str, Optional[Image.Image]] = {}
+        # Loaded sprites are shared by all resolvers for the same directory
+        self.store = get_sprite_store(self.images_dir)
         self._warned_missing_sprites = False
 
         if self.images_dir.exists():
@@ -42,25 +44,4 @@ class ImageResolver:
             PIL Image if found, None otherwise
         """
         filename = f"{name}_shadow" if shadow else name
-
-        if filename in self.cache and self.cache[filename]:
-            profiler.increment_counter("image_cache_hits")
-            return self.cache[filename]
-
-        profiler.increment_counter("image_cache_misses")
-        path = self.images_dir / f"{filename}.png"
-        if not path.exists():
-            self.cache[filename] = None
-            profiler.increment_counter("image_not_found")
-            return None
-
-        try:
-            with profiler.timer("image_load_from_disk"):
-                image = Image.open(path).convert("RGBA")
-            self.cache[filename] = image
-            profiler.increment_counter("images_loaded")
-            return image
-        except Exception:
-            self.cache[filename] = None
-            profiler.increment_counter("image_load_errors")
-            return None
+        return self.store.get(filename)
@@ -32,6 +32,7 @@ from fle.env.tools.admin.render.entity_grid import EntityGridView
 from fle.env.tools.admin.render.image_resolver import ImageResolver
 from fle.env.tools.admin.render.profiler import profiler, profile_method
 from fle.env.tools.admin.render.renderer_manager import renderer_manager
+from fle.env.tools.admin.render.sprite_cache import sprite_variants
 from fle.env.tools.admin.render.renderers.tree import (
     build_available_trees_index,
     get_tree_variant,
@@ -1151,33 +1152,19 @@ class Renderer:
             offset_y: Additional Y offset in pixels
             is_shadow: Whether this sprite is a shadow (will apply transparency)
         """
-        # Scale the sprite based on the scaling factor relative to DEFAULT_SCALING
+        # Scale the sprite based on the scaling factor relative to DEFAULT_SCALING, and apply shadow
+        # intensity if this is a shadow. Both are cached per sprite across renders.
         scale_ratio = scaling / DEFAULT_SCALING
+        shadow_intensity = (
+            SHADOW_INTENSITY if is_shadow and SHADOW_INTENSITY < 1.0 else None
+        )
+        if scale_ratio != 1.0 or shadow_intensity is not None:
+            sprite = sprite_variants.get(sprite, scale_ratio, shadow_intensity)
         if scale_ratio != 1.0:
-            new_width = max(1, int(sprite.width * scale_ratio))
-            new_height = max(1, int(sprite.height * scale_ratio))
-            sprite = sprite.resize((new_width, new_height), Image.Resampling.LANCZOS)
             # Scale offsets proportionally
             offset_x = int(offset_x * scale_ratio)
             offset_y = int(offset_y * scale_ratio)
 
-        # Apply shadow intensity if this is a shadow
-        if is_shadow and SHADOW_INTENSITY < 1.0:
-            # Create a copy to avoid modifying the cached image
-            sprite = sprite.copy()
-
-            # Convert to RGBA if not already
-            if sprite.mode != "RGBA":
-                sprite = sprite.convert("RGBA")
-
-            # Adjust the alpha channel
-            pixels = sprite.load()
-            for y in range(sprite.height):
-                for x in range(sprite.width):
-                    r, g, b, a = pixels[x, y]
-                    # Reduce alpha by the shadow intensity factor
-                    pixels[x, y] = (r, g, b, int(a * SHADOW_INTENSITY))
-
         start_x = (
             int((relative_x * scaling + scaling / 2) - sprite.width / 2) + offset_x
         )
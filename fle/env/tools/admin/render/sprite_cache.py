@@ -0,0 +1,248 @@
+"""Process-wide sprite caches shared by every ImageResolver and Renderer."""
+
+import json
+import logging
+import threading
+import weakref
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Hashable, Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+from .profiler import profiler
+
+logger = logging.getLogger(__name__)
+
+# Prebuilt atlas of every sprite in a directory (see `build_sprite_atlas`)
+ATLAS_DATA_FILE = "sprite_atlas.npy"
+ATLAS_INDEX_FILE = "sprite_atlas.json"
+
+DEFAULT_MAX_SPRITES = 4096
+DEFAULT_MAX_VARIANTS = 8192
+
+
+class LRUCache:
+    """Thread-safe LRU mapping with a maximum number of entries."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default=None):
+        with self._lock:
+            if key not in self._entries:
+                return default
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def put(self, key: Hashable, value) -> None:
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def _source_stamp(path: Path) -> Tuple[int, int]:
+    """(mtime in ns, size) of a sprite's PNG, recorded in the atlas to detect regenerated sprites"""
+    stat = path.stat()
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _load_atlas_index(index_path: Path) -> Dict[str, Tuple[int, int, int, int, int]]:
+    """
+    Sprite name -> (offset, width, height, PNG mtime, PNG size) of an atlas.
+    :raises ValueError: If the index was built without the PNG stamps, so it can't be checked
+    """
+    index = {
+        name: tuple(entry) for name, entry in json.loads(index_path.read_text()).items()
+    }
+    if any(len(entry) != 5 for entry in index.values()):
+        raise ValueError("atlas index has no source stamps, rebuild it")
+    return index
+
+
+def atlas_is_current(images_dir: Path) -> bool:
+    """Whether the directory has an atlas holding the current version of every PNG sprite in it."""
+    images_dir = Path(images_dir)
+    data_path = images_dir / ATLAS_DATA_FILE
+    index_path = images_dir / ATLAS_INDEX_FILE
+    if not (data_path.exists() and index_path.exists()):
+        return False
+    try:
+        index = _load_atlas_index(index_path)
+    except Exception:
+        return False
+    for path in images_dir.glob("*.png"):
+        entry = index.get(path.stem)
+        if entry is None or tuple(entry[3:]) != _source_stamp(path):
+            return False
+    return True
+
+
+def apply_shadow_intensity(sprite: Image.Image, intensity: float) -> Image.Image:
+    """Return a copy of the sprite with its alpha channel scaled by `intensity`."""
+    pixels = np.array(sprite.convert("RGBA"))
+    pixels[..., 3] = (pixels[..., 3] * intensity).astype(np.uint8)
+    return Image.fromarray(pixels, "RGBA")
+
+
+class SpriteStore:
+    """
+    Full-size sprites of one directory, loaded from the prebuilt atlas if there is one, else from PNGs.
+    Sprites whose PNG changed since the atlas was built are loaded from the PNG.
+    """
+
+    def __init__(self, images_dir: Path, max_sprites: int = DEFAULT_MAX_SPRITES):
+        self.images_dir = Path(images_dir)
+        self._sprites = LRUCache(max_sprites)
+        self._atlas: Optional[np.ndarray] = None
+        self._atlas_index: Dict[str, Tuple[int, int, int, int, int]] = {}
+
+        data_path = self.images_dir / ATLAS_DATA_FILE
+        index_path = self.images_dir / ATLAS_INDEX_FILE
+        if data_path.exists() and index_path.exists():
+            try:
+                self._atlas = np.load(data_path, mmap_mode="r")
+                self._atlas_index = _load_atlas_index(index_path)
+                logger.debug(
+                    f"Memory-mapped sprite atlas with {len(self._atlas_index)} sprites from {data_path}"
+                )
+            except Exception as e:
+                logger.warning(f"Could not load sprite atlas {data_path}: {e}")
+                self._atlas, self._atlas_index = None, {}
+
+    def get(self, filename: str) -> Optional[Image.Image]:
+        """Load a sprite by filename (without extension), or None if it doesn't exist."""
+        missing = object()
+        image = self._sprites.get(filename, missing)
+        if image is not missing:
+            profiler.increment_counter("image_cache_hits")
+            return image
+
+        profiler.increment_counter("image_cache_misses")
+        image = self._load(filename)
+        self._sprites.put(filename, image)
+        return image
+
+    def _load(self, filename: str) -> Optional[Image.Image]:
+        path = self.images_dir / f"{filename}.png"
+        if filename in self._atlas_index:
+            offset, width, height, *stamp = self._atlas_index[filename]
+            if path.exists() and _source_stamp(path) != tuple(stamp):
+                # Regenerated since the atlas was built
+                profiler.increment_counter("images_stale_in_atlas")
+            else:
+                # Copied out of the mapping, so renderers can't write through to the atlas
+                pixels = np.array(self._atlas[offset : offset + width * height * 4])
+                profiler.increment_counter("images_loaded_from_atlas")
+                return Image.fromarray(pixels.reshape(height, width, 4), "RGBA")
+
+        if not path.exists():
+            profiler.increment_counter("image_not_found")
+            return None
+
+        try:
+            with profiler.timer("image_load_from_disk"):
+                image = Image.open(path).convert("RGBA")
+            profiler.increment_counter("images_loaded")
+            return image
+        except Exception:
+            profiler.increment_counter("image_load_errors")
+            return None
+
+
+class SpriteVariantCache:
+    """
+    Scaled and shadowed versions of sprites, keyed by (sprite, scale, shadow). Sprites are identified by
+    object, so only long-lived ones (e.g. those held by a `SpriteStore`) get reused.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_MAX_VARIANTS):
+        self._variants = LRUCache(maxsize)
+
+    def get(
+        self, sprite: Image.Image, scale_ratio: float, shadow_intensity: Optional[float]
+    ) -> Image.Image:
+        key = (id(sprite), scale_ratio, shadow_intensity)
+        entry = self._variants.get(key)
+        # Ids can be reused once a sprite is garbage collected, so check it is still the same one
+        if entry is not None and entry[0]() is sprite:
+            profiler.increment_counter("sprite_variant_hits")
+            return entry[1]
+
+        profiler.increment_counter("sprite_variant_misses")
+        variant = sprite
+        if scale_ratio != 1.0:
+            new_width = max(1, int(sprite.width * scale_ratio))
+            new_height = max(1, int(sprite.height * scale_ratio))
+            variant = variant.resize((new_width, new_height), Image.Resampling.LANCZOS)
+        if shadow_intensity is not None:
+            variant = apply_shadow_intensity(variant, shadow_intensity)
+        self._variants.put(key, (weakref.ref(sprite), variant))
+        return variant
+
+    def clear(self) -> None:
+        self._variants.clear()
+
+
+_stores: Dict[Path, SpriteStore] = {}
+_stores_lock = threading.Lock()
+
+sprite_variants = SpriteVariantCache()
+
+
+def get_sprite_store(images_dir: Path) -> SpriteStore:
+    """Sprite store for a directory, shared by the whole process."""
+    images_dir = Path(images_dir).resolve()
+    with _stores_lock:
+        if images_dir not in _stores:
+            _stores[images_dir] = SpriteStore(images_dir)
+        return _stores[images_dir]
+
+
+def build_sprite_atlas(images_dir: Path) -> Path:
+    """Pack every PNG sprite in a directory into an atlas that `SpriteStore` memory-maps on startup. The index
+    records the mtime and size of each PNG, so sprites regenerated later are not served from the atlas.
+
+    Args:
+        images_dir: Directory containing sprite images
+
+    Returns:
+        Path of the atlas data file
+    """
+    images_dir = Path(images_dir)
+    index = {}
+    chunks = []
+    offset = 0
+    for path in sorted(images_dir.glob("*.png")):
+        try:
+            stamp = _source_stamp(path)
+            pixels = np.asarray(Image.open(path).convert("RGBA"), dtype=np.uint8)
+        except Exception as e:
+            logger.warning(f"Skipping sprite {path}: {e}")
+            continue
+        height, width = pixels.shape[:2]
+        index[path.stem] = (offset, width, height, *stamp)
+        chunks.append(pixels.reshape(-1))
+        offset += pixels.size
+
+    data_path = images_dir / ATLAS_DATA_FILE
+    atlas = np.concatenate(chunks) if chunks else np.zeros(0, dtype=np.uint8)
+    np.save(data_path, atlas)
+    (images_dir / ATLAS_INDEX_FILE).write_text(json.dumps(index))
+    return data_path
@@ -15,6 +15,8 @@ MAX_TILES = (
 class RenderSimple(Tool):
     """Render tool for visualizing Factorio entities"""
 
+    mutates_state = False
+
     def __init__(self, connection, game_state):
         super().__init__(connection, game_state)
         self.renderer = Renderer()
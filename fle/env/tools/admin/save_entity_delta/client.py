@@ -0,0 +1,48 @@
+import uuid
+from typing import Optional
+
+from fle.commons.models.entity_delta import EntityDelta
+from fle.env.tools import Tool
+from fle.env.utils.rcon import _remove_numerical_keys
+
+
+class SaveEntityDelta(Tool):
+    mutates_state = False
+
+    def __init__(self, *args):
+        super().__init__(*args)
+
+    def __call__(
+        self,
+        expected_base: Optional[str] = None,
+        record: bool = True,
+        record_as: Optional[str] = None,
+        full_on_mismatch: bool = True,
+        distance: int = 500,
+    ) -> EntityDelta:
+        """
+        Saves the entities that changed since the baseline snapshot recorded on the server.
+        :param expected_base: Id of the snapshot the caller holds. If the server's baseline has this id, only
+            the changed and removed entities are returned, otherwise the full entity state (see `full_on_mismatch`).
+        :param record: Whether to record the current entity state as the new baseline under a fresh id
+        :param record_as: Record the current entity state under this id instead (e.g. after restoring a snapshot)
+        :param full_on_mismatch: Whether to return every entity if the baseline doesn't match `expected_base`
+        :param distance: Distance around the origin to search for entities, as in `_save_entity_state`
+        :return: EntityDelta. Its `base` is None if `changed` holds the full entity state.
+        """
+        baseline_id = record_as or (uuid.uuid4().hex if record else None)
+        response, _ = self.execute(
+            self.player_index, distance, expected_base, baseline_id, full_on_mismatch
+        )
+
+        if not isinstance(response, dict):
+            raise Exception("Could not save the entity delta", response)
+
+        changed = _remove_numerical_keys(response.get("changed") or [])
+        removed = _remove_numerical_keys(response.get("removed") or [])
+        return EntityDelta(
+            id=response.get("id"),
+            base=response.get("base"),
+            changed=changed if isinstance(changed, list) else [],
+            removed=removed if isinstance(removed, list) else [],
+        )
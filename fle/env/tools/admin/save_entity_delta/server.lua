@@ -0,0 +1,73 @@
+-- Incremental counterpart of save_entity_state.
+-- The serialized state of every entity is fingerprinted and compared against the baseline recorded at the
+-- last snapshot, so only entities that were created, destroyed or modified since then are sent back.
+
+local function format_number(value)
+    return string.format("%.14g", tonumber(value) or 0)
+end
+
+-- Must match `entity_group` in fle/commons/models/entity_delta.py
+local function entity_group(state)
+    local name = (string.gsub(state.name, '"', ''))
+    if name == "character" then
+        return "character@" .. tostring(state.agent_index)
+    end
+    return name .. "@" .. format_number(state.position.x) .. "," .. format_number(state.position.y)
+end
+
+storage.actions.save_entity_delta = function(player_index, distance, expected_base, baseline_id, full_on_mismatch)
+    local states = storage.actions.save_entity_state(player_index, distance, false, false, true)
+
+    local keys = {}
+    local groups = {}
+    local fingerprints = {}
+    local counts = {}
+    for i, state in ipairs(states) do
+        local group = entity_group(state)
+        counts[group] = (counts[group] or 0) + 1
+        local key = group .. "#" .. counts[group]
+        keys[i] = key
+        groups[key] = group
+        fingerprints[key] = helpers.table_to_json(state)
+    end
+
+    storage.entity_state_baselines = storage.entity_state_baselines or {}
+    local baseline = storage.entity_state_baselines[player_index]
+
+    local result = {changed = {}, removed = {}}
+    if baseline and expected_base and baseline.id == expected_base then
+        result.base = '"' .. baseline.id .. '"'
+
+        -- Entities sharing a position are restored together, so a change to one marks its whole group
+        local dirty = {}
+        for key, fingerprint in pairs(fingerprints) do
+            if baseline.fingerprints[key] ~= fingerprint then
+                dirty[groups[key]] = true
+            end
+        end
+        for key, _ in pairs(baseline.fingerprints) do
+            if not fingerprints[key] then
+                dirty[baseline.groups[key]] = true
+                table.insert(result.removed, '"' .. key .. '"')
+            end
+        end
+        for i, state in ipairs(states) do
+            if dirty[groups[keys[i]]] then
+                table.insert(result.changed, state)
+            end
+        end
+    elseif full_on_mismatch then
+        result.changed = states
+    end
+
+    if baseline_id then
+        storage.entity_state_baselines[player_index] = {
+            id = baseline_id,
+            fingerprints = fingerprints,
+            groups = groups
+        }
+        result.id = '"' .. baseline_id .. '"'
+    end
+
+    return result
+end
@@ -7,6 +7,8 @@ from fle.env.tools import Tool
 
 
 class SaveEntityState(Tool):
+    mutates_state = False
+
     def __init__(self, *args):
         super().__init__(*args)
 
@@ -38,6 +40,12 @@ class SaveEntityState(Tool):
             items_on_ground,
         )
 
+        return self._encode(entities, encode=encode, compress=compress)
+
+    def _encode(self, entities, encode=False, compress=False) -> Union[List[Dict], str]:
+        """
+        Optionally JSON-encode (and compress) the raw entity list returned by the server.
+        """
         if encode:
             encoded_string = json.dumps(entities).encode()
             if compress:
@@ -4,6 +4,8 @@ from fle.env.tools import Tool
 
 
 class SaveResearchState(Tool):
+    mutates_state = False
+
     def __init__(self, connection, game_state):
         super().__init__(connection, game_state)
 
@@ -15,7 +17,12 @@ class SaveResearchState(Tool):
             ResearchState: Complete research state including all technologies
         """
         state, _ = self.execute(self.player_index)
+        return self._parse(state)
 
+    def _parse(self, state) -> ResearchState:
+        """
+        Convert a raw `save_research_state` server response into a ResearchState
+        """
         if not isinstance(state, dict):
             raise Exception(f"Could not save research state: {state}")
 
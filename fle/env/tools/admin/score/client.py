@@ -2,6 +2,8 @@ from fle.env.tools import Tool
 
 
 class Reward(Tool):
+    mutates_state = False
+
     def __init__(self, connection, game_state):
         super().__init__(connection, game_state)
         self.name = "score"
@@ -1,16 +1,3 @@
-local function get_total_production_counts(production_statistics)
-  local produced = production_statistics.input_counts
-  local consumed = production_statistics.output_counts
-  for name, value in pairs (consumed) do
-    if produced[name] then
-      produced[name] = produced[name] - value
-    else
-      produced[name] = -value
-    end
-  end
-  return produced
-end
-
 local function get_raw_resources()
   local raw_resources = {}
   local entities = prototypes.entity
@@ -306,43 +293,82 @@ production_score.generate_price_list = function(param)
   return price_list
 end
 
+-- Prototypes (and so prices) can only change when the active mods do
+local function get_mods_fingerprint()
+  local mods = {}
+  for name, version in pairs (script.active_mods) do
+    table.insert(mods, name .. "@" .. version)
+  end
+  table.sort(mods)
+  return table.concat(mods, ",")
+end
+
+-- The price list walks every item, fluid and recipe prototype, so it is generated once per game and kept in
+-- storage until the mods change
+production_score.get_price_list = function()
+  local fingerprint = get_mods_fingerprint()
+  if not storage.price_list or storage.price_list_mods ~= fingerprint then
+    storage.price_list = production_score.generate_price_list()
+    storage.price_list_mods = fingerprint
+  end
+  return storage.price_list
+end
+
+storage.get_price_list = production_score.get_price_list
+
+-- Value of everything produced minus everything consumed, only visiting items that have statistics
+local function get_statistics_value(production_statistics, price_list)
+  local value = 0
+  for name, count in pairs (production_statistics.input_counts) do
+    local price = price_list[name]
+    if price then
+      value = value + (price * count)
+    end
+  end
+  for name, count in pairs (production_statistics.output_counts) do
+    local price = price_list[name]
+    if price then
+      value = value - (price * count)
+    end
+  end
+  return value
+end
+
 production_score.get_production_scores = function(_price_list)
-  local price_list = _price_list or production_score.generate_price_list()
+  local price_list = _price_list or production_score.get_price_list()
   local scores = {}
   local surface = game.surfaces[1]
   for k, force in pairs (game.forces) do
-    local score = 0
     -- Factorio 2.0: production_statistics is now a method requiring surface parameter
-    for name, value in pairs (get_total_production_counts(force.get_item_production_statistics(surface))) do
-      local price = price_list[name]
-      if price then
-        score = score + (price * value)
-      end
-    end
-    for name, value in pairs (get_total_production_counts(force.get_fluid_production_statistics(surface))) do
-      local price = price_list[name]
-      if price then
-        score = score + (price * value)
-      end
-    end
+    local score = get_statistics_value(force.get_item_production_statistics(surface), price_list)
+      + get_statistics_value(force.get_fluid_production_statistics(surface), price_list)
     scores[force.name] = math.floor(score)
   end
   return scores
 end
 
-function dump(o)
+local function dump_into(o, buffer)
   if type(o) == 'table' then
-     local s = '{ '
+     buffer[#buffer + 1] = '{ '
      for k,v in pairs(o) do
         if type(k) ~= 'number' then k = '"'..k..'"' end
-        s = s .. '['..k..'] = ' .. dump(v) .. ','
+        buffer[#buffer + 1] = '['..k..'] = '
+        dump_into(v, buffer)
+        buffer[#buffer + 1] = ','
      end
-     return s .. '} '
+     buffer[#buffer + 1] = '} '
   else
-     return tostring(o)
+     buffer[#buffer + 1] = tostring(o)
   end
 end
 
+-- Same as `dump()` in utils.lua
+function dump(o)
+  local buffer = {}
+  dump_into(o, buffer)
+  return table.concat(buffer)
+end
+
 storage.goal = nil
 
 local scores = production_score.get_production_scores()
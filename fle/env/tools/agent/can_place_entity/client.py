@@ -4,6 +4,8 @@ from fle.env.tools import Tool
 
 
 class CanPlaceEntity(Tool):
+    mutates_state = False
+
     def __init__(self, *args):
         super().__init__(*args)
 
@@ -7,6 +7,8 @@ from fle.env.tools import Tool
 
 
 class GetConnectionAmount(Tool):
+    mutates_state = False
+
     def __init__(self, connection, game_state):
         self.game_state = game_state
         super().__init__(connection, game_state)
@@ -1,18 +1,55 @@
+import time
 from time import sleep
 from typing import List, Set, Union
 
 from fle.env.entities import Position, Entity, EntityGroup
-from fle.env.game_types import Prototype
+from fle.env.game_types import Prototype, prototype_entry
 from fle.env.tools.agent.connect_entities.groupable_entities import (
     agglomerate_groupable_entities,
 )
 from fle.env.tools import Tool
 
+# Longest to wait for the game to tick after a mutating tool call, and how often to check
+TICK_BARRIER_TIMEOUT = 0.1
+TICK_POLL_INTERVAL = 0.005
+
+
+def _replace_with_groups(entities_list, members):
+    # Filter by identity: comparing pydantic models for `list.remove` is slow on large factories
+    grouped = {id(entity) for entity in members}
+    group = agglomerate_groupable_entities(members)
+    return [entity for entity in entities_list if id(entity) not in grouped] + group
+
 
 class GetEntities(Tool):
+    mutates_state = False
+
     def __init__(self, connection, game_state):
         super().__init__(connection, game_state)
 
+    def _execute_after_mutations(self, radius, entity_names, position_x, position_y):
+        """
+        Entities only reflect an action (e.g. a new status or inserted items) from the tick after it ran. The
+        server reports the query as pending while it is still on the tick of the last mutating tool call (see
+        `Controller.mutates_state`), in which case we retry once the game has moved on. Queries that follow
+        other queries run straight away. If the game doesn't tick (e.g. it is paused), the query runs anyway
+        after `TICK_BARRIER_TIMEOUT`.
+        """
+        deadline = time.monotonic() + TICK_BARRIER_TIMEOUT
+        while True:
+            wait_for_tick = time.monotonic() < deadline
+            response, time_elapsed = self.execute(
+                self.player_index,
+                radius,
+                entity_names,
+                position_x,
+                position_y,
+                wait_for_tick,
+            )
+            if not (isinstance(response, dict) and response.get("pending")):
+                return response, time_elapsed
+            sleep(TICK_POLL_INTERVAL)
+
     # @cached(max_size=16, ttl=0.15)
     def __call__(
         self,
@@ -82,249 +119,16 @@ class GetEntities(Tool):
                 else "[]"
             )
 
-            # We need to add a small 50ms sleep to ensure that the entities have updated after previous actions
-            sleep(0.1)
-
-            if position is None:
-                response, time_elapsed = self.execute(
-                    self.player_index, radius, entity_names
-                )
-            else:
-                response, time_elapsed = self.execute(
-                    self.player_index, radius, entity_names, position.x, position.y
-                )
-
-            if not response:
-                return []
-
-            if (not isinstance(response, dict) and not response) or isinstance(
-                response, str
-            ):  # or (isinstance(response, dict) and not response):
-                raise Exception("Could not get entities", response)
-
-            entities_list = []
-            for raw_entity_data in response:
-                if isinstance(raw_entity_data, list):
-                    continue
-
-                entity_data = self.clean_response(raw_entity_data)
-                # Find the matching Prototype
-                matching_prototype = None
-                for prototype in Prototype:
-                    if prototype.value[0] == entity_data["name"].replace("_", "-"):
-                        matching_prototype = prototype
-                        break
-
-                if matching_prototype is None:
-                    if "name" in entity_data and entity_data["name"] != "entity-ghost":
-                        print(
-                            f"Warning: No matching Prototype found for {entity_data['name']}"
-                        )
-                    continue
-
-                # Apply standard filtering - check against expanded entities too
-                if (
-                    entities
-                    and matching_prototype not in entities
-                    and matching_prototype not in expanded_entities
-                ):
-                    continue
-
-                metaclass = matching_prototype.value[1]
-                while isinstance(metaclass, tuple):
-                    metaclass = metaclass[1]
-
-                # Process nested dictionaries (like inventories)
-                for key, value in entity_data.items():
-                    if isinstance(value, dict):
-                        entity_data[key] = self.process_nested_dict(value)
-
-                entity_data["prototype"] = matching_prototype
-
-                # remove all empty values from the entity_data dictionary
-                entity_data = {
-                    k: v for k, v in entity_data.items() if v or isinstance(v, int)
-                }
-
-                try:
-                    if "inventory" in entity_data:
-                        if isinstance(entity_data["inventory"], list):
-                            for inv in entity_data["inventory"]:
-                                entity_data["inventory"] += inv
-                        else:
-                            inventory_data = {
-                                k: v
-                                for k, v in entity_data["inventory"].items()
-                                if v or isinstance(v, int)
-                            }
-                            entity_data["inventory"] = inventory_data
-
-                    entity = metaclass(**entity_data)
-                    entities_list.append(entity)
-                except Exception as e1:
-                    print(f"Could not create {entity_data['name']} object: {e1}")
-
-            # Group entities when:
-            # 1. User explicitly requests group types, OR
-            # 2. User provides a position filter (suggesting they want nearby entities grouped), OR
-            # 3. No specific entities requested (get all entities - should be grouped), OR
-            # 4. User requests individual pole entities (restore original behavior - poles are always grouped)
-            pole_types = {
-                Prototype.SmallElectricPole,
-                Prototype.MediumElectricPole,
-                Prototype.BigElectricPole,
-            }
-            should_group = (
-                not entities  # No filter = group everything
-                or any(
-                    proto
-                    in {
-                        Prototype.ElectricityGroup,
-                        Prototype.PipeGroup,
-                        Prototype.BeltGroup,
-                    }
-                    for proto in entities
-                )  # Explicit group request
-                or (
-                    entities and position is not None
-                )  # Individual entities with position filter = group for convenience
+            response, time_elapsed = self._execute_after_mutations(
+                radius,
+                entity_names,
+                position.x if position is not None else None,
+                position.y if position is not None else None,
             )
 
-            if should_group:
-                # get all pipes into a list
-                pipes = [
-                    entity
-                    for entity in entities_list
-                    if hasattr(entity, "prototype")
-                    and entity.prototype in (Prototype.Pipe, Prototype.UndergroundPipe)
-                ]
-                group = agglomerate_groupable_entities(pipes)
-                [entities_list.remove(pipe) for pipe in pipes]
-                entities_list.extend(group)
-
-                poles = [
-                    entity
-                    for entity in entities_list
-                    if hasattr(entity, "prototype")
-                    and entity.prototype
-                    in (
-                        Prototype.SmallElectricPole,
-                        Prototype.BigElectricPole,
-                        Prototype.MediumElectricPole,
-                    )
-                ]
-                group = agglomerate_groupable_entities(poles)
-                [entities_list.remove(pole) for pole in poles]
-                entities_list.extend(group)
-
-                walls = [
-                    entity
-                    for entity in entities_list
-                    if hasattr(entity, "prototype")
-                    and entity.prototype == Prototype.StoneWall
-                ]
-                group = agglomerate_groupable_entities(walls)
-                [entities_list.remove(wall) for wall in walls]
-                entities_list.extend(group)
-
-                belt_types = (
-                    Prototype.TransportBelt,
-                    Prototype.FastTransportBelt,
-                    Prototype.ExpressTransportBelt,
-                    Prototype.UndergroundBelt,
-                    Prototype.FastUndergroundBelt,
-                    Prototype.ExpressUndergroundBelt,
-                )
-                belts = [
-                    entity
-                    for entity in entities_list
-                    if hasattr(entity, "prototype") and entity.prototype in belt_types
-                ]
-                group = agglomerate_groupable_entities(belts)
-                [entities_list.remove(belt) for belt in belts]
-                entities_list.extend(group)
-
-            # Final filtering after grouping is complete
-            if entities:
-                filtered_entities = []
-                for entity in entities_list:
-                    # Check entity prototype or group type
-                    if hasattr(entity, "prototype") and (
-                        entity.prototype in entities
-                        or entity.prototype in expanded_entities
-                    ):
-                        filtered_entities.append(entity)
-                    elif hasattr(entity, "__class__"):
-                        # Handle group entities
-                        if entity.__class__.__name__ == "ElectricityGroup":
-                            pole_types = {
-                                Prototype.SmallElectricPole,
-                                Prototype.MediumElectricPole,
-                                Prototype.BigElectricPole,
-                            }
-                            if Prototype.ElectricityGroup in group_requests:
-                                # Explicit group request - return the group
-                                filtered_entities.append(entity)
-                            elif (
-                                any(pole_type in entities for pole_type in pole_types)
-                                and position is not None
-                            ):
-                                # Individual poles requested with position - return group for convenience
-                                filtered_entities.append(entity)
-                            elif any(pole_type in entities for pole_type in pole_types):
-                                # Individual poles requested - return group (restores original behavior)
-                                # Power poles are inherently networked, so groups are more useful than individuals
-                                filtered_entities.append(entity)
-                        elif entity.__class__.__name__ == "PipeGroup":
-                            pipe_types = {Prototype.Pipe, Prototype.UndergroundPipe}
-                            if Prototype.PipeGroup in group_requests:
-                                # Explicit group request - return the group
-                                filtered_entities.append(entity)
-                            elif (
-                                any(pipe_type in entities for pipe_type in pipe_types)
-                                and position is not None
-                            ):
-                                # Individual pipes requested with position - return group for convenience
-                                filtered_entities.append(entity)
-                            elif any(pipe_type in entities for pipe_type in pipe_types):
-                                # Individual pipes requested - return group (restores original behavior)
-                                # Pipes are inherently networked, so groups are more useful than individuals
-                                filtered_entities.append(entity)
-                        elif entity.__class__.__name__ == "BeltGroup":
-                            belt_types = {
-                                Prototype.TransportBelt,
-                                Prototype.FastTransportBelt,
-                                Prototype.ExpressTransportBelt,
-                                Prototype.UndergroundBelt,
-                                Prototype.FastUndergroundBelt,
-                                Prototype.ExpressUndergroundBelt,
-                            }
-                            if Prototype.BeltGroup in group_requests:
-                                # Explicit group request - return the group
-                                filtered_entities.append(entity)
-                            elif (
-                                any(belt_type in entities for belt_type in belt_types)
-                                and position is not None
-                            ):
-                                # Individual belts requested with position - return group for convenience
-                                filtered_entities.append(entity)
-                            elif (
-                                any(belt_type in entities for belt_type in belt_types)
-                                and position is None
-                            ):
-                                # Individual belts requested without position - extract individual belts from group
-                                for belt in entity.belts:
-                                    if (
-                                        hasattr(belt, "prototype")
-                                        and belt.prototype in entities
-                                    ):
-                                        filtered_entities.append(belt)
-                        elif entity.__class__.__name__ == "WallGroup":
-                            # WallGroup doesn't have a corresponding Prototype, but include if present
-                            filtered_entities.append(entity)
-                entities_list = filtered_entities
-
-            return entities_list
+            return self._materialize(
+                response, entities, expanded_entities, group_requests, position
+            )
 
         except Exception as e:
             # Include more context in error message for debugging
@@ -336,6 +140,235 @@ class GetEntities(Tool):
                 f"Error in GetEntities ({entity_info}, {position_info}, radius={radius}): {e}"
             )
 
+    def _materialize(
+        self,
+        response,
+        entities: Set[Prototype] = set(),
+        expanded_entities: Set[Prototype] = set(),
+        group_requests: Set[Prototype] = set(),
+        position: Position = None,
+    ) -> List[Union[Entity, EntityGroup]]:
+        """
+        Turn a raw `get_entities` server response into entity objects, applying
+        the same filtering and grouping rules as `__call__`.
+        """
+        if not response:
+            return []
+
+        if (not isinstance(response, dict) and not response) or isinstance(
+            response, str
+        ):  # or (isinstance(response, dict) and not response):
+            raise Exception("Could not get entities", response)
+
+        entities_list = []
+        for raw_entity_data in response:
+            if isinstance(raw_entity_data, list):
+                continue
+
+            entity_data = self.clean_response(raw_entity_data)
+            # Find the matching Prototype
+            entry = prototype_entry(entity_data["name"])
+
+            if entry is None:
+                if "name" in entity_data and entity_data["name"] != "entity-ghost":
+                    print(
+                        f"Warning: No matching Prototype found for {entity_data['name']}"
+                    )
+                continue
+            matching_prototype, metaclass = entry
+
+            # Apply standard filtering - check against expanded entities too
+            if (
+                entities
+                and matching_prototype not in entities
+                and matching_prototype not in expanded_entities
+            ):
+                continue
+
+            # Process nested dictionaries (like inventories)
+            for key, value in entity_data.items():
+                if isinstance(value, dict):
+                    entity_data[key] = self.process_nested_dict(value)
+
+            entity_data["prototype"] = matching_prototype
+
+            # remove all empty values from the entity_data dictionary
+            entity_data = {
+                k: v for k, v in entity_data.items() if v or isinstance(v, int)
+            }
+
+            try:
+                if "inventory" in entity_data:
+                    if isinstance(entity_data["inventory"], list):
+                        for inv in entity_data["inventory"]:
+                            entity_data["inventory"] += inv
+                    else:
+                        inventory_data = {
+                            k: v
+                            for k, v in entity_data["inventory"].items()
+                            if v or isinstance(v, int)
+                        }
+                        entity_data["inventory"] = inventory_data
+
+                entity = metaclass(**entity_data)
+                entities_list.append(entity)
+            except Exception as e1:
+                print(f"Could not create {entity_data['name']} object: {e1}")
+
+        # Group entities when:
+        # 1. User explicitly requests group types, OR
+        # 2. User provides a position filter (suggesting they want nearby entities grouped), OR
+        # 3. No specific entities requested (get all entities - should be grouped), OR
+        # 4. User requests individual pole entities (restore original behavior - poles are always grouped)
+        pole_types = {
+            Prototype.SmallElectricPole,
+            Prototype.MediumElectricPole,
+            Prototype.BigElectricPole,
+        }
+        should_group = (
+            not entities  # No filter = group everything
+            or any(
+                proto
+                in {
+                    Prototype.ElectricityGroup,
+                    Prototype.PipeGroup,
+                    Prototype.BeltGroup,
+                }
+                for proto in entities
+            )  # Explicit group request
+            or (
+                entities and position is not None
+            )  # Individual entities with position filter = group for convenience
+        )
+
+        if should_group:
+            # get all pipes into a list
+            pipes = [
+                entity
+                for entity in entities_list
+                if hasattr(entity, "prototype")
+                and entity.prototype in (Prototype.Pipe, Prototype.UndergroundPipe)
+            ]
+            entities_list = _replace_with_groups(entities_list, pipes)
+
+            poles = [
+                entity
+                for entity in entities_list
+                if hasattr(entity, "prototype")
+                and entity.prototype
+                in (
+                    Prototype.SmallElectricPole,
+                    Prototype.BigElectricPole,
+                    Prototype.MediumElectricPole,
+                )
+            ]
+            entities_list = _replace_with_groups(entities_list, poles)
+
+            walls = [
+                entity
+                for entity in entities_list
+                if hasattr(entity, "prototype")
+                and entity.prototype == Prototype.StoneWall
+            ]
+            entities_list = _replace_with_groups(entities_list, walls)
+
+            belt_types = (
+                Prototype.TransportBelt,
+                Prototype.FastTransportBelt,
+                Prototype.ExpressTransportBelt,
+                Prototype.UndergroundBelt,
+                Prototype.FastUndergroundBelt,
+                Prototype.ExpressUndergroundBelt,
+            )
+            belts = [
+                entity
+                for entity in entities_list
+                if hasattr(entity, "prototype") and entity.prototype in belt_types
+            ]
+            entities_list = _replace_with_groups(entities_list, belts)
+
+        # Final filtering after grouping is complete
+        if entities:
+            filtered_entities = []
+            for entity in entities_list:
+                # Check entity prototype or group type
+                if hasattr(entity, "prototype") and (
+                    entity.prototype in entities
+                    or entity.prototype in expanded_entities
+                ):
+                    filtered_entities.append(entity)
+                elif hasattr(entity, "__class__"):
+                    # Handle group entities
+                    if entity.__class__.__name__ == "ElectricityGroup":
+                        pole_types = {
+                            Prototype.SmallElectricPole,
+                            Prototype.MediumElectricPole,
+                            Prototype.BigElectricPole,
+                        }
+                        if Prototype.ElectricityGroup in group_requests:
+                            # Explicit group request - return the group
+                            filtered_entities.append(entity)
+                        elif (
+                            any(pole_type in entities for pole_type in pole_types)
+                            and position is not None
+                        ):
+                            # Individual poles requested with position - return group for convenience
+                            filtered_entities.append(entity)
+                        elif any(pole_type in entities for pole_type in pole_types):
+                            # Individual poles requested - return group (restores original behavior)
+                            # Power poles are inherently networked, so groups are more useful than individuals
+                            filtered_entities.append(entity)
+                    elif entity.__class__.__name__ == "PipeGroup":
+                        pipe_types = {Prototype.Pipe, Prototype.UndergroundPipe}
+                        if Prototype.PipeGroup in group_requests:
+                            # Explicit group request - return the group
+                            filtered_entities.append(entity)
+                        elif (
+                            any(pipe_type in entities for pipe_type in pipe_types)
+                            and position is not None
+                        ):
+                            # Individual pipes requested with position - return group for convenience
+                            filtered_entities.append(entity)
+                        elif any(pipe_type in entities for pipe_type in pipe_types):
+                            # Individual pipes requested - return group (restores original behavior)
+                            # Pipes are inherently networked, so groups are more useful than individuals
+                            filtered_entities.append(entity)
+                    elif entity.__class__.__name__ == "BeltGroup":
+                        belt_types = {
+                            Prototype.TransportBelt,
+                            Prototype.FastTransportBelt,
+                            Prototype.ExpressTransportBelt,
+                            Prototype.UndergroundBelt,
+                            Prototype.FastUndergroundBelt,
+                            Prototype.ExpressUndergroundBelt,
+                        }
+                        if Prototype.BeltGroup in group_requests:
+                            # Explicit group request - return the group
+                            filtered_entities.append(entity)
+                        elif (
+                            any(belt_type in entities for belt_type in belt_types)
+                            and position is not None
+                        ):
+                            # Individual belts requested with position - return group for convenience
+                            filtered_entities.append(entity)
+                        elif (
+                            any(belt_type in entities for belt_type in belt_types)
+                            and position is None
+                        ):
+                            # Individual belts requested without position - extract individual belts from group
+                            for belt in entity.belts:
+                                if (
+                                    hasattr(belt, "prototype")
+                                    and belt.prototype in entities
+                                ):
+                                    filtered_entities.append(belt)
+                    elif entity.__class__.__name__ == "WallGroup":
+                        # WallGroup doesn't have a corresponding Prototype, but include if present
+                        filtered_entities.append(entity)
+            entities_list = filtered_entities
+
+        return entities_list
+
     def process_nested_dict(self, nested_dict):
         """Helper method to process nested dictionaries"""
         if isinstance(nested_dict, dict):
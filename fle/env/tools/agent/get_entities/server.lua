@@ -1,4 +1,9 @@
-storage.actions.get_entities = function(player_index, radius, entity_names_json, position_x, position_y)
+storage.actions.get_entities = function(player_index, radius, entity_names_json, position_x, position_y, wait_for_tick)
+    -- Entities haven't been updated since the last mutating tool call yet, so let the client retry next tick
+    if wait_for_tick and storage.last_mutation_tick and game.tick <= storage.last_mutation_tick then
+        return {pending = true}
+    end
+
     -- Ensure we have a valid character, recreating if necessary
     local player = storage.utils.ensure_valid_character(player_index)
 
@@ -60,5 +65,5 @@ storage.actions.get_entities = function(player_index, radius, entity_names_json,
         end)
         -- Silently continue on any error - don't let one bad entity break the whole call
     end
-    return dump(result)
+    return result
 end
\ No newline at end of file
@@ -2,12 +2,14 @@ from time import sleep
 
 from fle.env.entities import Position, Entity
 
-from fle.env.game_types import Prototype
+from fle.env.game_types import Prototype, prototype_entries
 from fle.env.tools.agent.get_entities.client import GetEntities
 from fle.env.tools import Tool
 
 
 class GetEntity(Tool):
+    mutates_state = False
+
     def __init__(self, connection, game_state):
         super().__init__(connection, game_state)
         self.get_entities = GetEntities(connection, game_state)
@@ -47,9 +49,8 @@ class GetEntity(Tool):
         else:
             try:
                 x, y = self.get_position(position)
-                name, metaclass = entity.value
-                while isinstance(metaclass, tuple):
-                    metaclass = metaclass[1]
+                name = entity.value[0]
+                metaclass = prototype_entries[name].entity_class
 
                 sleep(0.05)
                 response, elapsed = self.execute(self.player_index, name, x, y)
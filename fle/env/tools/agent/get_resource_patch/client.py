@@ -6,6 +6,8 @@ from fle.env.tools import Tool
 
 
 class GetResourcePatch(Tool):
+    mutates_state = False
+
     def __init__(self, connection, game_state):
         super().__init__(connection, game_state)
 
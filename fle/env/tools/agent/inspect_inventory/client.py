@@ -5,6 +5,8 @@ from fle.env.tools import Tool
 
 
 class InspectInventory(Tool):
+    mutates_state = False
+
     def __init__(self, *args):
         super().__init__(*args)
 
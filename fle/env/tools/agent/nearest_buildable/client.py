@@ -4,6 +4,8 @@ from fle.env.tools import Tool
 
 
 class NearestBuildable(Tool):
+    mutates_state = False
+
     def __init__(self, lua_script_manager, game_state):
         super().__init__(lua_script_manager, game_state)
         # self.connection = connection
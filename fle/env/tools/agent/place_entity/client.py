@@ -2,7 +2,7 @@ from time import sleep
 
 from fle.env.entities import Position, Entity
 from fle.env import DirectionInternal, Direction
-from fle.env.game_types import Prototype
+from fle.env.game_types import Prototype, prototype_entries
 from fle.env.tools.agent.get_entity.client import GetEntity
 from fle.env.tools.agent.pickup_entity.client import PickupEntity
 from fle.env.tools import Tool
@@ -48,9 +48,8 @@ class PlaceObject(Tool):
 
         x, y = self.get_position(position)
         try:
-            name, metaclass = entity.value
-            while isinstance(metaclass, tuple):
-                metaclass = metaclass[1]
+            name = entity.value[0]
+            metaclass = prototype_entries[name].entity_class
         except Exception as e:
             raise Exception(f"Passed in {entity} argument is not a valid Prototype", e)
 
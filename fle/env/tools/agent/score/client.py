@@ -2,6 +2,8 @@ from fle.env.tools import Tool
 
 
 class Reward(Tool):
+    mutates_state = False
+
     def __init__(self, connection, game_state):
         super().__init__(connection, game_state)
         self.name = "score"
@@ -10,6 +12,12 @@ class Reward(Tool):
 
     def __call__(self, *args, **kwargs):
         response, execution_time = self.execute(*args)
+        return self._parse(response)
+
+    def _parse(self, response):
+        """
+        Convert a raw `score` server response into (production_score, automated_score)
+        """
         if self.game_state.instance.initial_score:
             response["player"] -= self.game_state.instance.initial_score
 
@@ -1,7 +1,7 @@
 from typing import Union
 
 from fle.env.entities import Entity
-from fle.env.game_types import Prototype, RecipeName
+from fle.env.game_types import Prototype, RecipeName, prototype_entry
 from fle.env.tools import Tool
 
 
@@ -38,19 +38,15 @@ class SetEntityRecipe(Tool):
         cleaned_response = self.clean_response(response)
 
         # Find the matching Prototype
-        matching_prototype = None
-        for prototype in Prototype:
-            if prototype.value[0] == cleaned_response["name"].replace("_", "-"):
-                matching_prototype = prototype
-                break
+        entry = prototype_entry(cleaned_response["name"])
 
-        if matching_prototype is None:
+        if entry is None:
             print(
                 f"Warning: No matching Prototype found for {cleaned_response['name']}"
             )
             raise Exception(f"Could not set recipe to {name}", response)
 
-        metaclass = matching_prototype.value[1]
+        matching_prototype, metaclass = entry
 
         entity = metaclass(**cleaned_response, prototype=matching_prototype)
 
@@ -1,4 +1,3 @@
-import json
 import time
 from timeit import default_timer as timer
 from typing import List, Tuple, Dict, Any
@@ -13,7 +12,7 @@ from slpp import slpp as lua, ParseError
 from fle.env.entities import Direction
 from fle.env.lua_manager import LuaScriptManager
 from fle.env.namespace import FactorioNamespace
-from fle.env.utils.rcon import _lua2python
+from fle.env.utils.rcon import _json2python, _lua2python
 
 COMMAND = "/silent-command"
 
@@ -21,6 +20,12 @@ COMMAND = "/silent-command"
 MAX_PROCESSING_RETRIES = 3
 PROCESSING_RETRY_DELAY = 0.1  # seconds
 
+# How responses are serialized on the server (see `dump` and `dump_json` in mods/utils.lua), and decoded here
+SERIALIZERS = {
+    "dump": ("dump", _lua2python),
+    "json": ("dump_json", _json2python),
+}
+
 
 class RconProcessingError(Exception):
     """Raised when RCON returns [processing] indicating game engine is busy"""
@@ -29,6 +34,13 @@ class RconProcessingError(Exception):
 
 
 class Controller:
+    # Whether the tool changes the game. Calls to these record the tick they ran on, so that queries can wait
+    # for the entities to catch up (see `GetEntities`).
+    mutates_state = True
+    # Default for `execute`. "json" is faster to serialize and decode for large responses, but returns
+    # sequences as lists rather than dicts keyed by index, so tools opt in once their client handles that.
+    serializer = "dump"
+
     def __init__(
         self,
         lua_script_manager: "LuaScriptManager",
@@ -50,7 +62,13 @@ class Controller:
             """Check if dictionary represents a Lua-style list (keys are consecutive numbers from 1)"""
             if not isinstance(d, dict) or not d:
                 return False
-            keys = set(str(k) for k in d.keys())
+            keys = set()
+            for k in d.keys():
+                k = str(k)
+                # Most dicts are keyed by field names, so bail out early
+                if not k.isdigit():
+                    return False
+                keys.add(k)
             return all(str(i) in keys for i in range(1, len(d) + 1))
 
         def clean_value(value):
@@ -170,37 +188,35 @@ class Controller:
             return True
         return False
 
-    def _execute_once(self, *args) -> Tuple[Dict, Any, str]:
+    def _execute_once(self, *args, serializer=None) -> Tuple[Dict, Any, str]:
         """Execute a single command attempt, returns (result, elapsed, lua_response)"""
         start = time.time()
+        serialize, decode = SERIALIZERS[serializer or self.serializer]
         parameters = [lua.encode(arg) for arg in args]
         invocation = f"pcall(storage.actions.{self.name}{(', ' if parameters else '') + ','.join(parameters)})"
-        wrapped = f"{COMMAND} a, b = {invocation}; rcon.print(dump({{a=a, b=b}}))"
+        record_tick = (
+            "storage.last_mutation_tick = game.tick; " if self.mutates_state else ""
+        )
+        wrapped = f"{COMMAND} a, b = {invocation}; {record_tick}rcon.print({serialize}({{a=a, b=b}}))"
         lua_response = self.connection.rcon_client.send_command(wrapped)
 
         # Check for [processing] error from RCON layer
         if self._check_for_processing_error(lua_response):
             raise RconProcessingError("Game engine busy (processing), try again")
 
-        try:
-            possible_json = lua_response.split('["b"] = ')[
-                1
-            ]  # get a possible json blob
-            possible_json = possible_json.replace(",}", "")  # hacky lua table to json
-            parsed1 = json.loads(possible_json)
-            if isinstance(parsed1, dict):
-                parsed = {"a": True, "b": parsed1}
-            else:
-                parsed, _ = _lua2python(invocation, lua_response, start=start)
-        except Exception:
-            parsed, _ = _lua2python(invocation, lua_response, start=start)
+        # JSON blobs returned by tools (`helpers.table_to_json`) are decoded in place
+        parsed, _ = decode(invocation, lua_response, start=start)
 
         return parsed, lua_response
 
-    def execute(self, *args) -> Tuple[Dict, Any]:
+    def execute(self, *args, serializer=None) -> Tuple[Dict, Any]:
+        """
+        Call the tool's server action with these arguments.
+        :param serializer: "dump" or "json" (see `SERIALIZERS`), defaults to the tool's `serializer`
+        """
         for attempt in range(MAX_PROCESSING_RETRIES):
             try:
-                parsed, lua_response = self._execute_once(*args)
+                parsed, lua_response = self._execute_once(*args, serializer=serializer)
 
                 if parsed is None:
                     # Parsing failed - try to extract error message from raw RCON response
@@ -1,4 +1,7 @@
+import hashlib
+import os
 from pathlib import Path
+from typing import Dict, List
 
 from fle.env.utils.controller_loader.code_analyzer import CodeAnalyzer
 from fle.env.utils.controller_loader.manual_generator import ManualGenerator
@@ -7,6 +10,19 @@ from fle.env.utils.controller_loader.type_definition_processor import (
     TypeDefinitionProcessor,
 )
 
+# Bump when the layout of generated prompts changes, so that cached prompts are regenerated
+PROMPT_CACHE_VERSION = 1
+
+# Generated prompts by the hash of their sources, shared by every generator in the process
+_prompt_cache: Dict[str, str] = {}
+
+
+def prompt_cache_dir() -> Path:
+    """Directory of the on-disk prompt cache, set by FLE_PROMPT_CACHE_DIR"""
+    return Path(
+        os.getenv("FLE_PROMPT_CACHE_DIR", os.path.join(".fle", "cache", "prompts"))
+    )
+
 
 class SystemPromptGenerator:
     """Generates system prompts for the Factorio environment."""
@@ -15,7 +31,57 @@ class SystemPromptGenerator:
         self.base_path = Path(base_path)
         self.tool_path = self.base_path / "tools" / "agent"
 
+    def _source_files(self) -> List[Path]:
+        """Files the prompt is generated from: the agent tools, their manuals, types and entities"""
+        files = [
+            self.base_path / "tools" / "agent.md",
+            self.base_path / "game_types.py",
+            self.base_path / "entities.py",
+        ]
+        files += sorted(
+            path
+            for path in self.tool_path.rglob("*")
+            if path.suffix in (".py", ".md") and "__pycache__" not in path.parts
+        )
+        return files
+
+    def cache_key(self, multiagent_str: str = "") -> str:
+        """Hash of the contents of the prompt's sources and the multiagent instructions"""
+        digest = hashlib.sha256(f"v{PROMPT_CACHE_VERSION}\0".encode())
+        for path in self._source_files():
+            digest.update(str(path.relative_to(self.base_path)).encode() + b"\0")
+            digest.update(path.read_bytes() if path.exists() else b"")
+            digest.update(b"\0")
+        digest.update(multiagent_str.encode())
+        return digest.hexdigest()
+
     def generate(self, multiagent_str: str = "") -> str:
+        """
+        System prompt for the tools in `base_path`, reused from the in-process or on-disk cache while
+        none of its sources change.
+        """
+        key = self.cache_key(multiagent_str)
+        if key in _prompt_cache:
+            return _prompt_cache[key]
+
+        cache_path = prompt_cache_dir() / f"{key}.txt"
+        try:
+            prompt = cache_path.read_text()
+        except OSError:
+            prompt = self._generate(multiagent_str)
+            try:
+                cache_path.parent.mkdir(parents=True, exist_ok=True)
+                # Written to a temporary file first so concurrent readers never see a partial prompt
+                tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+                tmp_path.write_text(prompt)
+                tmp_path.replace(cache_path)
+            except OSError as e:
+                print(f"Could not cache system prompt in {cache_path}: {e}")
+
+        _prompt_cache[key] = prompt
+        return prompt
+
+    def _generate(self, multiagent_str: str = "") -> str:
         # Generate schema
         schema_generator = SchemaGenerator(str(self.tool_path))
         schema = schema_generator.generate_schema(with_docstring=True).replace(
@@ -0,0 +1,242 @@
+"""
+Fast decoder for the Lua table literals printed by the `dump()` helper over RCON.
+
+Every tool call returns `rcon.print(dump({a=a, b=b}))`, which historically was parsed with the
+pure-Python `slpp` decoder one character at a time. `dump()` always emits the same shapes
+(`{ ["key"] = value,[1] = value,} `), so most responses are rewritten into JSON with a few
+`str.replace` calls and handed to the C JSON decoder. Responses that can't be rewritten safely
+(escapes, brackets inside strings, bare words like `inf`) are tokenized with a single compiled
+regex instead. Both paths produce exactly the structures `slpp` produces for well-formed `dump()`
+output (integer keys stay dict keys, implicit sequences starting at 0 become lists), and JSON
+objects embedded as values (tools returning `helpers.table_to_json(...)`) are decoded in place.
+
+Anything outside that grammar (unquoted error strings, `-inf`, long strings, comments) raises
+`LuaDecodeError`, so callers can fall back to `slpp` and keep its lenient behaviour for those.
+"""
+
+import json
+import re
+from typing import Any
+
+__all__ = ["LuaDecodeError", "decode"]
+
+
+class LuaDecodeError(ValueError):
+    """Raised when a response is not a well-formed `dump()` table literal"""
+
+    pass
+
+
+_STRING = r""""(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*'"""
+_NUMBER = r"-?(?:0[xX][0-9a-fA-F]+|\d+(?:\.\d+)?(?:[eE][-+]\d+)?)"
+
+_TOKEN = re.compile(
+    rf"""\s*(?:
+        (?P<open>\{{)
+      | (?P<close>\}})
+      | (?P<comma>,)
+      | \[\s*(?P<key>{_STRING}|{_NUMBER})\s*\]\s*=
+      | (?P<name>[A-Za-z_]\w*)\s*=(?!=)
+      | (?P<string>{_STRING})
+      | (?P<number>{_NUMBER})(?![\w.])
+      | (?P<word>[A-Za-z_]\w*)
+    )""",
+    re.VERBOSE | re.DOTALL,
+)
+_JSON_OBJECT = re.compile(rf"\{{\s*{_STRING}\s*:", re.DOTALL)
+_ESCAPE = re.compile(r"\\(.)", re.DOTALL)
+_WORDS = {"true": True, "false": False, "nil": None}
+
+# Marks integer keys once they have been rewritten into JSON object keys
+_INT_KEY_MARK = "\x00"
+_INT_KEY = re.compile(r"\[(-?\d+)\] = ")
+_PLAIN_STRING = re.compile(r'"[^"]*"')
+
+_json_decoder = json.JSONDecoder()
+
+
+def _string(token: str) -> str:
+    quote = token[0]
+    body = token[1:-1]
+    if "\\" not in body:
+        return body
+    # slpp only unescapes the quote character; every other escape is kept verbatim
+    return _ESCAPE.sub(
+        lambda m: m.group(1) if m.group(1) == quote else m.group(0), body
+    )
+
+
+def _number(token: str):
+    digits = token.lstrip("-")
+    if digits[:2] in ("0x", "0X"):
+        if token[0] == "-":
+            raise LuaDecodeError(f"Unsupported negative hex literal '{token}'")
+        return int(token, 16)
+    if "." in token or "e" in token or "E" in token:
+        return float(token)
+    if len(digits) > 1 and digits[0] == "0":
+        # int(token, 0) rejects leading zeros, slpp then falls back to float
+        return float(token)
+    return int(token)
+
+
+def _word(token: str):
+    if token in _WORDS:
+        return _WORDS[token]
+    if token.startswith(("true", "false", "nil")):
+        # slpp stops reading at the keyword and misparses the remainder
+        raise LuaDecodeError(f"Ambiguous bare word '{token}'")
+    return token
+
+
+def _finish(table: dict):
+    """Convert tables with only 0..n-1 integer keys into lists, as slpp does"""
+    if not table:
+        return table
+    keys = list(table)
+    for key in keys:
+        if not isinstance(key, int) or isinstance(key, bool):
+            return table
+    ordered = sorted(keys)
+    if ordered[0] != 0 or ordered[-1] != len(ordered) - 1:
+        return table
+    array = []
+    for key in keys:
+        array.insert(key, table[key])
+    return array
+
+
+def _json_object(table: dict):
+    if _INT_KEY_MARK not in "".join(table):
+        return table
+    return _finish(
+        {
+            int(key[1:]) if key[:1] == _INT_KEY_MARK else key: value
+            for key, value in table.items()
+        }
+    )
+
+
+def _json_constant(token: str):
+    # Lua prints these as bare `inf`/`nan`, so they never come from `dump()` itself
+    raise LuaDecodeError(f"Unsupported constant '{token}'")
+
+
+_dump_json_decoder = json.JSONDecoder(
+    object_hook=_json_object, parse_constant=_json_constant, strict=False
+)
+
+
+def _int_key(match: re.Match) -> str:
+    return f'"{_INT_KEY_MARK}{match.group(1)}": '
+
+
+def _decode_json(text: str) -> Any:
+    """Rewrite `dump()` output into JSON and decode it with the C decoder"""
+    if "\\" in text or _INT_KEY_MARK in text:
+        raise LuaDecodeError("Response contains escapes")
+    # The rewrite below works on the raw text, so strings must not contain the delimiters it edits
+    strings = "".join(_PLAIN_STRING.findall(text))
+    if "[" in strings or "]" in strings or "}" in strings:
+        raise LuaDecodeError("Response contains brackets inside strings")
+
+    text = text.replace('["', '"').replace('"] = ', '": ').replace(",}", "}")
+    if "[" in text:
+        text = _INT_KEY.sub(_int_key, text)
+    try:
+        return _dump_json_decoder.decode(text)
+    except json.JSONDecodeError as e:
+        raise LuaDecodeError(str(e)) from e
+
+
+def _decode_tokens(text: str) -> Any:
+    """Tokenize and decode any Lua table literal within the supported grammar"""
+    match_token = _TOKEN.match
+    match_json = _JSON_OBJECT.match
+    length = len(text)
+
+    # Each stack frame is [table, next_positional_index, pending_key]
+    stack = []
+    pos = 0
+
+    while True:
+        match = match_token(text, pos)
+        if match is None:
+            if pos >= length or text[pos:].isspace():
+                raise LuaDecodeError(
+                    "Unexpected end of table while parsing Lua string."
+                )
+            raise LuaDecodeError(f"Unexpected character at position {pos}")
+
+        kind = match.lastgroup
+        value_pos = match.start(kind)
+        pos = match.end()
+
+        if kind == "comma":
+            if not stack:
+                raise LuaDecodeError(f"Unexpected ',' at position {value_pos}")
+            continue
+
+        if kind == "key" or kind == "name":
+            if not stack or stack[-1][2] is not None:
+                raise LuaDecodeError(f"Unexpected key at position {value_pos}")
+            token = match.group(kind)
+            if kind == "name":
+                key = token
+            elif token[0] in "\"'":
+                key = _string(token)
+            else:
+                key = _number(token)
+            stack[-1][2] = key
+            continue
+
+        if kind == "open":
+            if match_json(text, value_pos):
+                try:
+                    value, pos = _json_decoder.raw_decode(text, value_pos)
+                except json.JSONDecodeError as e:
+                    raise LuaDecodeError(str(e)) from e
+            else:
+                stack.append([{}, 0, None])
+                continue
+        elif kind == "close":
+            if not stack:
+                raise LuaDecodeError(f"Unexpected '}}' at position {value_pos}")
+            table, _, pending = stack.pop()
+            if pending is not None:
+                raise LuaDecodeError(f"Missing value for key '{pending}'")
+            value = _finish(table)
+        elif kind == "string":
+            value = _string(match.group(kind))
+        elif kind == "number":
+            value = _number(match.group(kind))
+        else:
+            value = _word(match.group(kind))
+
+        if not stack:
+            return value
+
+        frame = stack[-1]
+        if frame[2] is not None:
+            frame[0][frame[2]] = value
+            frame[2] = None
+        else:
+            frame[0][frame[1]] = value
+        frame[1] += 1
+
+
+def decode(text: str) -> Any:
+    """
+    Decode a single Lua value (usually a `dump()`-ed table) from `text`.
+
+    Trailing content after the first complete value is ignored, matching slpp.
+    :param text: Raw RCON response
+    :return: Decoded Python value, or None for empty input
+    :raises LuaDecodeError: If the text is outside the supported grammar
+    """
+    if not text or not isinstance(text, str):
+        return None
+    try:
+        return _decode_json(text)
+    except LuaDecodeError:
+        return _decode_tokens(text)
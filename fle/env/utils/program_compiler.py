@@ -0,0 +1,186 @@
+"""
+Compiles agent programs to a single code object for `FactorioNamespace`'s compiled execution mode.
+
+The interpreted mode (`FactorioNamespace.execute_node`) walks the program one node at a time, which keeps
+variables persisted and line numbers current after every statement but makes loops in agent code very slow.
+Here the program is transformed once instead, and the bookkeeping is done by hooks the transformed code
+calls into (see `FactorioNamespace._execute_compiled`):
+
+- `CHECKPOINT()` after every top-level statement, to persist variables like the interpreter does
+- `CHECK_PROTECTED(names)` before top-level statements that assign names, as `_check_protected` does
+- `TICK()` at the start of every loop iteration, to stop programs that overrun their timeout
+- `RETURN(value)` in place of top-level `return` statements, which the interpreter allows
+"""
+
+import ast
+import functools
+from dataclasses import dataclass
+from types import CodeType
+from typing import FrozenSet, Tuple
+
+# Tracebacks of agent code are matched on this name (see `FactorioNamespace._extract_error_lines`)
+FILENAME = "file"
+
+CHECKPOINT = "__fle_checkpoint__"
+CHECK_PROTECTED = "__fle_check_protected__"
+TICK = "__fle_tick__"
+RETURN = "__fle_return__"
+
+
+class ProgramReturn(BaseException):
+    """Raised by a top-level `return`. Not an `Exception`, so agent `except` clauses don't catch it."""
+
+    def __init__(self, value):
+        super().__init__(value)
+        self.value = value
+
+
+@dataclass(frozen=True)
+class CompiledProgram:
+    code: CodeType
+    # Names the program may bind at module level, i.e. the ones to persist at each checkpoint
+    names: Tuple[str, ...]
+
+
+def _call(name: str, *args: ast.expr) -> ast.Expr:
+    return ast.Expr(
+        ast.Call(func=ast.Name(id=name, ctx=ast.Load()), args=list(args), keywords=[])
+    )
+
+
+class _ModuleNames(ast.NodeVisitor):
+    """Names bound in module scope: assignments outside functions, imports, definitions and `global`s"""
+
+    def __init__(self):
+        self.names = set()
+        # Names checked by `_check_protected` in the interpreter
+        self.assigned = set()
+        self._scope_depth = 0
+
+    def _visit_scope(self, node):
+        self._scope_depth += 1
+        self.generic_visit(node)
+        self._scope_depth -= 1
+
+    def visit_FunctionDef(self, node):
+        if self._scope_depth == 0:
+            self.names.add(node.name)
+            self.assigned.add(node.name)
+        for decorator in node.decorator_list:
+            self.visit(decorator)
+        self._visit_scope(node)
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def visit_ClassDef(self, node):
+        if self._scope_depth == 0:
+            self.names.add(node.name)
+        self._visit_scope(node)
+
+    def visit_Lambda(self, node):
+        self._visit_scope(node)
+
+    def visit_ListComp(self, node):
+        self._visit_scope(node)
+
+    visit_SetComp = visit_DictComp = visit_GeneratorExp = visit_ListComp
+
+    def visit_Global(self, node):
+        self.names.update(node.names)
+
+    def visit_Name(self, node):
+        if self._scope_depth == 0 and isinstance(node.ctx, ast.Store):
+            self.names.add(node.id)
+
+    def visit_Assign(self, node):
+        if self._scope_depth == 0:
+            self.assigned.update(
+                target.id for target in node.targets if isinstance(target, ast.Name)
+            )
+        self.generic_visit(node)
+
+    def visit_AnnAssign(self, node):
+        if self._scope_depth == 0 and isinstance(node.target, ast.Name):
+            self.assigned.add(node.target.id)
+        self.generic_visit(node)
+
+    visit_AugAssign = visit_AnnAssign
+
+    def visit_ExceptHandler(self, node):
+        if self._scope_depth == 0 and node.name:
+            self.names.add(node.name)
+        self.generic_visit(node)
+
+    def visit_Import(self, node):
+        if self._scope_depth == 0:
+            for alias in node.names:
+                self.names.add(alias.asname or alias.name.split(".")[0])
+
+    visit_ImportFrom = visit_Import
+
+
+class _InsertHooks(ast.NodeTransformer):
+    def __init__(self):
+        self._scope_depth = 0
+
+    def _visit_scope(self, node):
+        self._scope_depth += 1
+        self.generic_visit(node)
+        self._scope_depth -= 1
+        return node
+
+    visit_FunctionDef = visit_AsyncFunctionDef = visit_ClassDef = _visit_scope
+    visit_Lambda = _visit_scope
+
+    def _visit_loop(self, node):
+        self.generic_visit(node)
+        tick = ast.copy_location(_call(TICK), node.body[0])
+        node.body.insert(0, tick)
+        return node
+
+    visit_For = visit_AsyncFor = visit_While = _visit_loop
+
+    def visit_Return(self, node):
+        if self._scope_depth:
+            return self.generic_visit(node)
+        value = node.value or ast.Constant(value=None)
+        return ast.copy_location(_call(RETURN, self.visit(value)), node)
+
+
+def _assigned_names(statement: ast.stmt) -> FrozenSet[str]:
+    visitor = _ModuleNames()
+    visitor.visit(statement)
+    return frozenset(visitor.assigned)
+
+
+@functools.lru_cache(maxsize=256)
+def compile_program(source: str) -> CompiledProgram:
+    """
+    Compile an agent program with the hooks above inserted. Cached by source, as agents often resend the
+    same program or helper definitions.
+    :raises SyntaxError: If the program can't be parsed
+    """
+    tree = ast.parse(source)
+    names = _ModuleNames()
+    names.visit(tree)
+
+    body = []
+    for statement in tree.body:
+        assigned = _assigned_names(statement)
+        if assigned:
+            names_tuple = ast.Tuple(
+                elts=[ast.Constant(value=name) for name in sorted(assigned)],
+                ctx=ast.Load(),
+            )
+            body.append(
+                ast.copy_location(_call(CHECK_PROTECTED, names_tuple), statement)
+            )
+        body.append(_InsertHooks().visit(statement))
+        body.append(ast.copy_location(_call(CHECKPOINT), statement))
+    tree.body = body
+
+    code = compile(ast.fix_missing_locations(tree), FILENAME, "exec")
+    return CompiledProgram(
+        code=code,
+        names=tuple(sorted(name for name in names.names if not name.startswith("_"))),
+    )
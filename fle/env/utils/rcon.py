@@ -1,3 +1,4 @@
+import json
 import os
 import re
 from glob import glob
@@ -14,6 +15,8 @@ import warnings
 warnings.filterwarnings("ignore", category=SyntaxWarning, module="slpp")
 from slpp import slpp as lua
 
+from fle.env.utils.lua_decoder import LuaDecodeError, decode as _decode_dump
+
 import io
 import contextlib
 
@@ -141,6 +144,14 @@ def _check_output_for_errors(command, response, output):
             )
 
 
+def _decode_lua(text):
+    """Decode a `dump()`-ed response, falling back to slpp for anything the fast decoder rejects"""
+    try:
+        return _decode_dump(text)
+    except LuaDecodeError:
+        return lua.decode(text)
+
+
 def _lua2python(command, response, *parameters, trace=False, start=0):
     stdout = io.StringIO()
 
@@ -151,13 +162,13 @@ def _lua2python(command, response, *parameters, trace=False, start=0):
         try:
             # Handle the case where response is a complete table
             if response.strip().startswith("{") and response.strip().endswith("}"):
-                output = lua.decode(response)
+                output = _decode_lua(response)
             else:
                 # Handle the case where we need to extract the last line
                 splitted = response.split("\n")[-1]
                 if "[string" in splitted:
                     splitted = re.sub(r"\[string[^\]]*\]", "", splitted)
-                output = lua.decode(splitted)
+                output = _decode_lua(splitted)
 
             if isinstance(output, dict) and "b" in output:
                 output["b"] = _remove_numerical_keys(output["b"])
@@ -170,6 +181,27 @@ def _lua2python(command, response, *parameters, trace=False, start=0):
             return None, (timer() - start)
 
 
+def _json2python(command, response, *parameters, trace=False, start=0):
+    """Decode a `dump_json()`-ed response, which is the last line if the game printed anything before it"""
+    if not response:
+        return None, (timer() - start)
+
+    try:
+        try:
+            output = json.loads(response)
+        except ValueError:
+            output = json.loads(response.strip().split("\n")[-1])
+    except ValueError as e:
+        if trace:
+            print(f"Parsing error: {str(e)}")
+        return None, (timer() - start)
+
+    if isinstance(output, dict) and "b" in output:
+        output["b"] = _remove_numerical_keys(output["b"])
+
+    return output, (timer() - start)
+
+
 @deprecated("Doesn't handle nested structures that well")
 def _lua2python_old(command, response, *parameters, trace=False, start=0):
     # Capture stdout using StringIO
@@ -0,0 +1,186 @@
+"""
+Pipelined RCON transport.
+
+`factorio_rcon.RCONClient` only allows one call in flight: `send_command` writes a packet, blocks until
+the reply arrives and raises `ClientBusy` if another thread tries to use the socket meanwhile. The
+Factorio server itself answers every packet with the id it was sent with, so
+`PipelinedRCONClient` keeps any number of requests in flight on the same connection instead - a
+reader thread matches replies to pending futures by packet id.
+
+It is a drop-in replacement for `RCONClient` (same constructor, `connect`/`close`, `send_command`,
+`send_commands` and the `rcon_socket`/`rcon_failure` state used for health checks), and adds
+`submit` (returns a `concurrent.futures.Future`) plus asyncio variants of the send methods.
+"""
+
+import asyncio
+import socket
+import struct
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Dict, Optional
+
+from factorio_rcon import (
+    RCONClient,
+    RCONBaseError,
+    RCONClosed,
+    RCONNotConnected,
+    RCONReceiveError,
+    RCONSendError,
+)
+
+# RCON packet types
+SERVERDATA_EXECCOMMAND = 2
+
+_HEADER = struct.Struct("<iii")
+
+
+class PipelinedRCONClient(RCONClient):
+    """RCON client that multiplexes concurrent commands over one connection using packet ids"""
+
+    def __init__(self, ip_address, port, password, timeout=None, connect_on_init=True):
+        self._pending: Dict[int, Future] = {}
+        self._pending_lock = threading.Lock()
+        self._send_lock = threading.Lock()
+        self._reader: Optional[threading.Thread] = None
+        super().__init__(
+            ip_address, port, password, timeout=timeout, connect_on_init=connect_on_init
+        )
+
+    def connect(self):
+        """Connect and authenticate, then start the reader thread that dispatches replies"""
+        self.close()
+        super().connect()
+        # Replies are awaited on their futures, so the reader can block indefinitely
+        self.rcon_socket.settimeout(None)
+        self._reader = threading.Thread(
+            target=self._read_loop,
+            args=(self.rcon_socket,),
+            name=f"rcon-reader-{self.port}",
+            daemon=True,
+        )
+        self._reader.start()
+
+    def close(self):
+        """Close the connection, failing any requests that are still in flight"""
+        rcon_socket = self.rcon_socket
+        if rcon_socket is not None:
+            try:
+                # Unblocks the reader thread's recv()
+                rcon_socket.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        super().close()
+
+        reader, self._reader = self._reader, None
+        if reader is not None and reader is not threading.current_thread():
+            reader.join(timeout=1)
+        self._fail_pending(RCONClosed("The RCON connection was closed"))
+
+    def submit(self, command: str) -> Future:
+        """
+        Send a command without waiting for its reply.
+        :param command: Command to execute, e.g. `/sc rcon.print(game.tick)`
+        :return: Future resolving to the response body (None if empty)
+        """
+        if self.rcon_socket is None or self._reader is None:
+            raise RCONNotConnected("The RCON client is not connected to the server")
+        if self.rcon_failure:
+            raise RCONNotConnected(
+                "The RCON connection failed, reconnect with connect()"
+            )
+
+        future = Future()
+        with self._send_lock:
+            packet_id = self.get_id()
+            with self._pending_lock:
+                self._pending[packet_id] = future
+            try:
+                self.rcon_socket.sendall(
+                    _build_packet(packet_id, SERVERDATA_EXECCOMMAND, command)
+                )
+            except Exception as exc:
+                with self._pending_lock:
+                    self._pending.pop(packet_id, None)
+                self.rcon_failure = True
+                self.close()
+                raise RCONSendError("Failed to send data to the RCON server") from exc
+        return future
+
+    def send_command(self, command: str) -> Optional[str]:
+        """Send a command and block until its reply arrives. Safe to call from several threads."""
+        return self._wait(self.submit(command))
+
+    def send_commands(self, commands: Dict[str, str]) -> Dict[str, Optional[str]]:
+        """Send all commands back to back, then collect the replies keyed like `commands`"""
+        futures = {key: self.submit(command) for key, command in commands.items()}
+        return {key: self._wait(future) for key, future in futures.items()}
+
+    async def send_command_async(self, command: str) -> Optional[str]:
+        """Asyncio variant of `send_command`; wrap in `asyncio.wait_for` to apply a timeout"""
+        return await asyncio.wrap_future(self.submit(command))
+
+    async def send_commands_async(
+        self, commands: Dict[str, str]
+    ) -> Dict[str, Optional[str]]:
+        """Asyncio variant of `send_commands`"""
+        futures = {
+            key: asyncio.wrap_future(self.submit(command))
+            for key, command in commands.items()
+        }
+        results = await asyncio.gather(*futures.values())
+        return dict(zip(futures.keys(), results))
+
+    def _wait(self, future: Future) -> Optional[str]:
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError as exc:
+            # Same contract as RCONClient: after a timeout the connection must be re-established
+            self.rcon_failure = True
+            self.close()
+            raise RCONReceiveError(
+                "The connection timed out while communicating with the server"
+            ) from exc
+
+    def _read_loop(self, rcon_socket: socket.socket):
+        buffer = bytearray()
+        try:
+            while True:
+                data = rcon_socket.recv(65536)
+                if not data:
+                    raise RCONClosed("The RCON server closed the connection")
+                buffer += data
+                while len(buffer) >= 4:
+                    end = 4 + int.from_bytes(buffer[:4], "little", signed=True)
+                    if len(buffer) < end:
+                        break
+                    _, packet_id, _ = _HEADER.unpack_from(buffer)
+                    body = buffer[12 : end - 2].decode("utf-8", errors="replace")
+                    del buffer[:end]
+                    self._resolve(packet_id, body)
+        except Exception as exc:
+            if rcon_socket is self.rcon_socket:
+                self.rcon_failure = True
+            if not isinstance(exc, RCONBaseError):
+                exc = RCONReceiveError(
+                    f"Failed to receive data from the RCON server: {exc}"
+                )
+            self._fail_pending(exc)
+
+    def _resolve(self, packet_id: int, body: str):
+        with self._pending_lock:
+            future = self._pending.pop(packet_id, None)
+        # Replies for requests that were already abandoned (e.g. failed sends) are dropped
+        if future is not None:
+            future.set_result(body.rstrip() if body else None)
+
+    def _fail_pending(self, exc: Exception):
+        with self._pending_lock:
+            pending, self._pending = self._pending, {}
+        for future in pending.values():
+            if not future.done():
+                future.set_exception(exc)
+
+
+def _build_packet(packet_id: int, packet_type: int, body: str) -> bytes:
+    payload = body.encode("utf-8") + b"\x00\x00"
+    return _HEADER.pack(8 + len(payload), packet_id, packet_type) + payload
@@ -12,7 +12,7 @@ from dotenv import load_dotenv
 from rich.console import Console
 
 from fle.agents.formatters import ConversationFormatter, DefaultFormatter
-from fle.commons.db_client import DBClient
+from fle.commons.db_client import PROGRAM_INSERT_COLUMNS, DBClient
 from fle.commons.models.conversation import Conversation
 from fle.commons.models.game_state import GameState
 from fle.commons.models.generation_parameters import GenerationParameters
@@ -505,46 +505,20 @@ class ParallelBeamSearch:
         Returns:
             int: The ID of the created program
         """
-        query = """
-            INSERT INTO programs (
-                code, value, visits, parent_id, state_json, conversation_json,
-                completion_token_usage, prompt_token_usage, token_usage, response,
-                holdout_value, raw_reward, version, version_description, model, meta,
-                achievements_json, instance, depth, advantage, ticks
-            )
-            VALUES (
-                %s, %s, %s, %s, %s, %s, %s, %s, %s, %s,
-                %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s
-            )
+        query = f"""
+            INSERT INTO programs ({", ".join(PROGRAM_INSERT_COLUMNS)})
+            VALUES ({", ".join(["%s"] * len(PROGRAM_INSERT_COLUMNS))})
             RETURNING id, created_at;
         """
 
         try:
-            # Prepare values with proper null handling
+            program.version = self.version
+            program.version_description = self.version_description
+            # Same columns as the client's own inserts, including conversation_length
             cur.execute(
                 query,
-                (
-                    program.code,
-                    program.value,
-                    0,  # visits starts at 0
-                    program.parent_id,
-                    program.state.to_raw() if program.state else None,
-                    json.dumps(program.conversation.dict()),
-                    getattr(program, "completion_token_usage", None),
-                    getattr(program, "prompt_token_usage", None),
-                    getattr(program, "token_usage", None),
-                    getattr(program, "response", None),
-                    getattr(program, "holdout_value", None),
-                    getattr(program, "raw_reward", None),
-                    self.version,
-                    self.version_description,
-                    getattr(program, "model", None),
-                    json.dumps(getattr(program, "meta", {})),
-                    json.dumps(getattr(program, "achievements", [])),
-                    getattr(program, "instance", None),
-                    program.depth / 2,  # Maintain the depth division from original
-                    getattr(program, "advantage", None),
-                    getattr(program, "ticks", None),
+                self.db_client._program_row(
+                    program, json.dumps(program.conversation.dict())
                 ),
             )
 
@@ -74,15 +74,17 @@ class Evaluator:
         self, programs: List[Program], start_state: GameState
     ) -> List[Program]:
         try:
-            # Evaluate programs in parallel
+            # Evaluate programs in parallel. Each instance does its blocking work on its own worker
+            # thread (see `FactorioInstance.run_async`), so resets and evaluations overlap across instances.
             eval_futures = []
             for i, (prog, inst) in enumerate(zip(programs, self.instances)):
-                inst.reset(start_state)
                 if self.logger:
                     self.logger.update_instance(
                         inst.tcp_port, program_id=prog.id, status="resetting"
                     )
-                eval_futures.append(self._evaluate_single(inst.tcp_port, prog, inst))
+                eval_futures.append(
+                    self._reset_and_evaluate(inst.tcp_port, prog, inst, start_state)
+                )
 
             # Wait for all evaluations and holdout
             eval_results = await asyncio.gather(*eval_futures)
@@ -148,6 +150,16 @@ class Evaluator:
                     )
             raise e
 
+    async def _reset_and_evaluate(
+        self,
+        instance_id: int,
+        program: Program,
+        instance: FactorioInstance,
+        start_state: GameState,
+    ):
+        await instance.reset_async(start_state)
+        return await self._evaluate_single(instance_id, program, instance)
+
     def _evaluate_for_achievements(
         self, code: str, instance: FactorioInstance
     ) -> Tuple[
@@ -187,26 +199,36 @@ class Evaluator:
         try:
             # Get initial state information
             self.logger.update_instance(tcp_port, status="starting value")
-            start_entities = instance.namespace.get_entities()
-            start_inventory = instance.namespace.inspect_inventory()
-            start_production_flows = instance.namespace._get_production_stats()
-            initial_value, _ = instance.namespace.score()
+            (
+                start_entities,
+                start_inventory,
+                start_production_flows,
+                (initial_value, _),
+            ) = await instance.gather_async(
+                instance.namespace.get_entities,
+                instance.namespace.inspect_inventory,
+                instance.namespace._get_production_stats,
+                instance.namespace.score,
+            )
 
             # Executing code
             self.logger.update_instance(tcp_port, status="executing")
-            reward, time, result = instance.eval(program.code, timeout=60)
+            reward, time, result = await instance.run_async(
+                instance.eval, program.code, timeout=60
+            )
 
             # Capturing immediate resulting state
             self.logger.update_instance(tcp_port, status="capturing state")
-            state = GameState.from_instance(instance)
+            state = await instance.run_async(GameState.from_instance, instance)
 
             self.logger.update_instance(
                 tcp_port, status=f"accruing value ({self.value_accrual_time}s)"
             )
             await asyncio.sleep(self.value_accrual_time)
 
-            entities = instance.namespace.get_entities()
-            final_inventory = instance.namespace.inspect_inventory()
+            entities, final_inventory = await instance.gather_async(
+                instance.namespace.get_entities, instance.namespace.inspect_inventory
+            )
 
             # Check to see if the inventories are different
             # If so, we manually put a hint in the generated code and result from the game
@@ -246,11 +268,12 @@ class Evaluator:
                 result += f"('Current inventory: {final_inventory}',)\n"
                 result += f"('Entities on the map after the current step: {entities}',)"
 
-            score, _ = instance.namespace.score()
+            (score, _), ticks, post_production_flows = await instance.gather_async(
+                instance.namespace.score,
+                instance.get_elapsed_ticks,
+                instance.namespace._get_production_stats,
+            )
             final_reward = score - initial_value
-            ticks = instance.get_elapsed_ticks()
-
-            post_production_flows = instance.namespace._get_production_stats()
             achievements = get_achievements(
                 start_production_flows, post_production_flows
             )
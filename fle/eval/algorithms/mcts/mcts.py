@@ -406,18 +406,19 @@ class MCTS:
                 programs, start_state
             )
 
-            # Use a connection pool or new connections for parallel saves
-            save_tasks = []
-            for program in evaluated_programs:
-                if program.state is not None:
-                    if not skip_failures or program.value is not None:
-                        save_tasks.append(self.db.create_program(program))
+            # Save all children in one transaction
+            to_save = [
+                program
+                for program in evaluated_programs
+                if program.state is not None
+                and (not skip_failures or program.value is not None)
+            ]
 
-            if save_tasks:
-                await asyncio.gather(*save_tasks)
+            if to_save:
+                await self.db.create_programs(to_save)
 
                 # Visit parent
-                await self.sampler.visit(parent.id, len(save_tasks))
+                await self.sampler.visit(parent.id, len(to_save))
 
         except Exception as e:
             self.retry_count += 1
@@ -1,4 +1,3 @@
-import asyncio
 import json
 from typing import List
 
@@ -366,15 +365,16 @@ class ObjectiveMCTS(MCTS):
                 programs, start_state
             )
 
-            # Use a connection pool or new connections for parallel saves
-            save_tasks = []
-            for program in evaluated_programs:
-                if program.state is not None:
-                    if not skip_failures or program.value is not None:
-                        save_tasks.append(self.db.create_program(program))
+            # Save all children in one transaction
+            to_save = [
+                program
+                for program in evaluated_programs
+                if program.state is not None
+                and (not skip_failures or program.value is not None)
+            ]
 
-            if save_tasks:
-                await asyncio.gather(*save_tasks)
+            if to_save:
+                await self.db.create_programs(to_save)
 
         except Exception as e:
             self.retry_count += 1
@@ -72,7 +72,7 @@ class BeamSampler(DBSampler):
                                 FROM programs 
                                 WHERE version = %s
                                 AND value IS NOT NULL
-                                AND jsonb_array_length(conversation_json->'messages') < %s
+                                AND conversation_length < %s
                                 ORDER BY value DESC
                                 LIMIT %s
                             ),
@@ -81,7 +81,7 @@ class BeamSampler(DBSampler):
                                 FROM programs
                                 WHERE version = %s
                                 AND value IS NOT NULL
-                                AND jsonb_array_length(conversation_json->'messages') < %s
+                                AND conversation_length < %s
                                 AND id NOT IN (SELECT id FROM beam)
                                 ORDER BY created_at DESC
                                 LIMIT 100
@@ -107,7 +107,7 @@ class BeamSampler(DBSampler):
                                 FROM programs 
                                 WHERE version = %s
                                 AND value IS NOT NULL
-                                AND jsonb_array_length(conversation_json->'messages') < %s
+                                AND conversation_length < %s
                                 ORDER BY value DESC
                                 LIMIT %s
                             )
@@ -131,7 +131,9 @@ class BeamSampler(DBSampler):
                     )
 
                     row = cur.fetchone()
-                    return Program.from_row(dict(row)) if row else None
+                    row = dict(row) if row else None
+            # Built once the connection is released, as loading its messages takes another one
+            return Program.from_row(row) if row else None
 
         except Exception as e:
             print(f"Error sampling parent: {e}")
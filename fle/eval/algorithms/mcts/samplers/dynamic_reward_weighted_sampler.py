@@ -89,7 +89,7 @@ class DynamicRewardWeightedSampler(DBSampler):
                     cur.execute(
                         """
                                 WITH recent AS (
-                                    SELECT id, advantage, conversation_json
+                                    SELECT id, advantage
                                     FROM programs
                                     WHERE version = %s 
                                     AND advantage IS NOT NULL
@@ -160,10 +160,9 @@ class DynamicRewardWeightedSampler(DBSampler):
                     )
 
                     row = cur.fetchone()
-                    if row:
-                        program = Program.from_row(dict(row))
-                        return program
-                    return None
+                    row = dict(row) if row else None
+            # Built once the connection is released, as loading its messages takes another one
+            return Program.from_row(row) if row else None
 
         except Exception as e:
             print(f"Error sampling parent: {e}")
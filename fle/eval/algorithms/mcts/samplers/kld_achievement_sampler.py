@@ -1,6 +1,6 @@
 import math
 from collections import Counter
-from typing import Dict, Optional, Tuple, List
+from typing import Dict, Optional, List
 
 import numpy as np
 import psycopg2
@@ -14,6 +14,66 @@ from fle.commons.models.program import Program
 from .db_sampler import DBSampler
 
 
+class AchievementMatrix:
+    """
+    Achievement frequencies of a version's programs, parsed once and kept as the rows of a dense matrix over the
+    vocabulary of achievements seen so far.
+    """
+
+    def __init__(self):
+        self.vocabulary: Dict[str, int] = {}
+        self.rows: Dict[int, int] = {}
+        self._matrix = np.zeros((16, 16))
+
+    def __contains__(self, program_id: int) -> bool:
+        return program_id in self.rows
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def add(self, program_id: int, frequencies: Counter) -> None:
+        for key in frequencies:
+            if key not in self.vocabulary:
+                self.vocabulary[key] = len(self.vocabulary)
+        self._reserve(len(self.rows) + 1, len(self.vocabulary))
+
+        row = len(self.rows)
+        self.rows[program_id] = row
+        for key, freq in frequencies.items():
+            self._matrix[row, self.vocabulary[key]] = freq
+
+    def select(self, program_ids: List[int]) -> np.ndarray:
+        """Frequencies of the programs, restricted to the achievements any of them has"""
+        frequencies = self._matrix[
+            [self.rows[program_id] for program_id in program_ids],
+            : len(self.vocabulary),
+        ]
+        return frequencies[:, frequencies.any(axis=0)]
+
+    def retain(self, program_ids: List[int]) -> None:
+        """Drop every program but these"""
+        kept = self._matrix[[self.rows[program_id] for program_id in program_ids]]
+        self._matrix = np.zeros_like(self._matrix)
+        self._matrix[: len(kept)] = kept
+        self.rows = {program_id: row for row, program_id in enumerate(program_ids)}
+
+    def _reserve(self, rows: int, columns: int) -> None:
+        """Grow the matrix geometrically so that adding programs is amortised O(1)"""
+        capacity_rows, capacity_columns = self._matrix.shape
+        if rows <= capacity_rows and columns <= capacity_columns:
+            return
+        grown = np.zeros(
+            (
+                max(rows, capacity_rows * (2 if rows > capacity_rows else 1)),
+                max(
+                    columns, capacity_columns * (2 if columns > capacity_columns else 1)
+                ),
+            )
+        )
+        grown[:capacity_rows, :capacity_columns] = self._matrix
+        self._matrix = grown
+
+
 class KLDiversityAchievementSampler(DBSampler):
     """
     A sampler that promotes diversity in achievements by computing KL divergence
@@ -34,6 +94,8 @@ class KLDiversityAchievementSampler(DBSampler):
         super().__init__(db_client)
         self.window_size = window_size
         self.temperature = temperature
+        # Parsed achievements of recent programs, per version
+        self._matrices: Dict[int, AchievementMatrix] = {}
 
     def _normalize_scores(self, scores: np.ndarray) -> np.ndarray:
         """
@@ -128,6 +190,33 @@ class KLDiversityAchievementSampler(DBSampler):
 
         return kld
 
+    def _compute_diversity_scores(
+        self, frequencies: np.ndarray, epsilon: float = 1e-10
+    ) -> np.ndarray:
+        """
+        Sum of the KL divergences of each program's achievement distribution from every other program's, as
+        `_compute_kl_divergence` but smoothed over the achievements of the whole window.
+
+        KL(p_i || p_j) = sum_k p_ik log p_ik - sum_k p_ik log p_jk, so summing over j != i only needs the
+        column sums of log p rather than every pair: O(n * vocabulary) instead of O(n^2 * vocabulary).
+
+        Args:
+            frequencies: Matrix of achievement frequencies, one row per program
+
+        Returns:
+            Array of diversity scores, one per program
+        """
+        n, vocabulary_size = frequencies.shape
+        if vocabulary_size == 0:
+            return np.zeros(n)
+
+        probs = (frequencies + epsilon) / (
+            frequencies.sum(axis=1, keepdims=True) + epsilon * vocabulary_size
+        )
+        log_probs = np.log(probs)
+        others_log_probs = log_probs.sum(axis=0) - log_probs
+        return (probs * ((n - 1) * log_probs - others_log_probs)).sum(axis=1)
+
     @tenacity.retry(
         retry=retry_if_exception_type(
             (psycopg2.OperationalError, psycopg2.InterfaceError)
@@ -151,7 +240,7 @@ class KLDiversityAchievementSampler(DBSampler):
                     # Fetch recent programs with achievements
                     cur.execute(
                         """
-                            SELECT id, achievements_json
+                            SELECT id
                             FROM programs
                             WHERE version = %s 
                             AND achievements_json IS NOT NULL
@@ -161,38 +250,39 @@ class KLDiversityAchievementSampler(DBSampler):
                         (version, self.window_size),
                     )
 
-                    results = cur.fetchall()
-                    if not results:
+                    program_ids = [row["id"] for row in cur.fetchall()]
+                    if not program_ids:
                         return None
 
-                    # Compute frequency distributions for each program
-                    programs: List[Tuple[int, Counter]] = [
-                        (
-                            row["id"],
-                            self._compute_achievement_frequencies(
-                                row["achievements_json"]
-                            ),
+                    # Parse the achievements of programs new to the window only
+                    matrix = self._matrices.setdefault(version, AchievementMatrix())
+                    new_ids = [pid for pid in program_ids if pid not in matrix]
+                    if new_ids:
+                        cur.execute(
+                            "SELECT id, achievements_json FROM programs WHERE id = ANY(%s)",
+                            (new_ids,),
                         )
-                        for row in results
-                    ]
+                        for row in cur.fetchall():
+                            matrix.add(
+                                row["id"],
+                                self._compute_achievement_frequencies(
+                                    row["achievements_json"]
+                                ),
+                            )
+                    program_ids = [pid for pid in program_ids if pid in matrix]
+                    if len(matrix) > 2 * self.window_size:
+                        matrix.retain(program_ids)
 
-                    if len(programs) < 2:
+                    if len(program_ids) < 2:
                         # If only one program, return it
-                        program_id = programs[0][0]
+                        program_id = program_ids[0]
                     else:
-                        # Compute pairwise KL divergences
-                        diversity_scores = []
-                        for i, (prog_id, freq1) in enumerate(programs):
-                            # Sum of KL divergences against all other programs
-                            total_kld = sum(
-                                self._compute_kl_divergence(freq1, freq2)
-                                for j, (_, freq2) in enumerate(programs)
-                                if i != j
-                            )
-                            diversity_scores.append((prog_id, total_kld))
+                        # Sum of KL divergences of each program against all other programs
+                        scores = self._compute_diversity_scores(
+                            matrix.select(program_ids)
+                        )
 
                         # Apply softmax to diversity scores
-                        scores = np.array([score for _, score in diversity_scores])
                         normalized_scores = self._normalize_scores(scores)
 
                         normalized_scores = (
@@ -204,14 +294,15 @@ class KLDiversityAchievementSampler(DBSampler):
                         softmax_probs = softmax_probs / softmax_probs.sum()
 
                         # Sample program ID based on softmax probabilities
-                        program_ids = [prog_id for prog_id, _ in diversity_scores]
                         program_id = np.random.choice(program_ids, p=softmax_probs)
 
                     # Fetch the selected program
                     cur.execute(f"SELECT * FROM programs WHERE id = {int(program_id)}")
 
                     row = cur.fetchone()
-                    return Program.from_row(dict(row)) if row else None
+                    row = dict(row) if row else None
+            # Built once the connection is released, as loading its messages takes another one
+            return Program.from_row(row) if row else None
 
         except Exception as e:
             print(f"Error sampling parent: {e}")
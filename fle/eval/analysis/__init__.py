@@ -11,6 +11,7 @@ Main Components:
 - WandBLogger: Real-time experiment tracking and visualization
 - SweepManager: Orchestrate large-scale evaluation sweeps
 - ResultsVisualizer: Generate plots and analysis reports
+- ResultsCache: Incremental Parquet export of program metadata for fast analysis
 
 Example usage:
     from fle.eval.analysis import DatabaseAnalyzer, PerformanceMetrics, WandBLogger
@@ -32,6 +33,7 @@ from .database_analyzer import DatabaseAnalyzer
 from .performance_metrics import PerformanceMetrics
 from .wandb_logger import WandBLogger
 from .results_visualizer import ResultsVisualizer
+from .results_cache import ResultsCache
 
 # Utility functions
 from .analysis_utils import (
@@ -47,6 +49,7 @@ __all__ = [
     "PerformanceMetrics",
     "WandBLogger",
     "ResultsVisualizer",
+    "ResultsCache",
     # Utility functions
     "group_results_by_model",
     "group_results_by_task",
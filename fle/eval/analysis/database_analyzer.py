@@ -7,14 +7,26 @@ import pandas as pd
 from datetime import datetime, timedelta
 
 from fle.commons.db_client import create_db_client, DBClient
+from fle.eval.analysis.results_cache import ResultsCache
 
 
 class DatabaseAnalyzer:
     """Handles querying and aggregating evaluation results from the database"""
 
-    def __init__(self, db_client: Optional[DBClient] = None):
-        """Initialize with optional database client"""
+    def __init__(
+        self,
+        db_client: Optional[DBClient] = None,
+        results_cache: Optional[ResultsCache] = None,
+    ):
+        """Initialize with optional database client
+
+        Args:
+            db_client: Database client (created on first use if not given)
+            results_cache: Columnar cache to compute trajectory summaries from, after exporting
+                the programs added since the last call
+        """
         self.db_client = db_client
+        self.results_cache = results_cache
         self._connection_created = False
 
     async def ensure_connection(self):
@@ -111,6 +123,10 @@ class DatabaseAnalyzer:
         """
         await self.ensure_connection()
 
+        if self.results_cache is not None:
+            await self.results_cache.export(self.db_client, versions)
+            return self.results_cache.trajectory_summaries(versions=versions)
+
         version_list = ", ".join(str(v) for v in versions)
         query = f"""
         WITH trajectory_stats AS (
@@ -160,6 +176,10 @@ class DatabaseAnalyzer:
         """
         await self.ensure_connection()
 
+        if self.results_cache is not None:
+            await self.results_cache.export(self.db_client)
+            return self.results_cache.trajectory_summaries(sweep_id=sweep_id)
+
         query = """
         WITH trajectory_stats AS (
             SELECT 
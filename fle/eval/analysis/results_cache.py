@@ -0,0 +1,321 @@
+"""
+Columnar cache of program metadata for analysis.
+
+Dashboards over a sweep would otherwise read every program row of its versions from the database on each
+refresh, including the long `response` and `achievements_json` texts. `ResultsCache.export` copies the
+metadata of new programs into Parquet files partitioned by version (`version=<n>/part-<first id>-<last id>
+.parquet`), parsing achievements and `meta` once. It only queries the rows after the last exported id of
+each version, so refreshing is cheap. Reads filter on the partitions and load only the requested columns.
+
+Requires pyarrow.
+"""
+
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+from fle.commons.db_client import DBClient
+
+# Words in a response that mark the program's execution as failed
+RESPONSE_ERROR_TERMS = ("error", "exception", "failed")
+
+# Rows fetched from the database per query while exporting
+EXPORT_BATCH_SIZE = 10000
+
+# Part files a version can have before they are merged into one
+MAX_PARTS_PER_VERSION = 16
+
+EXPORTED_COLUMNS = (
+    "id",
+    "parent_id",
+    "version",
+    "version_description",
+    "model",
+    "instance",
+    "depth",
+    "value",
+    "raw_reward",
+    "ticks",
+    "token_usage",
+    "completion_token_usage",
+    "prompt_token_usage",
+    "created_at",
+    "meta",
+    "achievements_json",
+    "response",
+)
+
+
+def is_successful_response(response: Optional[str]) -> bool:
+    """Whether a program's response shows it ran without errors"""
+    return bool(response) and not any(
+        term in response.lower() for term in RESPONSE_ERROR_TERMS
+    )
+
+
+def _parse_json(value: Any) -> Dict:
+    if isinstance(value, dict):
+        return value
+    if not value:
+        return {}
+    try:
+        parsed = json.loads(value)
+    except (TypeError, ValueError):
+        return {}
+    return parsed if isinstance(parsed, dict) else {}
+
+
+def _as_datetime(value: Any) -> Optional[datetime]:
+    if value is None or isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(str(value))
+
+
+def _achievement_map(achievements: Any) -> List[tuple]:
+    if not isinstance(achievements, dict):
+        return []
+    return [(str(name), float(count or 0)) for name, count in achievements.items()]
+
+
+def _cache_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Cached columns of a program row"""
+    meta = _parse_json(row.get("meta"))
+    achievements = _parse_json(row.get("achievements_json"))
+    production_score = meta.get("production_score")
+    return {
+        "id": row["id"],
+        "parent_id": row.get("parent_id"),
+        "version_description": row.get("version_description"),
+        "model": row.get("model"),
+        "instance": row.get("instance"),
+        "depth": row.get("depth"),
+        "value": row.get("value"),
+        "raw_reward": row.get("raw_reward"),
+        "ticks": row.get("ticks"),
+        "token_usage": row.get("token_usage"),
+        "completion_token_usage": row.get("completion_token_usage"),
+        "prompt_token_usage": row.get("prompt_token_usage"),
+        "created_at": _as_datetime(row.get("created_at")),
+        "sweep_id": meta.get("sweep_id"),
+        "production_score": (
+            float(production_score) if production_score is not None else None
+        ),
+        "meta": json.dumps(meta),
+        "static_achievements": _achievement_map(achievements.get("static")),
+        "dynamic_achievements": _achievement_map(achievements.get("dynamic")),
+        "response_ok": is_successful_response(row.get("response")),
+    }
+
+
+class ResultsCache:
+    """Program metadata exported from the database to Parquet files, partitioned by version"""
+
+    def __init__(self, cache_dir: Optional[str] = None):
+        """
+        Args:
+            cache_dir: Directory of the cache (defaults to FLE_RESULTS_CACHE_DIR, or .fle/results_cache)
+        """
+        if not PYARROW_AVAILABLE:
+            raise ImportError(
+                "pyarrow is required for the results cache. Install it with: pip install pyarrow"
+            )
+        self.cache_dir = Path(
+            cache_dir
+            or os.getenv("FLE_RESULTS_CACHE_DIR", os.path.join(".fle", "results_cache"))
+        )
+        self.programs_dir = self.cache_dir / "programs"
+        self.schema = pa.schema(
+            [
+                ("id", pa.int64()),
+                ("parent_id", pa.int64()),
+                ("version_description", pa.string()),
+                ("model", pa.string()),
+                ("instance", pa.int64()),
+                ("depth", pa.float64()),
+                ("value", pa.float64()),
+                ("raw_reward", pa.float64()),
+                ("ticks", pa.int64()),
+                ("token_usage", pa.int64()),
+                ("completion_token_usage", pa.int64()),
+                ("prompt_token_usage", pa.int64()),
+                ("created_at", pa.timestamp("us")),
+                ("sweep_id", pa.string()),
+                ("production_score", pa.float64()),
+                ("meta", pa.string()),
+                ("static_achievements", pa.map_(pa.string(), pa.float64())),
+                ("dynamic_achievements", pa.map_(pa.string(), pa.float64())),
+                ("response_ok", pa.bool_()),
+            ]
+        )
+        self.partitioning = ds.partitioning(
+            pa.schema([("version", pa.int64())]), flavor="hive"
+        )
+
+    def _version_dir(self, version: int) -> Path:
+        return self.programs_dir / f"version={version}"
+
+    def _parts(self, version: int) -> List[Path]:
+        return sorted(self._version_dir(version).glob("part-*.parquet"))
+
+    def last_exported_id(self, version: int) -> int:
+        """Id of the last program of the version in the cache (0 if none)"""
+        parts = self._parts(version)
+        return max((int(part.stem.split("-")[2]) for part in parts), default=0)
+
+    async def export(self, db_client: DBClient, versions: Optional[List[int]] = None):
+        """
+        Append the programs created since the last export to the cache.
+
+        Args:
+            db_client: Database to export from
+            versions: Versions to export (defaults to every version in the database)
+
+        Returns:
+            Number of programs exported
+        """
+        query = "SELECT version, MAX(id) AS max_id FROM programs"
+        if versions:
+            query += f" WHERE version IN ({', '.join(str(int(v)) for v in versions)})"
+        latest_ids = await db_client.execute_query(query + " GROUP BY version")
+
+        exported = 0
+        for row in latest_ids:
+            version, max_id = int(row["version"]), row["max_id"]
+            last_id = self.last_exported_id(version)
+            while max_id is not None and last_id < max_id:
+                rows = await db_client.execute_query(
+                    f"SELECT {', '.join(EXPORTED_COLUMNS)} FROM programs "
+                    f"WHERE version = {version} AND id > {last_id} "
+                    f"ORDER BY id LIMIT {EXPORT_BATCH_SIZE}"
+                )
+                if not rows:
+                    break
+                self._write_part(version, [_cache_row(r) for r in rows])
+                last_id = rows[-1]["id"]
+                exported += len(rows)
+            if len(self._parts(version)) > MAX_PARTS_PER_VERSION:
+                self._compact(version)
+        return exported
+
+    def _write_part(self, version: int, rows: List[Dict[str, Any]]):
+        table = pa.Table.from_pylist(rows, schema=self.schema)
+        self._write_table(version, table, rows[0]["id"], rows[-1]["id"])
+
+    def _write_table(self, version: int, table, first_id: int, last_id: int) -> Path:
+        version_dir = self._version_dir(version)
+        version_dir.mkdir(parents=True, exist_ok=True)
+        path = version_dir / f"part-{first_id:012d}-{last_id:012d}.parquet"
+        # Written under a name the readers skip, then renamed, so readers never see a partial file
+        tmp_path = version_dir / f".{path.name}.{os.getpid()}.tmp"
+        pq.write_table(table, tmp_path)
+        tmp_path.replace(path)
+        return path
+
+    def _compact(self, version: int):
+        """Merge the part files of a version into one"""
+        parts = self._parts(version)
+        table = pa.concat_tables(
+            pq.read_table(part, schema=self.schema) for part in parts
+        )
+        ids = table.column("id")
+        merged = self._write_table(
+            version, table, pa.compute.min(ids).as_py(), pa.compute.max(ids).as_py()
+        )
+        for part in parts:
+            if part != merged:
+                part.unlink()
+
+    def read(
+        self,
+        versions: Optional[List[int]] = None,
+        sweep_id: Optional[str] = None,
+        columns: Optional[List[str]] = None,
+    ) -> pd.DataFrame:
+        """
+        Cached programs, reading only the partitions of `versions` and the requested columns.
+
+        Args:
+            versions: Versions to read (defaults to all)
+            sweep_id: Only read programs of this sweep
+            columns: Columns to load (defaults to all, including `version`)
+
+        Returns:
+            DataFrame with a row per program
+        """
+        if not self.programs_dir.exists():
+            return pd.DataFrame(columns=columns or ["version", *self.schema.names])
+
+        dataset = ds.dataset(
+            self.programs_dir,
+            format="parquet",
+            partitioning=self.partitioning,
+            schema=self.schema.append(pa.field("version", pa.int64())),
+        )
+        filters = []
+        if versions:
+            filters.append(ds.field("version").isin([int(v) for v in versions]))
+        if sweep_id:
+            filters.append(ds.field("sweep_id") == sweep_id)
+        expression = None
+        for condition in filters:
+            expression = condition if expression is None else expression & condition
+        return dataset.to_table(columns=columns, filter=expression).to_pandas()
+
+    def trajectory_summaries(
+        self, versions: Optional[List[int]] = None, sweep_id: Optional[str] = None
+    ) -> pd.DataFrame:
+        """
+        One row per trajectory (version + instance), with the columns of
+        `DatabaseAnalyzer.get_trajectory_summaries` except the aggregated achievement and meta strings.
+        """
+        programs = self.read(
+            versions,
+            sweep_id,
+            columns=[
+                "version",
+                "version_description",
+                "model",
+                "instance",
+                "id",
+                "depth",
+                "value",
+                "raw_reward",
+                "token_usage",
+                "completion_token_usage",
+                "created_at",
+                "production_score",
+            ],
+        )
+        keys = ["version", "version_description", "model", "instance"]
+        summaries = (
+            programs.groupby(keys, dropna=False)
+            .agg(
+                max_depth=("depth", "max"),
+                final_reward=("value", "max"),
+                max_raw_reward=("raw_reward", "max"),
+                num_steps=("id", "count"),
+                total_tokens=("token_usage", "sum"),
+                total_completion_tokens=("completion_token_usage", "sum"),
+                start_time=("created_at", "min"),
+                end_time=("created_at", "max"),
+                max_production_score=("production_score", "max"),
+            )
+            .reset_index()
+        )
+        summaries["duration_seconds"] = (
+            summaries["end_time"] - summaries["start_time"]
+        ).dt.total_seconds()
+        return summaries.sort_values(["version", "instance"]).reset_index(drop=True)
@@ -52,11 +52,12 @@ def run_process(run_idx: int, config: GymEvalConfig):
     asyncio.run(run_trajectory(run_idx, config))
 
 
-async def run_trajectory(run_idx: int, config: GymEvalConfig):
-    """Run a single gym evaluation process"""
+async def run_trajectory(run_idx: int, config: GymEvalConfig, gym_env=None):
+    """Run a single gym evaluation process, in `gym_env` if given"""
     db_client = await create_db_client()
 
-    gym_env = gym.make(config.env_id, run_idx=run_idx)
+    if gym_env is None:
+        gym_env = gym.make(config.env_id, run_idx=run_idx)
 
     log_dir = os.path.join(".fle", "trajectory_logs", f"v{config.version}")
 
@@ -126,6 +127,56 @@ async def run_trajectory(run_idx: int, config: GymEvalConfig):
             wandb_logger.finish()
 
 
+def create_eval_config(run_config: GymRunConfig, version: int) -> GymEvalConfig:
+    """Create the agents and eval config of a run"""
+    # Get environment info from registry
+    env_info = get_environment_info(run_config.env_id)
+    if env_info is None:
+        raise ValueError(f"Could not get environment info for {run_config.env_id}")
+    task = TaskFactory.create_task(env_info["task_config_path"])
+    generator = SystemPromptGenerator(str(importlib.resources.files("fle") / "env"))
+    # Create agents and their agent cards
+    agents = []
+    agent_cards = []
+    num_agents = env_info["num_agents"]
+    for agent_idx in range(num_agents):
+        system_prompt = generator.generate_for_agent(
+            agent_idx=agent_idx, num_agents=num_agents
+        )
+        # Get API key config file from environment (set by sweep_manager)
+        api_key_config_file = os.getenv("FLE_API_KEY_CONFIG_FILE") or os.getenv(
+            "API_KEY_CONFIG_FILE"
+        )
+
+        agent = GymAgent(
+            model=run_config.model,
+            system_prompt=system_prompt,
+            task=task,
+            agent_idx=agent_idx,
+            observation_formatter=BasicObservationFormatter(include_research=False),
+            system_prompt_formatter=SystemPromptFormatter(),
+            api_key_config_file=api_key_config_file,
+        )
+        agents.append(agent)
+
+        # Create agent card for a2a support
+        agent_card = agent.get_agent_card()
+        agent_cards.append(agent_card)
+
+    # Create eval config with agent cards for a2a support
+    config = GymEvalConfig(
+        agents=agents,
+        version=version,
+        version_description=f"model:{run_config.model}\ntype:{task.task_key}\nnum_agents:{num_agents}",
+        task=task,
+        agent_cards=agent_cards,
+        env_id=run_config.env_id,
+    )
+    # Ensure agent cards are properly set for a2a functionality
+    assert config.agent_cards is not None
+    return config
+
+
 async def main(config_path):
     # Read and validate run configurations
     run_configs = get_validated_run_configs(config_path)
@@ -136,40 +187,6 @@ async def main(config_path):
     # Create and start processes
     processes = []
     for run_idx, run_config in enumerate(run_configs):
-        # Get environment info from registry
-        env_info = get_environment_info(run_config.env_id)
-        if env_info is None:
-            raise ValueError(f"Could not get environment info for {run_config.env_id}")
-        task = TaskFactory.create_task(env_info["task_config_path"])
-        generator = SystemPromptGenerator(str(importlib.resources.files("fle") / "env"))
-        # Create agents and their agent cards
-        agents = []
-        agent_cards = []
-        num_agents = env_info["num_agents"]
-        for agent_idx in range(num_agents):
-            system_prompt = generator.generate_for_agent(
-                agent_idx=agent_idx, num_agents=num_agents
-            )
-            # Get API key config file from environment (set by sweep_manager)
-            api_key_config_file = os.getenv("FLE_API_KEY_CONFIG_FILE") or os.getenv(
-                "API_KEY_CONFIG_FILE"
-            )
-
-            agent = GymAgent(
-                model=run_config.model,
-                system_prompt=system_prompt,
-                task=task,
-                agent_idx=agent_idx,
-                observation_formatter=BasicObservationFormatter(include_research=False),
-                system_prompt_formatter=SystemPromptFormatter(),
-                api_key_config_file=api_key_config_file,
-            )
-            agents.append(agent)
-
-            # Create agent card for a2a support
-            agent_card = agent.get_agent_card()
-            agent_cards.append(agent_card)
-
         # Set version
         version = (
             run_config.version
@@ -177,17 +194,7 @@ async def main(config_path):
             else base_version + version_offset
         )
         version_offset += 1
-        # Create eval config with agent cards for a2a support
-        config = GymEvalConfig(
-            agents=agents,
-            version=version,
-            version_description=f"model:{run_config.model}\ntype:{task.task_key}\nnum_agents:{num_agents}",
-            task=task,
-            agent_cards=agent_cards,
-            env_id=run_config.env_id,
-        )
-        # Ensure agent cards are properly set for a2a functionality
-        assert config.agent_cards is not None
+        config = create_eval_config(run_config, version)
 
         # Start process
         p = multiprocessing.Process(target=run_process, args=(run_idx, config))
@@ -1,5 +1,6 @@
 from .sweep_manager import SweepManager, SweepConfig
 from .server_manager import ServerManager
+from .worker_pool import SweepWorkerPool
 from .api_key_manager import (
     APIKeyManager,
     get_api_key_manager,
@@ -10,6 +11,7 @@ __all__ = [
     "SweepManager",
     "SweepConfig",
     "ServerManager",
+    "SweepWorkerPool",
     "APIKeyManager",
     "get_api_key_manager",
     "create_api_keys_config_template",
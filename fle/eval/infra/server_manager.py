@@ -10,7 +10,7 @@ from dataclasses import dataclass
 from typing import List, Dict, Optional, Set
 from datetime import datetime, timedelta
 
-from fle.commons.cluster_ips import get_local_container_ips
+from fle.commons.cluster_ips import get_container_registry
 
 
 @dataclass
@@ -61,25 +61,39 @@ class ServerManager:
             True if servers were found, False otherwise
         """
         try:
-            ips, udp_ports, tcp_ports = get_local_container_ips()
+            registry = get_container_registry()
+            containers = registry.containers()
 
-            if not tcp_ports:
+            if not containers:
                 print("⚠️  No Factorio containers found")
                 return False
 
-            self._available_servers = list(range(len(tcp_ports)))
+            alive = registry.alive(containers)
+            if not all(alive):
+                # A server went away since the containers were cached
+                containers = registry.containers(refresh=True)
+                alive = registry.alive(containers)
+
+            self._available_servers = [i for i in range(len(containers)) if alive[i]]
             self._server_info = {
                 i: {
-                    "address": ips[i],
-                    "tcp_port": tcp_ports[i],
-                    "udp_port": udp_ports[i],
+                    "address": container.address,
+                    "tcp_port": container.tcp_port,
+                    "udp_port": container.udp_port,
                 }
-                for i in range(len(tcp_ports))
+                for i, container in enumerate(containers)
             }
 
-            print(f"🖥️  Discovered {len(tcp_ports)} Factorio servers:")
-            for i, (ip, tcp_port) in enumerate(zip(ips, tcp_ports)):
-                print(f"   Server {i}: {ip}:{tcp_port}")
+            print(f"🖥️  Discovered {len(containers)} Factorio servers:")
+            for i, container in enumerate(containers):
+                status = "" if alive[i] else " (not responding, skipped)"
+                print(
+                    f"   Server {i}: {container.address}:{container.tcp_port}{status}"
+                )
+
+            if not self._available_servers:
+                print("⚠️  No Factorio servers are responding")
+                return False
 
             self._initialized = True
             return True
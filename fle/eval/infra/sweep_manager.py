@@ -2,10 +2,7 @@
 Sweep management for large-scale evaluations with multiple configurations.
 """
 
-import asyncio
 import json
-import multiprocessing
-import os
 import time
 import uuid
 from dataclasses import dataclass, field
@@ -15,12 +12,13 @@ import itertools
 import random
 from datetime import datetime
 
-from fle.env.gym_env.config import GymRunConfig
+from fle.eval.algorithms.independent.config import GymRunConfig
 from fle.commons.db_client import get_next_version
 from fle.eval.analysis.database_analyzer import DatabaseAnalyzer
 from fle.eval.analysis.performance_metrics import PerformanceAnalyzer
 from fle.eval.analysis.wandb_logger import WandBSweepLogger
 from fle.eval.infra.server_manager import get_server_manager, ServerManager
+from fle.eval.infra.worker_pool import JobResult, SweepWorkerPool
 from fle.eval.tasks.task_definitions.task_registry import get_task_config
 
 
@@ -124,7 +122,9 @@ class SweepManager:
             print(f"🆕 Starting new sweep: {self.sweep_id}")
 
         self.jobs: List[RunJob] = []
-        self.active_processes: Dict[str, multiprocessing.Process] = {}
+        # Worker running each active job
+        self.active_jobs: Dict[str, int] = {}
+        self.worker_pool: Optional[SweepWorkerPool] = None
         self.completed_versions: List[int] = []
         self.start_time: Optional[datetime] = None
         self.wandb_logger: Optional[WandBSweepLogger] = None
@@ -638,89 +638,99 @@ class SweepManager:
                 self.wandb_logger.finish_all()
 
     async def execute_jobs(self):
-        """Execute all jobs with concurrency management"""
+        """Execute all jobs on a pool of workers, one per allocated server"""
 
         def get_pending_jobs():
             return [job for job in self.jobs if job.status == "pending"]
 
-        pending_jobs = get_pending_jobs()
+        self.worker_pool = self.start_worker_pool()
+        if not self.worker_pool:
+            for job in get_pending_jobs():
+                job.status = "failed"
+                job.error_message = "No Factorio servers available"
+                job.end_time = datetime.now()
+            print("❌ No Factorio servers available for the sweep")
+            return
 
-        while pending_jobs or self.active_processes:
-            # Refresh pending jobs list to account for early stopping
+        try:
             pending_jobs = get_pending_jobs()
 
-            # Start new processes if slots are available
-            while (
-                len(self.active_processes) < self.config.max_concurrent_processes
-                and pending_jobs
-            ):
-                job = pending_jobs.pop(0)
-                await self.start_job(job)
+            while pending_jobs or self.active_jobs:
+                # Refresh pending jobs list to account for early stopping
+                pending_jobs = get_pending_jobs()
 
-            # Check for completed processes
-            completed_job_ids = []
-            for job_id, process in self.active_processes.items():
-                if not process.is_alive():
-                    completed_job_ids.append(job_id)
+                # Start new jobs on idle workers
+                for worker_id in self.worker_pool.idle_workers():
+                    if not pending_jobs:
+                        break
+                    await self.start_job(pending_jobs.pop(0), worker_id)
 
-            # Handle completed jobs
-            for job_id in completed_job_ids:
-                await self.handle_completed_job(job_id)
+                # Wait for jobs to complete
+                if self.active_jobs:
+                    for result in await self.worker_pool.wait_for_results():
+                        await self.handle_completed_job(result)
 
-            # Log progress periodically
-            await self.log_progress_if_needed()
+                # Log progress periodically
+                await self.log_progress_if_needed()
 
-            # Brief sleep to avoid busy waiting
-            await asyncio.sleep(1)
+                pending_jobs = get_pending_jobs()
+        finally:
+            self.worker_pool.shutdown()
+            for allocation in self.worker_pool.allocations.values():
+                self.server_manager.release_server_by_id(allocation.server_id)
 
         print("All jobs completed!")
 
-    async def start_job(self, job: RunJob):
+    def start_worker_pool(self) -> Optional[SweepWorkerPool]:
+        """Allocate servers for the sweep and start a worker on each
+
+        Returns:
+            The started pool, or None if no servers could be allocated
+        """
+        allocations = []
+        for worker_idx in range(self.config.max_concurrent_processes):
+            allocation = self.server_manager.allocate_server(
+                f"{self.sweep_id}_worker_{worker_idx}"
+            )
+            if not allocation:
+                break
+            allocations.append(allocation)
+
+        if not allocations:
+            return None
+
+        worker_pool = SweepWorkerPool(
+            allocations, self.sweep_id, self.config.api_key_config_file
+        )
+        worker_pool.start()
+        print(f"👷 Started {len(allocations)} sweep workers")
+        return worker_pool
+
+    async def start_job(self, job: RunJob, worker_id: int):
         """Start execution of a single job
 
         Args:
             job: RunJob to execute
+            worker_id: Idle worker to run it on
         """
         print(f"Starting job: {job.job_id} (version {job.version})")
 
-        # Allocate a server for this job
-        server_allocation = self.server_manager.allocate_server(job.job_id)
-        if not server_allocation:
-            job.status = "failed"
-            job.error_message = "No Factorio servers available"
-            job.end_time = datetime.now()
-            print(f"❌ Failed to start job {job.job_id}: No servers available")
-            return
-
+        server_allocation = self.worker_pool.allocations[worker_id]
         print(
-            f"🖥️  Allocated server {server_allocation.server_id} "
-            f"({server_allocation.server_address}:{server_allocation.tcp_port}) "
-            f"to job {job.job_id}"
+            f"🖥️  Running job {job.job_id} on server {server_allocation.server_id} "
+            f"({server_allocation.server_address}:{server_allocation.tcp_port})"
         )
 
         # Create run configuration
         run_config = GymRunConfig(env_id=job.task, model=job.model, version=job.version)
 
-        # Create gym eval config (similar to run_eval.py)
         try:
             job.status = "running"
             job.start_time = datetime.now()
 
-            # Start the process
-            process = multiprocessing.Process(
-                target=self.run_job_wrapper,
-                args=(
-                    job.job_id,
-                    run_config,
-                    job.version,
-                    job.sweep_id,
-                    server_allocation,
-                    self.config.api_key_config_file,
-                ),
-            )
-            process.start()
-            server_allocation.process_id = process.pid
-            self.active_processes[job.job_id] = process
+            # Send the job to the worker
+            self.worker_pool.submit(worker_id, job.job_id, run_config, job.version)
+            self.active_jobs[job.job_id] = worker_id
 
             # Log to WandB if enabled
             if self.wandb_logger:
@@ -751,111 +761,24 @@ class SweepManager:
                 )
 
         except Exception as e:
-            # Release server if process failed to start
-            self.server_manager.release_server(job.job_id)
             job.status = "failed"
             job.error_message = str(e)
             job.end_time = datetime.now()
             print(f"❌ Failed to start job {job.job_id}: {e}")
 
-    @staticmethod
-    def run_job_wrapper(
-        job_id: str,
-        run_config: GymRunConfig,
-        version: int,
-        sweep_id: str,
-        server_allocation,  # ServerAllocation object
-        api_key_config_file: Optional[str] = None,
-    ):
-        """Wrapper for running a job in a subprocess
-
-        Args:
-            job_id: Unique job identifier
-            run_config: GymRunConfig for this job
-            version: Version number for this job
-            sweep_id: Unique identifier for this sweep
-            server_allocation: ServerAllocation object with server details
-            api_key_config_file: Optional path to API key config file
-        """
-        try:
-            # Set environment variables
-            if api_key_config_file:
-                os.environ["FLE_API_KEY_CONFIG_FILE"] = api_key_config_file
-
-            # Set sweep ID environment variable for database and WandB logging
-            os.environ["FLE_SWEEP_ID"] = sweep_id
-
-            # Set server allocation environment variables
-            os.environ["FACTORIO_SERVER_ADDRESS"] = server_allocation.server_address
-            os.environ["FACTORIO_SERVER_PORT"] = str(server_allocation.tcp_port)
-            os.environ["FLE_SERVER_ID"] = str(server_allocation.server_id)
-
-            # Override PORT_OFFSET to ensure we use the allocated server
-            os.environ["PORT_OFFSET"] = str(server_allocation.server_id)
-
-            # This would be similar to the run_process function in run_eval.py
-            # but adapted for single configurations
-            print(
-                f"Executing job {job_id} with version {version} (sweep: {sweep_id}) "
-                f"on server {server_allocation.server_id} ({server_allocation.server_address}:{server_allocation.tcp_port})"
-            )
-
-            # Create a temporary config file for this job
-            config_data = [run_config.__dict__]
-
-            # Run the evaluation (this would call the actual evaluation logic)
-            asyncio.run(SweepManager._execute_single_evaluation(config_data, job_id))
-
-            print(f"Job {job_id} completed successfully")
-
-        except Exception as e:
-            print(f"Job {job_id} failed: {e}")
-            raise
-
-    @staticmethod
-    async def _execute_single_evaluation(config_data: List[Dict], job_id: str):
-        """Execute a single evaluation run
-
-        Args:
-            config_data: List with single run config
-            job_id: Job identifier for logging
-        """
-        # Import here to avoid circular imports
-        from fle.env.gym_env.run_eval import main as run_eval_main
-
-        # Create temporary config file
-        import tempfile
-
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False) as f:
-            json.dump(config_data, f)
-            temp_config_path = f.name
-
-        try:
-            # Run evaluation with the temporary config
-            await run_eval_main(temp_config_path)
-        finally:
-            # Clean up temporary file
-            Path(temp_config_path).unlink(missing_ok=True)
-
-    async def handle_completed_job(self, job_id: str):
+    async def handle_completed_job(self, result: JobResult):
         """Handle a completed job
 
         Args:
-            job_id: ID of the completed job
+            result: Result reported by the worker that ran the job
         """
-        process = self.active_processes.pop(job_id)
+        job_id = result.job_id
+        self.active_jobs.pop(job_id, None)
         job = next(job for job in self.jobs if job.job_id == job_id)
 
         job.end_time = datetime.now()
 
-        # Release the server allocated to this job
-        server_released = self.server_manager.release_server(job_id)
-        if server_released:
-            print(f"🔓 Released server for completed job {job_id}")
-        else:
-            print(f"⚠️  No server allocation found for job {job_id}")
-
-        if process.exitcode == 0:
+        if result.success:
             job.status = "completed"
             self.completed_versions.append(job.version)
             print(f"✅ Job {job_id} completed successfully")
@@ -872,7 +795,6 @@ class SweepManager:
                         {
                             "job/status": "completed",
                             "job/completion_status": "successful",
-                            "job/exit_code": process.exitcode,
                             "job/duration_minutes": (
                                 job.end_time - job.start_time
                             ).total_seconds()
@@ -885,8 +807,8 @@ class SweepManager:
 
         else:
             job.status = "failed"
-            job.error_message = f"Process exited with code {process.exitcode}"
-            print(f"❌ Job {job_id} failed with exit code {process.exitcode}")
+            job.error_message = result.error_message
+            print(f"❌ Job {job_id} failed: {result.error_message}")
 
             # Log failure to WandB
             if self.wandb_logger:
@@ -902,7 +824,6 @@ class SweepManager:
                             "job/completion_status": "will_retry"
                             if will_retry
                             else "failed_final",
-                            "job/exit_code": process.exitcode,
                             "job/error_message": job.error_message,
                             "job/duration_minutes": (
                                 job.end_time - job.start_time
@@ -927,7 +848,6 @@ class SweepManager:
                 job.start_time = None
                 job.end_time = None
                 job.error_message = None
-                # Note: Server will be reallocated when job is retried
 
     async def check_dynamic_early_stopping(self, completed_job: RunJob):
         """Check if we can early stop more jobs based on a newly completed successful job
@@ -1360,7 +1280,7 @@ class SweepManager:
             "early_stopped": early_stopped,
             "pending": pending,
             "completion_rate": completed / total if total > 0 else 0,
-            "active_processes": len(self.active_processes),
+            "active_processes": len(self.active_jobs),
             "elapsed_time": (datetime.now() - self.start_time)
             if self.start_time
             else None,
@@ -0,0 +1,253 @@
+"""
+Long-lived worker processes for sweep jobs.
+
+Each worker is pinned to one Factorio server for the whole sweep and receives its jobs over a queue. It keeps
+its connected FactorioInstance (with the Lua tools loaded) between jobs, so that a job only pays for the
+task's reset instead of a new process, imports and connection. Workers report each finished job on a shared
+results queue, which the sweep waits on instead of polling the processes.
+"""
+
+import asyncio
+import multiprocessing
+import os
+import queue
+import traceback
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from fle.eval.infra.server_manager import ServerAllocation
+
+# How long to wait for a result before checking that the workers are still alive
+RESULT_TIMEOUT_SECONDS = 30
+
+
+@dataclass
+class JobResult:
+    """Outcome of a job run by a worker"""
+
+    job_id: str
+    worker_id: int
+    success: bool
+    error_message: Optional[str] = None
+
+
+def run_sweep_job(run_config, version: int, instance=None):
+    """Run a single evaluation in this process, reusing `instance` if given
+
+    Args:
+        run_config: GymRunConfig of the job
+        version: Version number for the job
+        instance: Instance kept from the previous job on this worker
+
+    Returns:
+        The instance to reuse for the next job, if it can be
+    """
+    # Import here to avoid circular imports
+    import gym
+
+    from fle.eval.entrypoints.gym_eval import create_eval_config, run_trajectory
+
+    config = create_eval_config(run_config, version)
+    env_kwargs = {"run_idx": 0}
+    if instance is not None:
+        env_kwargs["instance"] = instance
+    gym_env = gym.make(run_config.env_id, **env_kwargs)
+
+    asyncio.run(run_trajectory(0, config, gym_env=gym_env))
+
+    # Multi-agent instances belong to the event loop of the job that created them
+    instance = gym_env.unwrapped.instance
+    return instance if instance.num_agents == 1 else None
+
+
+def run_worker(
+    worker_id: int,
+    server_allocation: ServerAllocation,
+    sweep_id: str,
+    api_key_config_file: Optional[str],
+    jobs: multiprocessing.Queue,
+    results: multiprocessing.Queue,
+    run_job: Callable = run_sweep_job,
+):
+    """Main loop of a worker process: run jobs from `jobs` until it receives None
+
+    Args:
+        worker_id: Identifier of the worker in its pool
+        server_allocation: Factorio server the worker is pinned to
+        sweep_id: Unique identifier for the sweep
+        api_key_config_file: Optional path to API key config file
+        jobs: Queue of (job_id, run_config, version) tuples
+        results: Queue to report a JobResult on after each job
+        run_job: Function running a job, as `run_sweep_job`
+    """
+    # Set environment variables
+    if api_key_config_file:
+        os.environ["FLE_API_KEY_CONFIG_FILE"] = api_key_config_file
+
+    # Set sweep ID environment variable for database and WandB logging
+    os.environ["FLE_SWEEP_ID"] = sweep_id
+
+    # Set server allocation environment variables
+    os.environ["FACTORIO_SERVER_ADDRESS"] = server_allocation.server_address
+    os.environ["FACTORIO_SERVER_PORT"] = str(server_allocation.tcp_port)
+    os.environ["FLE_SERVER_ID"] = str(server_allocation.server_id)
+
+    # Override PORT_OFFSET to ensure we use the allocated server
+    os.environ["PORT_OFFSET"] = str(server_allocation.server_id)
+
+    instance = None
+    while True:
+        job = jobs.get()
+        if job is None:
+            break
+
+        job_id, run_config, version = job
+        print(
+            f"Executing job {job_id} with version {version} (sweep: {sweep_id}) "
+            f"on server {server_allocation.server_id} ({server_allocation.server_address}:{server_allocation.tcp_port})"
+        )
+        try:
+            instance = run_job(run_config, version, instance)
+            print(f"Job {job_id} completed successfully")
+            results.put(JobResult(job_id, worker_id, success=True))
+        except Exception as e:
+            traceback.print_exc()
+            print(f"Job {job_id} failed: {e}")
+            # The instance may be left in a bad state, so the next job reconnects
+            instance = None
+            results.put(
+                JobResult(job_id, worker_id, success=False, error_message=str(e))
+            )
+
+    if instance is not None:
+        instance.cleanup()
+
+
+class SweepWorkerPool:
+    """Worker processes, one per allocated Factorio server, that stay up for the whole sweep"""
+
+    def __init__(
+        self,
+        server_allocations: List[ServerAllocation],
+        sweep_id: str,
+        api_key_config_file: Optional[str] = None,
+        run_job: Callable = run_sweep_job,
+    ):
+        """Initialize the worker pool
+
+        Args:
+            server_allocations: Servers to start a worker for, one each
+            sweep_id: Unique identifier for the sweep
+            api_key_config_file: Optional path to API key config file
+            run_job: Function running a job in a worker, as `run_sweep_job`
+        """
+        self.allocations: Dict[int, ServerAllocation] = dict(
+            enumerate(server_allocations)
+        )
+        self.sweep_id = sweep_id
+        self.api_key_config_file = api_key_config_file
+        self.run_job = run_job
+        self.results = multiprocessing.Queue()
+        self._processes: Dict[int, multiprocessing.Process] = {}
+        self._jobs: Dict[int, multiprocessing.Queue] = {}
+        # Job running on each busy worker
+        self.running: Dict[int, str] = {}
+
+    def start(self):
+        """Start a worker for every server"""
+        for worker_id in self.allocations:
+            self._start_worker(worker_id)
+
+    def _start_worker(self, worker_id: int):
+        self._jobs[worker_id] = multiprocessing.Queue()
+        process = multiprocessing.Process(
+            target=run_worker,
+            args=(
+                worker_id,
+                self.allocations[worker_id],
+                self.sweep_id,
+                self.api_key_config_file,
+                self._jobs[worker_id],
+                self.results,
+                self.run_job,
+            ),
+        )
+        process.start()
+        self.allocations[worker_id].process_id = process.pid
+        self._processes[worker_id] = process
+
+    def idle_workers(self) -> List[int]:
+        return [
+            worker_id for worker_id in self.allocations if worker_id not in self.running
+        ]
+
+    def submit(self, worker_id: int, job_id: str, run_config, version: int):
+        """Send a job to an idle worker"""
+        if worker_id in self.running:
+            raise ValueError(
+                f"Worker {worker_id} is already running job {self.running[worker_id]}"
+            )
+        self.running[worker_id] = job_id
+        allocation = self.allocations[worker_id]
+        allocation.job_id = job_id
+        allocation.allocated_at = datetime.now()
+        self._jobs[worker_id].put((job_id, run_config, version))
+
+    async def wait_for_results(
+        self, timeout: float = RESULT_TIMEOUT_SECONDS
+    ) -> List[JobResult]:
+        """
+        Wait until a job finishes (or `timeout` passes), without blocking the event loop.
+
+        Returns:
+            Results of the jobs that finished, including the jobs of workers that died (which are restarted)
+        """
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(None, self._get_result, timeout)
+        results = [result] if result else []
+        while True:
+            result = self._get_result(None)
+            if result is None:
+                break
+            results.append(result)
+
+        for worker_id, process in list(self._processes.items()):
+            if process.is_alive():
+                continue
+            job_id = self.running.get(worker_id)
+            print(f"⚠️  Worker {worker_id} exited with code {process.exitcode}")
+            if job_id and all(r.job_id != job_id for r in results):
+                results.append(
+                    JobResult(
+                        job_id,
+                        worker_id,
+                        success=False,
+                        error_message=f"Worker exited with code {process.exitcode}",
+                    )
+                )
+            self.running.pop(worker_id, None)
+            self._start_worker(worker_id)
+
+        for result in results:
+            self.running.pop(result.worker_id, None)
+        return results
+
+    def _get_result(self, timeout: Optional[float]) -> Optional[JobResult]:
+        try:
+            if timeout is None:
+                return self.results.get_nowait()
+            return self.results.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def shutdown(self, timeout: float = 30):
+        """Stop the workers once they finish their current job, terminating any still running after `timeout`"""
+        for jobs in self._jobs.values():
+            jobs.put(None)
+        for process in self._processes.values():
+            process.join(timeout)
+            if process.is_alive():
+                process.terminate()
+        self._processes.clear()
+        self.running.clear()
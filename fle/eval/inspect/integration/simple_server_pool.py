@@ -9,6 +9,8 @@ import os
 from dataclasses import dataclass
 from typing import Optional, List, Tuple
 
+from fle.commons.cluster_ips import get_container_registry
+
 logger = logging.getLogger(__name__)
 
 
@@ -72,6 +74,36 @@ class SimpleServerPool:
                     "No Anthropic API keys found. Set ANTHROPIC_API_KEYS or ANTHROPIC_API_KEY"
                 )
 
+    def _responding_indices(self) -> List[int]:
+        """run_idx values in the configured range whose Factorio container answers RCON.
+
+        The range is used as is when the server is configured externally (FACTORIO_SERVER_ADDRESS) or no
+        local containers are found.
+        """
+        indices = list(range(self.start_idx, self.end_idx))
+        if os.getenv("FACTORIO_SERVER_ADDRESS"):
+            return indices
+
+        registry = get_container_registry()
+        containers = registry.containers()
+        if not containers:
+            logger.warning(
+                "No local Factorio containers found, using the configured range"
+            )
+            return indices
+
+        # make_factorio_env connects run_idx to the container at PORT_OFFSET + run_idx
+        port_offset = int(os.getenv("PORT_OFFSET", "0"))
+        candidates = [i for i in indices if port_offset + i < len(containers)]
+        alive = registry.alive([containers[port_offset + i] for i in candidates])
+        responding = [i for i, ok in zip(candidates, alive) if ok]
+        skipped = sorted(set(indices) - set(responding))
+        if skipped:
+            logger.warning(
+                f"Skipping servers {skipped}: no responding Factorio container"
+            )
+        return responding
+
     async def initialize(self):
         """Initialize the pool with available run_idx values"""
         if self._initialized:
@@ -80,13 +112,15 @@ class SimpleServerPool:
         # Load API keys
         self._load_api_keys()
 
-        # Populate queue with available run_idx values in the configured range
-        for i in range(self.start_idx, self.end_idx):
+        # Populate queue with the run_idx values of responding servers in the configured range
+        indices = await asyncio.to_thread(self._responding_indices)
+        for i in indices:
             await self.available_indices.put(i)
+        self.max_servers = len(indices)
 
         logger.info(
             f"Initialized SimpleServerPool with servers {self.start_idx}-{self.end_idx - 1} "
-            f"({self.max_servers} total) and {len(self._api_keys)} API keys"
+            f"({self.max_servers} available) and {len(self._api_keys)} API keys"
         )
         self._initialized = True
 
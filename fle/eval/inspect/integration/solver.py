@@ -28,6 +28,7 @@ from inspect_ai.model import (
 )
 from inspect_ai.util import StoreModel, store_as
 
+from fle.commons.models.game_state_store import GameStateStore
 from fle.env.gym_env.environment import FactorioGymEnv
 from fle.env.gym_env.action import Action
 from fle.env.gym_env.observation import Observation
@@ -45,14 +46,16 @@ from fle.agents.llm.parsing import parse_response
 from fle.env.tools.agent.sleep.client import Sleep
 
 
+import functools
 import importlib.resources
 from pathlib import Path
 from jinja2 import Template
 import gym
 
 
+@functools.lru_cache(maxsize=None)
 def _load_prompt_template(filename: str) -> Template:
-    """Load a Jinja2 prompt template from the prompts directory."""
+    """Load a Jinja2 prompt template from the prompts directory, compiled once per process."""
     prompt_path = Path(__file__).parent / "prompts" / filename
     return Template(prompt_path.read_text())
 
@@ -786,7 +789,7 @@ def factorio_unbounded_solver():
             automated_production_scores = []  # Automated production scores (excluding harvested/crafted)
             step_results = []
             game_ticks = []  # Track game ticks at each step
-            game_states = []
+            game_states = GameStateStore.from_env()
 
             # Store previous step's feedback to combine with next step's prompt
             # This avoids contiguous user messages in the conversation
@@ -36,6 +36,7 @@ from inspect_ai.model import (
 )
 from inspect_ai.util import store_as
 
+from fle.commons.models.game_state_store import GameStateStore
 from fle.env.gym_env.environment import FactorioGymEnv
 from fle.env.gym_env.action import Action
 from fle.env.gym_env.observation import Observation
@@ -219,7 +220,7 @@ Now begin building your factory step by step."""
         production_scores = []
         step_results = []
         game_ticks = []
-        game_states = []
+        game_states = GameStateStore.from_env()
 
         # Achievement tracking - unique item types produced
         produced_item_types_set: set = set()
@@ -969,7 +970,7 @@ Now begin building your factory step by step."""
             production_scores = []
             step_results = []
             game_ticks = []
-            game_states = []
+            game_states = GameStateStore.from_env()
 
             # For HUD mode
             reasoning_diary: List[str] = []
@@ -1495,7 +1496,7 @@ Now begin building your factory step by step."""
             production_scores = []
             step_results = []
             game_ticks = []
-            game_states = []
+            game_states = GameStateStore.from_env()
 
             # Achievement tracking - unique item types produced
             produced_item_types_set: set = set()
@@ -2057,7 +2058,7 @@ Now begin building your factory step by step."""
             production_scores = []
             step_results = []
             game_ticks = []
-            game_states = []
+            game_states = GameStateStore.from_env()
 
             # Achievement tracking - unique item types produced
             produced_item_types_set: set = set()
@@ -2562,7 +2563,7 @@ def factorio_condensed_prompt_latest_image_solver():
             production_scores = []
             step_results = []
             game_ticks = []
-            game_states = []
+            game_states = GameStateStore.from_env()
 
             # Achievement tracking - unique item types produced
             produced_item_types_set: set = set()
@@ -3009,7 +3010,7 @@ def factorio_condensed_prompt_solver():
             production_scores = []
             step_results = []
             game_ticks = []
-            game_states = []
+            game_states = GameStateStore.from_env()
 
             # Achievement tracking - unique item types produced
             produced_item_types_set: set = set()
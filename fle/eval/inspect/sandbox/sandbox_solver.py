@@ -12,7 +12,6 @@ import logging
 import os
 import time
 import traceback
-from pathlib import Path
 
 from inspect_ai.scorer import score
 from inspect_ai.solver import solver
@@ -28,10 +27,9 @@ from inspect_ai.model import (
 )
 from inspect_ai.util import store_as, sandbox
 
-from jinja2 import Template
-
 from fle.eval.inspect.integration.solver import (
     TrajectoryData,
+    _load_prompt_template,
 )
 from fle.eval.tasks.task_definitions.lab_play.throughput_tasks import THROUGHPUT_TASKS
 from fle.agents.llm.parsing import parse_response
@@ -43,12 +41,6 @@ logger = logging.getLogger(__name__)
 BRIDGE_CMD = ["python3", "/opt/fle/bridge_client.py"]
 
 
-def _load_prompt_template(filename: str) -> Template:
-    """Load a Jinja2 prompt template from the prompts directory."""
-    prompt_path = Path(__file__).parent.parent / "integration" / "prompts" / filename
-    return Template(prompt_path.read_text())
-
-
 async def _bridge_exec(command: str, body: dict = None, timeout: int = 300) -> dict:
     """Execute a bridge client command inside the sandbox container.
 
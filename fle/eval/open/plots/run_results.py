@@ -7,8 +7,11 @@ from typing import Dict, List, Optional, Set, Tuple
 import matplotlib.pyplot as plt
 import networkx as nx
 import numpy as np
+import pandas as pd
 
+from fle.commons.asyncio_utils import run_async_safely
 from fle.commons.db_client import DBClient
+from fle.eval.analysis.results_cache import ResultsCache, is_successful_response
 
 
 @dataclass
@@ -24,10 +27,18 @@ class Node:
 
 
 class RunResults:
-    def __init__(self, version: int, db_client: DBClient, neptune_run=None):
+    def __init__(
+        self,
+        version: int,
+        db_client: DBClient,
+        neptune_run=None,
+        results_cache: Optional[ResultsCache] = None,
+    ):
         self.version = version
         self.db_client = db_client
         self.neptune_run = neptune_run
+        # When set, the trees are built from the columnar cache, without the code and responses
+        self.results_cache = results_cache
         self.dir_path = Path(f"runs/{self.version}")
 
     def plot_reward_mean_std(
@@ -357,10 +368,7 @@ class RunResults:
 
             # Track success rate (non-error executions)
             success_rate_by_depth[depth]["total"] += 1
-            if node.response and not any(
-                error_term in node.response.lower()
-                for error_term in ["error", "exception", "failed"]
-            ):
+            if node.metrics.get("response_ok"):
                 success_rate_by_depth[depth]["success"] += 1
 
             # Traverse children
@@ -562,24 +570,18 @@ class RunResults:
         return value, current_set
 
     def _create_trees_from_db(self) -> Tuple[List[Node], Set[int]]:
+        if self.results_cache is not None:
+            return self._create_trees_from_cache()
+
         # Get all nodes for this version
         with self.db_client.get_connection() as conn:
             with conn.cursor() as cur:
-                print(f"\nExecuting SQL query for version {self.version}")
                 cur.execute(f"""SELECT id, parent_id, code, response, achievements_json, value, raw_reward, ticks 
                               FROM programs WHERE version = {self.version}""")
                 nodes = cur.fetchall()
-                print(f"Found {len(nodes)} total database rows")
-                if nodes:
-                    print(f"Sample row: {nodes[0]}")
-
-        # Create mapping of nodes
-        node_map: Dict[int, Node] = {}
-        root_nodes: List[Node] = []
-        processed_ids = set()
+        print(f"Found {len(nodes)} programs for version {self.version}")
 
-        print("\nProcessing nodes:")
-        # Create Node objects
+        node_objs = []
         for node in nodes:
             (
                 id,
@@ -591,8 +593,6 @@ class RunResults:
                 raw_reward,
                 ticks,
             ) = node
-            processed_ids.add(id)
-            print(f"Processing node {id} with parent {parent_id}")
 
             try:
                 achievements = (
@@ -603,48 +603,104 @@ class RunResults:
             # Parse achievements
             static_achievements = achievements["static"] if achievements else {}
             dynamic_achievements = achievements["dynamic"] if achievements else {}
-            metrics_dict = {
-                "value": value,
-                "raw_reward": raw_reward,
-                "dynamic_achievement_count": len(dynamic_achievements),
-                "static_achievement_count": len(static_achievements),
-                "dynamic_achievements": set(dynamic_achievements.keys()),
-                "static_achievements": set(static_achievements.keys()),
-                "achievements": set(static_achievements.keys()).union(
-                    set(dynamic_achievements.keys())
-                ),
-                "ticks": ticks,
-            }
-
-            # Create node
-            node_obj = Node(
-                id=id,
-                parent_id=parent_id,
-                source_code=source_code,
-                response=response,
-                static_achievements=static_achievements,
-                dynamic_achievements=dynamic_achievements,
-                children=[],
-                metrics=metrics_dict,
+
+            node_objs.append(
+                self._create_node(
+                    id,
+                    parent_id,
+                    static_achievements,
+                    dynamic_achievements,
+                    value,
+                    raw_reward,
+                    ticks,
+                    is_successful_response(response),
+                    source_code=source_code,
+                    response=response,
+                )
             )
-            node_map[id] = node_obj
+        return self._build_trees(node_objs)
+
+    def _create_trees_from_cache(self) -> Tuple[List[Node], Set[int]]:
+        run_async_safely(self.results_cache.export(self.db_client, [self.version]))
+        programs = self.results_cache.read(
+            versions=[self.version],
+            columns=[
+                "id",
+                "parent_id",
+                "static_achievements",
+                "dynamic_achievements",
+                "value",
+                "raw_reward",
+                "ticks",
+                "response_ok",
+            ],
+        )
+        print(f"Found {len(programs)} cached programs for version {self.version}")
+
+        node_objs = [
+            self._create_node(
+                int(row.id),
+                None if pd.isna(row.parent_id) else int(row.parent_id),
+                dict(row.static_achievements or []),
+                dict(row.dynamic_achievements or []),
+                row.value,
+                row.raw_reward,
+                row.ticks,
+                bool(row.response_ok),
+            )
+            for row in programs.itertuples(index=False)
+        ]
+        return self._build_trees(node_objs)
+
+    @staticmethod
+    def _create_node(
+        id: int,
+        parent_id: Optional[int],
+        static_achievements: Dict,
+        dynamic_achievements: Dict,
+        value,
+        raw_reward,
+        ticks,
+        response_ok: bool,
+        source_code: str = "",
+        response: Optional[str] = None,
+    ) -> Node:
+        metrics_dict = {
+            "value": value,
+            "raw_reward": raw_reward,
+            "dynamic_achievement_count": len(dynamic_achievements),
+            "static_achievement_count": len(static_achievements),
+            "dynamic_achievements": set(dynamic_achievements.keys()),
+            "static_achievements": set(static_achievements.keys()),
+            "achievements": set(static_achievements.keys()).union(
+                set(dynamic_achievements.keys())
+            ),
+            "ticks": ticks,
+            "response_ok": response_ok,
+        }
+        return Node(
+            id=id,
+            parent_id=parent_id,
+            source_code=source_code,
+            response=response,
+            static_achievements=static_achievements,
+            dynamic_achievements=dynamic_achievements,
+            children=[],
+            metrics=metrics_dict,
+        )
 
-        print("\nBuilding tree structure:")
-        # Build tree structure
+    @staticmethod
+    def _build_trees(nodes: List[Node]) -> Tuple[List[Node], Set[int]]:
+        node_map: Dict[int, Node] = {node.id: node for node in nodes}
+        root_nodes: List[Node] = []
         for node in node_map.values():
             if node.parent_id is None or node.parent_id not in node_map:
                 root_nodes.append(node)
-                print(f"Found root node: {node.id}")
             else:
-                parent = node_map[node.parent_id]
-                parent.children.append(node)
-                print(f"Added node {node.id} as child of {node.parent_id}")
-
-        print("\nFinal summary:")
-        print(f"Total nodes processed: {len(processed_ids)}")
-        print(f"Root nodes found: {[node.id for node in root_nodes]}")
+                node_map[node.parent_id].children.append(node)
 
-        return root_nodes, processed_ids
+        print(f"Built {len(root_nodes)} trees from {len(node_map)} nodes")
+        return root_nodes, set(node_map)
 
     def plot_reward_percentiles(
         self,
@@ -428,6 +428,18 @@ def fle_sprites(args):
         sys.exit(1)
 
 
+def fle_render(args):
+    from fle.env.tools.admin.render.batch import render_blueprints
+
+    render_blueprints(
+        args.paths,
+        args.output_dir,
+        workers=args.workers,
+        overwrite=args.overwrite,
+        max_dimension=args.max_dimension,
+    )
+
+
 SANDBOX_IMAGE = "fle-sandbox:latest"
 
 
@@ -569,6 +581,7 @@ Examples:
   fle eval --config configs/gym_run_config.json
   fle cluster [start|stop|restart|help] [-n N] [-s SCENARIO]
   fle sprites [--force] [--workers N]
+  fle render blueprints/ -o rendered/ [--workers N]
         """,
     )
     subparsers = parser.add_subparsers(dest="command")
@@ -734,6 +747,34 @@ Examples:
         default=".fle/sprites",
         help="Directory to save generated sprites (default: .fle/sprites)",
     )
+    parser_render = subparsers.add_parser(
+        "render", help="Render blueprint files without a Factorio server"
+    )
+    parser_render.add_argument(
+        "paths", nargs="+", help="Blueprint JSON files, or directories of them"
+    )
+    parser_render.add_argument(
+        "-o",
+        "--output-dir",
+        default=".fle/rendered_blueprints",
+        help="Directory for the images and manifest (default: .fle/rendered_blueprints)",
+    )
+    parser_render.add_argument(
+        "--workers",
+        type=int,
+        help="Number of rendering processes (default: number of CPUs)",
+    )
+    parser_render.add_argument(
+        "--overwrite",
+        action="store_true",
+        help="Render blueprints whose image already exists",
+    )
+    parser_render.add_argument(
+        "--max-dimension",
+        type=int,
+        default=1024,
+        help="Largest side of the images in pixels (default: 1024)",
+    )
     parser_sandbox = subparsers.add_parser(
         "sandbox", help="Manage the sandbox Docker image for Inspect evaluations"
     )
@@ -759,6 +800,8 @@ Examples:
         fle_inspect_eval(args)
     elif args.command == "sprites":
         fle_sprites(args)
+    elif args.command == "render":
+        fle_render(args)
     elif args.command == "sandbox":
         fle_sandbox(args)
     else:
@@ -761,3 +761,12 @@ def test_get_lab_edge_cases(configure_game):
     print("✓ All labs found in get_entities() with no filter")
 
     print("\n✅ All edge cases passed - labs are observable in every scenario tested")
+
+
+def test_get_entities_sees_entities_placed_on_the_same_tick(game):
+    chest = game.place_entity(Prototype.IronChest, position=ent.Position(x=2.5, y=2.5))
+    game.insert_item(Prototype.Coal, chest, 5)
+
+    chests = game.get_entities({Prototype.IronChest}, position=chest.position, radius=1)
+
+    assert chests and chests[0].inventory.get(Prototype.Coal, 0) == 5
@@ -1,3 +1,10 @@
 def test_get_score(game):
     score, _ = game.score()
     assert isinstance(score, int)
+
+
+def test_get_price_list(game):
+    prices = game._get_price_list()
+
+    assert prices["iron-plate"] > prices["iron-ore"] > 0
+    assert game._get_price_list() == prices
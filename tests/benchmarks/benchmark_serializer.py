@@ -0,0 +1,115 @@
+"""
+Compares the `dump` and `dump_json` response serializers (mods/utils.lua) on large tool responses: the time the
+server takes to serialize a response, and the full round trip including decoding it in Python.
+"""
+
+import inspect
+import re
+import time
+
+from fle.env import FactorioInstance
+
+ENTITY_COUNTS = [100, 500, 1000, 2000]
+ITERATIONS = 5
+
+# Serializes the response of a tool on the server and prints the length of the result and the time it took
+SERIALIZE = (
+    "/silent-command local ok, response = pcall(storage.actions.{action}, {args}) "
+    "local profiler = helpers.create_profiler() "
+    "local serialized = {serializer}({{a = ok, b = response}}) "
+    "profiler.stop() "
+    'rcon.print({{"", #serialized, " ", profiler}})'
+)
+
+# Tool name -> server action arguments (after the player index), from the Python clients
+PAYLOADS = {
+    "get_entities": (500, "[]", 0, 0),
+    "save_entity_state": (500, True, False, True),
+}
+
+
+def place_chests(instance: FactorioInstance, count: int):
+    """Fill a square around the origin with `count` chests"""
+    instance.rcon_client.send_command(
+        f"/silent-command local surface = game.surfaces[1] local width = math.ceil(math.sqrt({count})) "
+        f"for i = 0, {count} - 1 do surface.create_entity{{name = 'iron-chest', force = 'player', "
+        f"position = {{x = 4 + (i % width), y = 4 + math.floor(i / width)}}}} end"
+    )
+
+
+def server_serialization(instance: FactorioInstance, action: str, serializer: str):
+    """(response size in bytes, milliseconds spent serializing) on the server"""
+    args = ", ".join(
+        str(arg).lower() if isinstance(arg, bool) else repr(arg).replace("'", '"')
+        for arg in (1, *PAYLOADS[action])
+    )
+    response = instance.rcon_client.send_command(
+        SERIALIZE.format(action=action, args=args, serializer=serializer)
+    )
+    size, duration = re.match(r"(\d+) Duration: ([\d.]+)ms", response).groups()
+    return int(size), float(duration)
+
+
+def get_controller(instance: FactorioInstance, action: str):
+    """Controller of a tool, created on first use through the namespace (admin tools are prefixed with _)"""
+    for name in (action, f"_{action}"):
+        tool = getattr(instance.first_namespace, name, None)
+        # Tools are wrapped to run their hooks by `LuaScriptManager.setup_tools`
+        if hasattr(tool, "__wrapped__"):
+            return inspect.unwrap(tool)
+    raise KeyError(action)
+
+
+def round_trip(instance: FactorioInstance, action: str, serializer: str):
+    """Seconds for a full tool call, including decoding the response"""
+    controller = get_controller(instance, action)
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        controller.execute(
+            controller.player_index, *PAYLOADS[action], serializer=serializer
+        )
+    return (time.perf_counter() - start) / ITERATIONS
+
+
+def run_benchmark(instance: FactorioInstance):
+    results = []
+    for count in ENTITY_COUNTS:
+        instance.reset()
+        place_chests(instance, count)
+        for action in PAYLOADS:
+            for serializer, lua_function in (("dump", "dump"), ("json", "dump_json")):
+                size, server_ms = server_serialization(instance, action, lua_function)
+                results.append(
+                    {
+                        "entities": count,
+                        "action": action,
+                        "serializer": serializer,
+                        "bytes": size,
+                        "server_ms": server_ms,
+                        "round_trip_ms": round_trip(instance, action, serializer)
+                        * 1000,
+                    }
+                )
+    return results
+
+
+def print_results(results):
+    print(
+        f"{'Entities':>8} {'Action':<18} {'Serializer':<10} {'Bytes':>10} {'Server ms':>10} {'Round trip ms':>14}"
+    )
+    for result in results:
+        print(
+            f"{result['entities']:>8} {result['action']:<18} {result['serializer']:<10} "
+            f"{result['bytes']:>10} {result['server_ms']:>10.2f} {result['round_trip_ms']:>14.2f}"
+        )
+
+
+if __name__ == "__main__":
+    instance = FactorioInstance(
+        address="localhost",
+        bounding_box=200,
+        tcp_port=27000,
+        fast=True,
+        inventory={},
+    )
+    print_results(run_benchmark(instance))
@@ -7,6 +7,9 @@ from psycopg2.extras import DictRow
 
 from fle.commons.models.program import Program
 from fle.eval.algorithms.mcts import KLDiversityAchievementSampler
+from fle.eval.algorithms.mcts.samplers.kld_achievement_sampler import (
+    AchievementMatrix,
+)
 
 
 class TestKLDiversityAchievementSampler(unittest.TestCase):
@@ -53,6 +56,48 @@ class TestKLDiversityAchievementSampler(unittest.TestCase):
         self.assertIsInstance(kld, float)
         self.assertFalse(np.isnan(kld))
 
+    def test_compute_diversity_scores_matches_pairwise(self):
+        achievements = [
+            {"static": {"stone": 5, "iron-ore": 9}, "dynamic": {"iron-plate": 1}},
+            {"static": {"stone": 7, "iron-ore": 9}, "dynamic": {"iron-plate": 2}},
+            {"static": {"stone": 5, "coal": 3}, "dynamic": {}},
+        ]
+        matrix = AchievementMatrix()
+        frequencies = []
+        for program_id, achievement in enumerate(achievements):
+            frequencies.append(
+                self.sampler._compute_achievement_frequencies(achievement)
+            )
+            matrix.add(program_id, frequencies[-1])
+
+        scores = self.sampler._compute_diversity_scores(matrix.select([0, 1, 2]))
+
+        # The window shares one vocabulary, so pad each distribution with its zeros
+        vocabulary = set().union(*frequencies)
+        padded = [
+            Counter({key: freq[key] for key in vocabulary}) for freq in frequencies
+        ]
+        expected = [
+            sum(
+                self.sampler._compute_kl_divergence(padded[i], padded[j])
+                for j in range(3)
+                if j != i
+            )
+            for i in range(3)
+        ]
+        np.testing.assert_allclose(scores, expected)
+
+    def test_achievement_matrix_retains_window(self):
+        matrix = AchievementMatrix()
+        for program_id in range(40):
+            matrix.add(program_id, Counter({f"static-item-{program_id}": 1.0}))
+
+        matrix.retain([39, 38])
+
+        self.assertEqual(len(matrix), 2)
+        self.assertNotIn(0, matrix)
+        np.testing.assert_array_equal(matrix.select([38, 39]), np.eye(2))
+
     @patch("numpy.random.choice")
     async def test_sample_parent(self, mock_choice):
         # Mock database results
@@ -108,7 +153,7 @@ class TestKLDiversityAchievementSampler(unittest.TestCase):
         # Verify database queries were called correctly
         mock_cursor.execute.assert_any_call(
             """
-                        SELECT id, achievements_json
+                        SELECT id
                         FROM programs
                         WHERE version = %s 
                         AND achievements_json IS NOT NULL
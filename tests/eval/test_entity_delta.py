@@ -0,0 +1,125 @@
+from fle.commons.models.entity_delta import (
+    EntityDelta,
+    apply_entity_delta,
+    decode_entities,
+    encode_entities,
+    keyed_entities,
+)
+from fle.commons.models.game_state import GameState
+from fle.env.entities import Position
+from fle.env.game_types import Prototype
+
+
+def _entity(name, x, y, **state):
+    return {"name": name, "position": {"x": x, "y": y}, **state}
+
+
+BASE = [
+    _entity("stone-furnace", 1.0, 1.0, status="working"),
+    _entity("iron-chest", 3.5, 3.5),
+    _entity("item-on-ground", 5.25, 5.25, type="coal"),
+    _entity("item-on-ground", 5.25, 5.25, type="stone"),
+    _entity("character", 0, 0, agent_index=1),
+]
+
+
+def test_keys_match_server_format():
+    assert list(keyed_entities(BASE)) == [
+        "stone-furnace@1,1#1",
+        "iron-chest@3.5,3.5#1",
+        "item-on-ground@5.25,5.25#1",
+        "item-on-ground@5.25,5.25#2",
+        "character@1#1",
+    ]
+
+
+def test_apply_entity_delta():
+    delta = EntityDelta(
+        id="next",
+        base="root",
+        changed=[
+            _entity("stone-furnace", 1.0, 1.0, status="no_fuel"),
+            _entity("item-on-ground", 5.25, 5.25, type="coal"),
+            _entity("burner-mining-drill", 8.0, 8.0),
+        ],
+        removed=["iron-chest@3.5,3.5#1", "item-on-ground@5.25,5.25#2"],
+    )
+
+    result = apply_entity_delta(BASE, delta)
+
+    assert sorted((e["name"], e.get("status"), e.get("type")) for e in result) == [
+        ("burner-mining-drill", None, None),
+        ("character", None, None),
+        ("item-on-ground", None, "coal"),
+        ("stone-furnace", "no_fuel", None),
+    ]
+
+
+def test_to_load_list_marks_removals_and_replacements():
+    delta = EntityDelta(
+        id="next",
+        base="root",
+        changed=[_entity("iron-chest", 3.5, 3.5)],
+        removed=["stone-furnace@1,1#1", "character@2#1"],
+    )
+
+    assert delta.to_load_list() == [
+        {"name": "stone-furnace", "position": {"x": 1.0, "y": 1.0}, "removed": True},
+        {**_entity("iron-chest", 3.5, 3.5), "replace": True},
+    ]
+
+
+def test_resolve_delta_chain():
+    root = GameState(
+        entities=encode_entities(BASE), inventories=[{}], research=None, entities_id="a"
+    )
+    child = GameState(
+        entities=encode_entities(
+            {"changed": [_entity("iron-chest", 3.5, 3.5, full=True)], "removed": []}
+        ),
+        inventories=[{}],
+        research=None,
+        entities_id="b",
+        entities_base="a",
+        base=root,
+    )
+    grandchild = GameState(
+        entities=encode_entities({"changed": [], "removed": ["stone-furnace@1,1#1"]}),
+        inventories=[{}],
+        research=None,
+        entities_id="c",
+        entities_base="b",
+        base=child,
+    )
+
+    entities = decode_entities(grandchild.resolve_entities())
+
+    assert grandchild.delta_depth == 2
+    assert len(entities) == len(BASE) - 1
+    assert _entity("iron-chest", 3.5, 3.5, full=True) in entities
+    assert GameState.parse_raw(grandchild.to_raw()).entities == (
+        grandchild.resolve_entities()
+    )
+    assert GameState.parse_raw(grandchild.to_raw(delta=True), base=child).is_delta
+
+
+def test_delta_snapshot_round_trip(instance):
+    instance.reset()
+    root = GameState.from_instance(instance, delta=True)
+    instance.namespace.place_entity(
+        Prototype.IronChest, position=Position(x=2.5, y=2.5)
+    )
+
+    child = GameState.from_instance(instance, base=root)
+
+    assert child.is_delta
+    assert [e["name"] for e in child.entity_delta.changed if e["name"] != "character"]
+
+    instance.reset(root)
+    # The map is at `root` now, so only the delta is applied
+    assert instance._is_at_entity_snapshot(root.entities_id)
+    instance.reset(child)
+
+    assert instance.namespace.get_entities(
+        {Prototype.IronChest}, position=Position(x=2.5, y=2.5)
+    )
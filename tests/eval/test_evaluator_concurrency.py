@@ -0,0 +1,49 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from fle.env.instance import FactorioInstance
+
+
+def _instance(port):
+    # Only the worker thread is needed for `run_async`, not a server
+    instance = FactorioInstance.__new__(FactorioInstance)
+    instance._worker = ThreadPoolExecutor(max_workers=1)
+    instance.tcp_port = port
+    return instance
+
+
+def test_run_async_overlaps_instances():
+    instances = [_instance(27000 + i) for i in range(3)]
+    # Every call blocks until all instances are inside one, so this only finishes if they run concurrently
+    barrier = threading.Barrier(len(instances), timeout=5)
+
+    def blocking_eval(port):
+        barrier.wait()
+        return port
+
+    async def run():
+        return await asyncio.gather(
+            *(inst.run_async(blocking_eval, inst.tcp_port) for inst in instances)
+        )
+
+    assert asyncio.run(run()) == [27000, 27001, 27002]
+
+
+def test_run_async_serialises_calls_per_instance():
+    instance = _instance(27000)
+    active = []
+
+    def blocking_eval(i):
+        active.append(i)
+        assert len(active) == 1
+        threading.Event().wait(0.01)
+        active.remove(i)
+        return i
+
+    async def run():
+        return await asyncio.gather(
+            *(instance.run_async(blocking_eval, i) for i in range(4))
+        )
+
+    assert asyncio.run(run()) == [0, 1, 2, 3]
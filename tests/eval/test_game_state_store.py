@@ -0,0 +1,54 @@
+import pytest
+
+from fle.commons.models.game_state import GameState
+from fle.commons.models.game_state_store import GameStateStore
+
+
+def _state(step):
+    return GameState(
+        entities=f"entities-{step}", inventories=[{"coal": step}], research=None
+    )
+
+
+def test_spills_old_states_and_reads_them_back(tmp_path):
+    store = GameStateStore(max_in_memory=2, spill_dir=str(tmp_path))
+    for step in range(5):
+        assert store.append(_state(step)) == step
+
+    assert len(store) == 5
+    assert len(list(tmp_path.glob("*/*.json.gz"))) == 3
+    assert store.get(0).inventories == [{"coal": 0}]
+    assert store.get(4).entities == "entities-4"
+
+
+def test_rollback_and_pop():
+    store = GameStateStore(max_in_memory=2)
+    for step in range(6):
+        store.append(_state(step))
+
+    assert store.rollback(3).entities == "entities-3"
+    assert store.last_index == 3
+    assert store.append(_state(10)) == 4
+
+    assert store.pop().entities == "entities-10"
+    # Once in-memory states run out, pops come from disk
+    assert [store.pop().entities for _ in range(4)] == [
+        "entities-3",
+        "entities-2",
+        "entities-1",
+        "entities-0",
+    ]
+    assert not store
+
+
+def test_drops_old_states_without_spilling():
+    store = GameStateStore(max_in_memory=2, spill=False)
+    for step in range(4):
+        store.append(_state(step))
+
+    assert len(store) == 2
+    with pytest.raises(KeyError):
+        store.get(0)
+    assert [store.pop().entities for _ in range(2)] == ["entities-3", "entities-2"]
+    with pytest.raises(IndexError):
+        store.pop()
@@ -0,0 +1,84 @@
+import asyncio
+import json
+import sqlite3
+
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from fle.commons.db_client import SQLliteDBClient, create_default_sqlite_db
+from fle.eval.analysis.database_analyzer import DatabaseAnalyzer
+from fle.eval.analysis.results_cache import ResultsCache
+
+
+def insert_program(db_file, version, instance, depth, value, sweep_id, response="ok"):
+    conn = sqlite3.connect(db_file)
+    conn.execute(
+        "INSERT INTO programs (code, conversation_json, version, version_description, model, "
+        "instance, depth, value, raw_reward, token_usage, completion_token_usage, response, "
+        "achievements_json, meta, created_at) VALUES (?, '{}', ?, 'task', 'model', ?, ?, ?, ?, "
+        "10, 4, ?, ?, ?, ?)",
+        (
+            "pass",
+            version,
+            instance,
+            depth,
+            value,
+            value,
+            response,
+            json.dumps({"static": {"iron-plate": 2}, "dynamic": {}}),
+            json.dumps({"sweep_id": sweep_id, "production_score": value * 2}),
+            f"2025-01-01 00:00:{depth:02d}",
+        ),
+    )
+    conn.commit()
+    conn.close()
+
+
+@pytest.fixture
+def db(tmp_path):
+    db_file = str(tmp_path / "data.db")
+    create_default_sqlite_db(db_file)
+    return db_file, SQLliteDBClient(database_file=db_file)
+
+
+def test_export_only_appends_new_programs(db, tmp_path):
+    db_file, client = db
+    cache = ResultsCache(tmp_path / "cache")
+    for depth in range(3):
+        insert_program(db_file, 1, 0, depth, depth, "sweep_a")
+    insert_program(db_file, 2, 0, 0, 5.0, "sweep_b", response="Error: boom")
+
+    assert asyncio.run(cache.export(client)) == 4
+    assert asyncio.run(cache.export(client)) == 0
+
+    insert_program(db_file, 1, 0, 3, 3.0, "sweep_a")
+    assert asyncio.run(cache.export(client, [1])) == 1
+    assert len(list((tmp_path / "cache" / "programs" / "version=1").iterdir())) == 2
+
+    programs = cache.read(versions=[1], columns=["id", "depth", "static_achievements"])
+    assert list(programs.columns) == ["id", "depth", "static_achievements"]
+    assert sorted(programs["depth"]) == [0, 1, 2, 3]
+    assert dict(programs["static_achievements"][0]) == {"iron-plate": 2.0}
+
+    failed = cache.read(sweep_id="sweep_b", columns=["version", "response_ok"])
+    assert failed.to_dict("records") == [{"version": 2, "response_ok": False}]
+
+
+def test_trajectory_summaries_from_cache(db, tmp_path):
+    db_file, client = db
+    for depth in range(3):
+        insert_program(db_file, 1, 0, depth, depth, "sweep_a")
+        insert_program(db_file, 1, 1, depth, depth * 2, "sweep_a")
+    insert_program(db_file, 2, 0, 0, 1.0, "sweep_b")
+
+    analyzer = DatabaseAnalyzer(client, results_cache=ResultsCache(tmp_path / "cache"))
+    summaries = asyncio.run(analyzer.get_trajectory_summaries_by_sweep("sweep_a"))
+
+    assert summaries[["version", "instance"]].values.tolist() == [[1, 0], [1, 1]]
+    second = summaries.iloc[1]
+    assert second["num_steps"] == 3
+    assert second["final_reward"] == 4
+    assert second["max_production_score"] == 8
+    assert second["total_tokens"] == 30
+    assert second["duration_seconds"] == 2
@@ -0,0 +1,76 @@
+import asyncio
+import os
+from datetime import datetime
+
+from fle.eval.infra.server_manager import ServerAllocation
+from fle.eval.infra.worker_pool import SweepWorkerPool
+
+
+def fake_run_job(run_config, version, instance=None):
+    """Stands in for `run_sweep_job`, with an int counting the jobs on this worker as the warm instance"""
+    if run_config == "fail":
+        raise RuntimeError("task failed")
+    if run_config == "crash":
+        os._exit(3)
+    return (instance or 0) + 1
+
+
+def allocation(server_id):
+    return ServerAllocation(
+        server_id=server_id,
+        server_address="127.0.0.1",
+        tcp_port=27000 + server_id,
+        udp_port=34197 + server_id,
+        job_id="",
+        allocated_at=datetime.now(),
+    )
+
+
+def run_jobs(pool, jobs):
+    """Run the jobs on the pool's workers as they become idle, returning their results by job id"""
+
+    async def run():
+        pending = list(jobs)
+        results = {}
+        while len(results) < len(jobs):
+            for worker_id in pool.idle_workers():
+                if pending:
+                    pool.submit(worker_id, *pending.pop(0))
+            for result in await pool.wait_for_results(timeout=1):
+                results[result.job_id] = result
+        return results
+
+    return asyncio.run(run())
+
+
+def test_worker_pool_runs_jobs_on_persistent_workers():
+    pool = SweepWorkerPool(
+        [allocation(0), allocation(1)], "sweep", run_job=fake_run_job
+    )
+    pool.start()
+    try:
+        pids = {worker_id: a.process_id for worker_id, a in pool.allocations.items()}
+        results = run_jobs(
+            pool, [(f"job-{i}", "ok", i) for i in range(4)] + [("bad", "fail", 4)]
+        )
+
+        assert all(results[f"job-{i}"].success for i in range(4))
+        assert not results["bad"].success
+        assert results["bad"].error_message == "task failed"
+        # The same processes ran every job
+        assert {w: a.process_id for w, a in pool.allocations.items()} == pids
+    finally:
+        pool.shutdown()
+
+
+def test_worker_pool_restarts_crashed_worker():
+    pool = SweepWorkerPool([allocation(0)], "sweep", run_job=fake_run_job)
+    pool.start()
+    try:
+        results = run_jobs(pool, [("crash", "crash", 0), ("after", "ok", 1)])
+
+        assert not results["crash"].success
+        assert "code 3" in results["crash"].error_message
+        assert results["after"].success
+    finally:
+        pool.shutdown()
@@ -0,0 +1,56 @@
+from fle.env.gym_env.environment import FactorioGymEnv
+from fle.env.gym_env.action import Action
+from fle.env.entities import Position
+from fle.env.game_types import Prototype
+
+
+def test_observe_matches_individual_tools(instance):
+    """The batched observe call should return the same data as the individual tools."""
+    instance.namespace.place_entity(
+        Prototype.IronChest, position=Position(x=2.5, y=2.5)
+    )
+
+    snapshot = instance.namespace._observe()
+
+    assert snapshot.inventories[0] == instance.namespace.inspect_inventory()
+    assert snapshot.production_score == instance.namespace.score()[0]
+    assert snapshot.elapsed_ticks <= instance.get_elapsed_ticks()
+    assert set(snapshot.research.technologies) == set(
+        instance.namespace._save_research_state().technologies
+    )
+    assert [e.name for e in snapshot.entities] == [
+        e.name for e in instance.namespace.get_entities()
+    ]
+    assert snapshot.entity_state
+
+
+def test_observe_without_entities(instance):
+    snapshot = instance.namespace._observe(
+        include_entities=False, include_entity_state=False
+    )
+
+    assert snapshot.entities is None
+    assert snapshot.entity_state is None
+    assert "input" in snapshot.production_stats
+
+
+def test_batched_and_unbatched_step_agree(instance):
+    """Stepping with and without batched observations should give the same observation."""
+    action = Action(agent_idx=0, code="pass", game_state=None)
+
+    batched_env = FactorioGymEnv(instance, pause_after_action=False)
+    batched_env.reset()
+    batched_obs, _, _, _, batched_info = batched_env.step(action)
+
+    unbatched_env = FactorioGymEnv(
+        instance, pause_after_action=False, batched_observation=False
+    )
+    unbatched_env.reset()
+    unbatched_obs, _, _, _, unbatched_info = unbatched_env.step(action)
+
+    assert batched_obs["inventory"] == unbatched_obs["inventory"]
+    assert batched_obs["entities"] == unbatched_obs["entities"]
+    assert (
+        batched_info["output_game_state"].inventories
+        == unbatched_info["output_game_state"].inventories
+    )
@@ -0,0 +1,77 @@
+import asyncio
+import time
+
+from fastapi.testclient import TestClient
+
+from fle.env.protocols.a2a import server
+from fle.env.protocols.a2a.server import AgentRegistry
+
+
+def message(text):
+    return {
+        "messageId": text,
+        "role": "user",
+        "parts": [{"root": {"text": text}}],
+        "metadata": {"sender": "agent_0"},
+    }
+
+
+def test_messages_since_cursor_with_bounded_retention():
+    registry = AgentRegistry(max_messages=3)
+    registry.register_agent("agent_1", {})
+
+    for i in range(2):
+        registry.store_message("agent_0", "agent_1", message(f"m{i}"))
+    messages, cursor = registry.get_messages("agent_1")
+    assert [m["content"] for m in messages] == ["m0", "m1"]
+
+    for i in range(2, 6):
+        registry.store_message("agent_0", "agent_1", message(f"m{i}"))
+    messages, cursor = registry.get_messages("agent_1", since=cursor)
+    # m2 was dropped by the retention limit before it was read
+    assert [m["content"] for m in messages] == ["m3", "m4", "m5"]
+    assert registry.get_messages("agent_1", since=cursor) == ([], cursor)
+
+    # Loaded messages come after the cursor, as they replace the inbox
+    loaded_cursor = registry.load_messages("agent_1", [message("restored")])
+    messages, _ = registry.get_messages("agent_1", since=cursor)
+    assert [m["content"] for m in messages] == ["restored"]
+    assert registry.get_messages("agent_1", since=loaded_cursor)[0] == []
+
+
+def test_wait_for_messages_returns_when_a_message_arrives():
+    registry = AgentRegistry()
+    registry.register_agent("agent_1", {})
+
+    async def run():
+        waiter = asyncio.create_task(registry.wait_for_messages("agent_1", 0, 5))
+        await asyncio.sleep(0.05)
+        registry.store_message("agent_0", "agent_1", message("hello"))
+        start = time.monotonic()
+        messages, cursor = await waiter
+        return messages, cursor, time.monotonic() - start
+
+    messages, cursor, waited = asyncio.run(run())
+    assert [m["content"] for m in messages] == ["hello"]
+    assert cursor == 1
+    assert waited < 1
+
+
+def test_get_messages_rpc_returns_cursor(monkeypatch):
+    monkeypatch.setattr(server, "registry", AgentRegistry())
+    client = TestClient(server.app)
+
+    def call(method, **params):
+        response = client.post(
+            "/a2a", json={"jsonrpc": "2.0", "method": method, "params": params}
+        )
+        return response.json()["result"]
+
+    call("register", agent_id="agent_0", agent_card={"name": "agent_0"})
+    call("register", agent_id="agent_1", agent_card={"name": "agent_1"})
+    call("send_message", sender_id="agent_0", message=message("broadcast"))
+
+    result = call("get_messages", agent_id="agent_1", since=0)
+    assert [m["content"] for m in result["messages"]] == ["broadcast"]
+    result = call("get_messages", agent_id="agent_1", since=result["cursor"], wait=0.1)
+    assert result["messages"] == []
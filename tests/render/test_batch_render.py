@@ -0,0 +1,60 @@
+import copy
+import json
+
+from fle.env.tools.admin.render.batch import render_blueprint, render_blueprints
+
+BLUEPRINT = {
+    "blueprint": {
+        "entities": [
+            {
+                "entity_number": 1,
+                "name": "transport-belt",
+                "position": {"x": 0.5, "y": 0.5},
+                "direction": 4,
+            },
+            {
+                "entity_number": 2,
+                "name": "wooden-chest",
+                "position": {"x": 2.5, "y": 0.5},
+            },
+        ]
+    }
+}
+
+
+def test_render_blueprint_without_server():
+    blueprint = copy.deepcopy(BLUEPRINT)
+    rendered = render_blueprint(blueprint)
+
+    assert rendered.viewport.image_width > 0
+    assert rendered.viewport.width_tiles == rendered.viewport.height_tiles == 5
+    assert blueprint == BLUEPRINT
+
+
+def test_render_blueprints_writes_images_and_manifest(tmp_path):
+    blueprints = tmp_path / "blueprints"
+    (blueprints / "smelting").mkdir(parents=True)
+    for path in ["belt.json", "smelting/chest.json"]:
+        (blueprints / path).write_text(json.dumps(BLUEPRINT))
+    (blueprints / "empty.json").write_text(json.dumps({"blueprint": {}}))
+    output = tmp_path / "rendered"
+
+    manifest_path = render_blueprints([blueprints], output, workers=2)
+
+    entries = {
+        json.loads(line)["blueprint"]: json.loads(line)
+        for line in manifest_path.read_text().splitlines()
+    }
+    assert len(entries) == 3
+    assert "error" in entries[str(blueprints / "empty.json")]
+    assert (output / "belt.png").exists()
+    assert (output / "smelting" / "chest.png").exists()
+    chest = entries[str(blueprints / "smelting" / "chest.json")]
+    assert chest["image"] == str(output / "smelting" / "chest.png")
+    assert chest["viewport"]["width_tiles"] == 5
+
+    # Rendered blueprints are skipped when rerun, failed ones are retried
+    render_blueprints([blueprints], output, workers=2)
+    lines = manifest_path.read_text().splitlines()
+    assert len(lines) == 4
+    assert json.loads(lines[-1])["blueprint"] == str(blueprints / "empty.json")
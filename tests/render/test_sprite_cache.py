@@ -0,0 +1,71 @@
+import numpy as np
+from PIL import Image
+
+from fle.env.tools.admin.render.sprite_cache import (
+    SpriteStore,
+    SpriteVariantCache,
+    apply_shadow_intensity,
+    atlas_is_current,
+    build_sprite_atlas,
+)
+
+
+def _sprite(width=6, height=4):
+    pixels = np.random.default_rng(0).integers(
+        0, 256, (height, width, 4), dtype=np.uint8
+    )
+    return Image.fromarray(pixels, "RGBA")
+
+
+def test_shadow_intensity_matches_per_pixel():
+    sprite = _sprite()
+    expected = sprite.copy()
+    pixels = expected.load()
+    for y in range(expected.height):
+        for x in range(expected.width):
+            r, g, b, a = pixels[x, y]
+            pixels[x, y] = (r, g, b, int(a * 0.4))
+
+    assert apply_shadow_intensity(sprite, 0.4).tobytes() == expected.tobytes()
+
+
+def test_variants_are_reused():
+    cache = SpriteVariantCache()
+    sprite = _sprite()
+
+    scaled = cache.get(sprite, 0.5, 0.4)
+
+    assert scaled.size == (3, 2)
+    assert cache.get(sprite, 0.5, 0.4) is scaled
+    assert cache.get(sprite, 0.5, None) is not scaled
+    assert cache.get(_sprite(), 0.5, 0.4) is not scaled
+
+
+def test_atlas_round_trip(tmp_path):
+    _sprite(6, 4).save(tmp_path / "chest.png")
+    _sprite(3, 5).save(tmp_path / "chest_shadow.png")
+
+    build_sprite_atlas(tmp_path)
+    (tmp_path / "chest.png").unlink()
+    store = SpriteStore(tmp_path)
+
+    assert store.get("chest").tobytes() == _sprite(6, 4).tobytes()
+    assert store.get("chest_shadow").size == (3, 5)
+    assert store.get("missing") is None
+
+
+def test_regenerated_sprites_are_not_served_from_atlas(tmp_path):
+    _sprite(6, 4).save(tmp_path / "chest.png")
+    assert not atlas_is_current(tmp_path)
+    build_sprite_atlas(tmp_path)
+    assert atlas_is_current(tmp_path)
+
+    # Regenerated with other pixels, and a new sprite added
+    regenerated = Image.new("RGBA", (6, 4), (255, 0, 0, 255))
+    regenerated.save(tmp_path / "chest.png")
+    assert not atlas_is_current(tmp_path)
+
+    assert SpriteStore(tmp_path).get("chest").tobytes() == regenerated.tobytes()
+    build_sprite_atlas(tmp_path)
+    _sprite(2, 2).save(tmp_path / "belt.png")
+    assert not atlas_is_current(tmp_path)
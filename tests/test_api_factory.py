@@ -0,0 +1,101 @@
+import asyncio
+
+from aiohttp import web
+
+from fle.agents.llm import api_factory
+from fle.agents.llm.api_factory import APIFactory
+
+
+async def start_mock_server(requests, delay=0.0):
+    """OpenAI-compatible server that records the requests it receives"""
+
+    async def chat_completions(request):
+        requests.append(await request.json())
+        response_id = f"chatcmpl-{len(requests)}"
+        await asyncio.sleep(delay)
+        return web.json_response(
+            {
+                "id": response_id,
+                "object": "chat.completion",
+                "created": 0,
+                "model": "mock",
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": {"role": "assistant", "content": "print(1)"},
+                        "finish_reason": "stop",
+                    }
+                ],
+                "usage": {
+                    "prompt_tokens": 1,
+                    "completion_tokens": 1,
+                    "total_tokens": 2,
+                },
+            }
+        )
+
+    app = web.Application()
+    app.router.add_post("/v1/chat/completions", chat_completions)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}/v1"
+
+
+def with_mock_provider(monkeypatch, base_url):
+    monkeypatch.setitem(
+        APIFactory.PROVIDERS,
+        "ollama",
+        {**APIFactory.PROVIDERS["ollama"], "base_url": base_url},
+    )
+
+
+def test_acall_reuses_client(monkeypatch):
+    requests = []
+
+    async def run():
+        runner, base_url = await start_mock_server(requests)
+        with_mock_provider(monkeypatch, base_url)
+        factory = APIFactory("ollama-mock")
+        messages = [
+            {"role": "user", "content": "a"},
+            {"role": "user", "content": "b"},
+        ]
+        for _ in range(2):
+            await factory.acall(messages=messages)
+        pool = api_factory.get_provider_pool()
+        await runner.cleanup()
+        return pool, messages
+
+    pool, messages = asyncio.run(run())
+
+    assert len(requests) == 2
+    assert len(pool.clients) == 1
+    # Merging contiguous messages leaves the caller's messages as they were
+    assert requests[1]["messages"] == [{"role": "user", "content": "a\n\nb"}]
+    assert messages[0] == {"role": "user", "content": "a"}
+
+
+def test_acall_coalesces_identical_requests(monkeypatch):
+    requests = []
+
+    async def run():
+        runner, base_url = await start_mock_server(requests, delay=0.2)
+        with_mock_provider(monkeypatch, base_url)
+        factory = APIFactory("ollama-mock", coalesce_requests=True)
+        messages = [{"role": "user", "content": "hi"}]
+        responses = await asyncio.gather(
+            factory.acall(messages=messages),
+            factory.acall(messages=messages),
+            factory.acall(messages=messages, temperature=1.0),
+        )
+        await runner.cleanup()
+        return responses
+
+    same, coalesced, different = asyncio.run(run())
+
+    assert len(requests) == 2
+    assert same is coalesced
+    assert different.id != same.id
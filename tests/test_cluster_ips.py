@@ -0,0 +1,94 @@
+import json
+import socket
+import subprocess
+
+import pytest
+
+from fle.commons import cluster_ips
+from fle.commons.cluster_ips import ContainerRegistry, FactorioContainer
+
+
+def inspect_entry(name, tcp_port, udp_port):
+    return {
+        "Name": f"/{name}",
+        "NetworkSettings": {
+            "Ports": {
+                "27015/tcp": [{"HostIp": "0.0.0.0", "HostPort": str(tcp_port)}],
+                "34197/udp": [{"HostIp": "0.0.0.0", "HostPort": str(udp_port)}],
+            }
+        },
+    }
+
+
+@pytest.fixture
+def docker(monkeypatch):
+    """Fake Docker CLI with two containers, recording the commands it is called with"""
+    state = {
+        "commands": [],
+        "containers": {
+            "b2": inspect_entry("factorio_1", 27001, 34198),
+            "a1": inspect_entry("factorio_0", 27000, 34197),
+        },
+    }
+
+    def run(cmd, capture_output=True, text=True):
+        state["commands"].append(cmd)
+        if cmd[1] == "ps":
+            stdout = "\n".join(state["containers"])
+        else:
+            stdout = json.dumps([state["containers"][i] for i in cmd[2:]])
+        return subprocess.CompletedProcess(cmd, 0, stdout=stdout, stderr="")
+
+    monkeypatch.setattr(cluster_ips.subprocess, "run", run)
+    return state
+
+
+def test_containers_are_discovered_with_one_inspect_and_cached(docker, tmp_path):
+    cache_path = tmp_path / "containers.json"
+    registry = ContainerRegistry(cache_path=cache_path, ttl_seconds=60)
+
+    containers = registry.containers()
+    assert [c.name for c in containers] == ["factorio_0", "factorio_1"]
+    assert containers[1] == FactorioContainer("factorio_1", "127.0.0.1", 27001, 34198)
+    assert docker["commands"] == [
+        ["docker", "ps", "-q", "--filter", "name=factorio_"],
+        ["docker", "inspect", "b2", "a1"],
+    ]
+
+    # Another process reads the containers from the cache file
+    assert ContainerRegistry(cache_path=cache_path).containers() == containers
+    assert registry.containers() == containers
+    assert len(docker["commands"]) == 2
+
+    # Until it expires
+    assert ContainerRegistry(cache_path=cache_path, ttl_seconds=0).containers()
+    assert len(docker["commands"]) == 4
+
+
+def test_get_rediscovers_containers_that_stopped_answering(
+    docker, tmp_path, monkeypatch
+):
+    registry = ContainerRegistry(cache_path=tmp_path / "containers.json")
+    registry.containers()
+
+    # factorio_0 was recreated with another port
+    docker["containers"]["a1"] = inspect_entry("factorio_0", 27002, 34199)
+    monkeypatch.setattr(
+        registry, "is_alive", lambda container: container.tcp_port != 27000
+    )
+    assert registry.get(0).tcp_port == 27001
+    assert registry.get(1).tcp_port == 27002
+
+    with pytest.raises(RuntimeError):
+        registry.get(2)
+
+
+def test_closed_port_is_not_alive(tmp_path):
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    registry = ContainerRegistry(cache_path=tmp_path / "containers.json")
+
+    assert not registry.is_alive(
+        FactorioContainer("factorio_0", "127.0.0.1", port, port)
+    )
@@ -0,0 +1,163 @@
+import asyncio
+import json
+import sqlite3
+
+import pytest
+
+from fle.commons.db_client import SQLliteDBClient, create_default_sqlite_db
+from fle.commons.models.conversation import Conversation
+from fle.commons.models.message import Message
+from fle.commons.models.message_store import MessageStore, message_store
+from fle.commons.models.program import Program
+
+
+def test_migrates_existing_programs_table(tmp_path):
+    db_file = str(tmp_path / "data.db")
+    conn = sqlite3.connect(db_file)
+    conn.execute(
+        "CREATE TABLE programs (id INTEGER PRIMARY KEY, code TEXT, version INTEGER, value REAL, "
+        "conversation_json TEXT NOT NULL, created_at DATETIME DEFAULT CURRENT_TIMESTAMP)"
+    )
+    conn.execute(
+        "INSERT INTO programs (code, version, conversation_json) VALUES (?, ?, ?)",
+        ("pass", 1, json.dumps({"messages": [{"role": "user", "content": "hi"}] * 3})),
+    )
+    conn.commit()
+    conn.close()
+
+    create_default_sqlite_db(db_file)
+    # Running it again is a no-op
+    create_default_sqlite_db(db_file)
+
+    conn = sqlite3.connect(db_file)
+    assert conn.execute("SELECT conversation_length FROM programs").fetchall() == [(3,)]
+    indexes = {row[1] for row in conn.execute("PRAGMA index_list(programs)").fetchall()}
+    assert {
+        "idx_programs_version_value",
+        "idx_programs_version_created_at",
+    } <= indexes
+    conn.close()
+
+
+def test_create_program_records_conversation_length(tmp_path):
+    db_file = str(tmp_path / "data.db")
+    create_default_sqlite_db(db_file)
+    client = SQLliteDBClient(database_file=db_file)
+    conversation = Conversation(
+        messages=[
+            Message(role="system", content="system"),
+            Message(role="user", content="hi"),
+        ]
+    )
+
+    program = asyncio.run(
+        client.create_program(Program(code="pass", conversation=conversation))
+    )
+
+    conn = sqlite3.connect(db_file)
+    assert conn.execute(
+        "SELECT conversation_length FROM programs WHERE id = ?", (program.id,)
+    ).fetchone() == (2,)
+    conn.close()
+
+
+def test_deduplicated_conversations_round_trip(tmp_path):
+    db_file = str(tmp_path / "data.db")
+    create_default_sqlite_db(db_file)
+    client = SQLliteDBClient(database_file=db_file, deduplicate_conversations=True)
+    parent = Conversation(
+        messages=[
+            Message(role="system", content="system"),
+            Message(role="user", content="hi"),
+        ]
+    )
+    child = parent.model_copy(deep=True)
+    child.add_result("print(1)", "1", step=1)
+
+    asyncio.run(client.create_program(Program(code="a", conversation=parent)))
+    program = asyncio.run(client.create_program(Program(code="b", conversation=child)))
+
+    conn = sqlite3.connect(db_file)
+    assert conn.execute("SELECT COUNT(*) FROM messages").fetchone() == (4,)
+    (stored,) = conn.execute(
+        "SELECT conversation_json FROM programs WHERE id = ?", (program.id,)
+    ).fetchone()
+    conn.close()
+
+    # Resolved from the database once the in-process cache is cold
+    message_store.clear()
+    assert Conversation.parse_raw(json.loads(stored)) == child
+
+
+def test_message_store_evicts_and_loads_missing():
+    store = MessageStore(maxsize=1)
+    first = store.add({"role": "user", "content": "first"})
+    second = store.add({"role": "user", "content": "second"})
+
+    with pytest.raises(KeyError):
+        store.get_many([first])
+
+    store.add_loader(lambda hashes: {first: {"role": "user", "content": "first"}})
+    assert [m["content"] for m in store.get_many([first, second, first])] == [
+        "first",
+        "second",
+        "first",
+    ]
+
+
+def test_create_programs_in_one_batch(tmp_path):
+    db_file = str(tmp_path / "data.db")
+    create_default_sqlite_db(db_file)
+    client = SQLliteDBClient(database_file=db_file, max_connections=2)
+    conversation = Conversation(messages=[Message(role="user", content="hi")])
+
+    async def save():
+        # Concurrent calls run on the client's worker threads
+        return await asyncio.gather(
+            client.create_programs(
+                [Program(code=f"a{i}", conversation=conversation) for i in range(3)]
+            ),
+            client.create_program(Program(code="b", conversation=conversation)),
+            client.get_largest_version(),
+        )
+
+    batch, single, _ = asyncio.run(save())
+
+    ids = [program.id for program in batch] + [single.id]
+    assert len(set(ids)) == 4
+    rows = asyncio.run(client.execute_query("SELECT code FROM programs ORDER BY id"))
+    assert sorted(row["code"] for row in rows) == ["a0", "a1", "a2", "b"]
+    asyncio.run(client.cleanup())
+
+
+def test_cleanup_only_removes_its_own_message_loader(tmp_path):
+    first_file, second_file = str(tmp_path / "first.db"), str(tmp_path / "second.db")
+    create_default_sqlite_db(first_file)
+    create_default_sqlite_db(second_file)
+    first = SQLliteDBClient(database_file=first_file, deduplicate_conversations=True)
+    program = asyncio.run(
+        first.create_program(
+            Program(
+                code="pass",
+                conversation=Conversation(
+                    messages=[Message(role="user", content="only in first")]
+                ),
+            )
+        )
+    )
+    second = SQLliteDBClient(database_file=second_file)
+    assert message_store.loaders[-2:] == [first.load_messages, second.load_messages]
+
+    # The first client still loads its messages once a later client is cleaned up
+    asyncio.run(second.cleanup())
+    message_store.clear()
+    conn = sqlite3.connect(first_file)
+    row = conn.execute(
+        "SELECT conversation_json FROM programs WHERE id = ?", (program.id,)
+    ).fetchone()
+    conn.close()
+    conversation = Conversation.parse_raw(json.loads(row[0]))
+    assert conversation.messages[0].content == "only in first"
+
+    asyncio.run(first.cleanup())
+    assert first.load_messages not in message_store.loaders
@@ -0,0 +1,96 @@
+import os
+from types import SimpleNamespace
+
+from fle.env import lua_manager
+from fle.env.lua_manager import LuaScriptManager, find_tools, read_script
+from fle.env.namespace import FactorioNamespace
+
+CLIENT = """
+class {class_name}:
+    created = 0
+
+    def __init__(self, manager, namespace):
+        type(self).created += 1
+        self.namespace = namespace
+
+    def __call__(self, *args):
+        return ("{name}", self.namespace.agent_index, args)
+"""
+
+
+def make_tools(root):
+    for directory, name, class_name in [
+        ("agent", "move_to", "MoveTo"),
+        ("admin", "reset", "Reset"),
+    ]:
+        tool_dir = root / directory / name
+        tool_dir.mkdir(parents=True)
+        (tool_dir / "client.py").write_text(
+            CLIENT.format(name=name, class_name=class_name)
+        )
+        (tool_dir / "server.lua").write_text(f"-- {name}")
+    return root
+
+
+class FakeManager(LuaScriptManager):
+    """Manager without a game, recording the tools it loads"""
+
+    def __init__(self):
+        self._loaded_tools = set()
+        self.loaded = []
+
+    def load_tool_into_game(self, name):
+        self.loaded.append(name)
+
+
+def test_tools_are_created_on_first_use(tmp_path, monkeypatch):
+    monkeypatch.setenv("FLE_TOOLS_DIR", str(make_tools(tmp_path / "tools")))
+    instance = SimpleNamespace(tcp_port=0, pre_tool_hooks={}, post_tool_hooks={})
+    instance.namespaces = [FactorioNamespace(instance, i) for i in range(2)]
+    manager = FakeManager()
+
+    manager.setup_tools(instance)
+
+    # The Lua of every tool is loaded, but no controller is created yet
+    assert sorted(manager.loaded) == ["move_to", "reset"]
+    assert instance.controllers == {}
+    namespace = instance.namespaces[1]
+    namespace.score = lambda: (0, 0)
+    assert {"move_to", "_reset"} <= set(dir(namespace))
+    namespace.reset()
+    assert instance.controllers == {}
+
+    _, _, result = namespace.eval_with_timeout("print(move_to(1))")
+    assert "('move_to', 1, (1,))" in result
+    move_to_class = type(instance.controllers["move_to"])
+    assert move_to_class.created == 1
+    assert namespace._reset() == ("reset", 1, ())
+    assert instance.namespaces[0].move_to(2) == ("move_to", 0, (2,))
+    assert move_to_class.created == 2
+
+    # Modules are imported once per process, and tools set up again start over lazily
+    manager.setup_tools(instance)
+    assert namespace.move_to(3) == ("move_to", 1, (3,))
+    assert move_to_class.created == 3
+    assert type(instance.controllers["move_to"]) is move_to_class
+
+
+def test_tools_and_scripts_are_read_once(tmp_path):
+    tool_dir = str(make_tools(tmp_path / "tools"))
+
+    tools = find_tools(tool_dir)
+    assert sorted((t.directory_name, t.name, t.class_name) for t in tools) == [
+        ("admin", "reset", "Reset"),
+        ("agent", "move_to", "MoveTo"),
+    ]
+    assert find_tools(tool_dir) is tools
+
+    script = tmp_path / "tools" / "agent" / "move_to" / "server.lua"
+    content, checksum = read_script(str(script))
+    assert content == "-- move_to"
+    assert lua_manager._script_cache[str(script)][2] == checksum
+
+    script.write_text("-- changed")
+    stat = script.stat()
+    os.utime(script, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert read_script(str(script)) != (content, checksum)
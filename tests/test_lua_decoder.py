@@ -0,0 +1,43 @@
+import pytest
+from slpp import slpp as lua
+
+from fle.env.utils.lua_decoder import LuaDecodeError, decode
+from fle.env.utils.rcon import _lua2python
+
+DUMPS = [
+    '{ ["a"] = true,["b"] = { ["iron-plate"] = 10,["coal"] = 5,} ,} ',
+    '{ ["a"] = true,["b"] = { [1] = { ["name"] = "stone-furnace",["position"] = { ["x"] = 10.5,["y"] = -3.5,} ,} ,[2] = { } ,} ,} ',
+    '{ ["a"] = true,["b"] = { [0] = "first",[1] = "second",} ,} ',
+    '{ ["a"] = true,["b"] = { ["energy"] = 1e+20,["ratio"] = 1.5e-07,["big"] = 12345678901,} ,} ',
+    '{ ["a"] = true,["b"] = { ["status"] = "x[1] = 2",["note"] = "a,}",} ,} ',
+    '{ ["a"] = true,["b"] = { ["speed"] = inf,["name"] = "it\\"s",} ,} ',
+    '{ ["a"] = true,["b"] = 42,} ',
+]
+
+
+@pytest.mark.parametrize("response", DUMPS)
+def test_decode_matches_slpp(response):
+    assert decode(response) == lua.decode(response)
+
+
+def test_decode_embedded_json():
+    response = '{ ["a"] = true,["b"] = {"status":"found","path":[{"x":1,"y":2}]},} '
+
+    assert decode(response) == {
+        "a": True,
+        "b": {"status": "found", "path": [{"x": 1, "y": 2}]},
+    }
+
+
+def test_decode_rejects_error_strings():
+    with pytest.raises(LuaDecodeError):
+        decode('{ ["a"] = false,["b"] = ["string global"],}')
+
+
+def test_lua2python_removes_numerical_keys():
+    response, _ = _lua2python(
+        "pcall(storage.actions.get_entities,1)",
+        '{ ["a"] = true,["b"] = { [1] = "iron-chest",[2] = "stone-furnace",} ,} ',
+    )
+
+    assert response == {"a": True, "b": ["iron-chest", "stone-furnace"]}
@@ -0,0 +1,71 @@
+import math
+from pathlib import Path
+
+import pytest
+from lupa.lua54 import LuaRuntime
+
+from fle.env.utils.rcon import _json2python, _lua2python
+
+UTILS = Path(__file__).parents[1] / "fle" / "env" / "mods" / "utils.lua"
+
+# Stand-ins for the game API utils.lua touches while loading
+STUBS = """
+storage = {utils = {}}
+script = setmetatable({}, {__index = function() return function() end end})
+defines = setmetatable({}, {__index = function(t) return t end})
+helpers = {json_to_table = function(s)
+    if s == '{"status":"found"}' then return {status = "found"} end
+end}
+"""
+
+
+@pytest.fixture(scope="module")
+def lua():
+    runtime = LuaRuntime()
+    runtime.execute(STUBS)
+    runtime.execute(UTILS.read_text())
+    return runtime
+
+
+def _serialize(lua, serializer, table):
+    return lua.eval(f"{serializer}({{a = true, b = {table}}})")
+
+
+@pytest.mark.parametrize(
+    "table",
+    [
+        '{name = "\\"iron-chest\\"", position = {x = 1.5, y = -2}, amount = 10}',
+        '{status = "\\"x[1] = 2, }\\""}',
+        '{path = \'{"status":"found"}\'}',
+        "{}",
+    ],
+)
+def test_json_decodes_like_dump(lua, table):
+    dumped, _ = _lua2python("", _serialize(lua, "dump", table))
+    json, _ = _json2python("", _serialize(lua, "dump_json", table))
+
+    assert json == dumped
+
+
+def test_json_sequences_and_special_values(lua):
+    response, _ = _json2python(
+        "",
+        _serialize(
+            lua,
+            "dump_json",
+            '{{1, 2}, {[2] = "sparse"}, math.huge, -math.huge, 0/0, "line\\n\\1\\t"}',
+        ),
+    )
+
+    items, sparse, inf, negative_inf, nan, text = response["b"]
+    assert items == [1, 2]
+    assert sparse == {"2": "sparse"}
+    assert inf == math.inf and negative_inf == -math.inf and nan is None
+    assert text == "line\n\x01\t"
+
+
+def test_dump_is_unchanged(lua):
+    assert (
+        lua.eval('dump({b = {1, {x = "\\"y\\""}}})')
+        == '{ ["b"] = { [1] = 1,[2] = { ["x"] = "y",} ,} ,} '
+    )
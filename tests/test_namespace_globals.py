@@ -0,0 +1,38 @@
+from types import SimpleNamespace
+
+from fle.env.namespace import FactorioNamespace
+
+
+def _namespace():
+    # Enough of an instance for programs that don't call any tools
+    namespace = FactorioNamespace(SimpleNamespace(tcp_port=0), 0)
+    namespace.score = lambda: (0, 0)
+    return namespace
+
+
+def test_cached_globals_follow_namespace_attributes():
+    namespace = _namespace()
+    namespace.eval_with_timeout("x = 1")
+
+    namespace.new_tool = lambda: "loaded later"
+    namespace.pi = 3
+    _, _, result = namespace.eval_with_timeout("print(new_tool(), pi)")
+    assert "1: ('loaded later', 3)" in result
+
+    del namespace.new_tool
+    _, _, result = namespace.eval_with_timeout("print(x)\nprint(new_tool)")
+
+    assert "1: (1,)" in result
+    assert "NameError" in result
+
+
+def test_functions_defined_mid_program_are_bound():
+    namespace = _namespace()
+    _, _, result = namespace.eval_with_timeout(
+        "def double(x):\n    return 2 * x\ny = double(2)\nprint(double(y))"
+    )
+
+    assert "4: (8,)" in result
+    assert namespace.persistent_vars["y"] == 4
+    _, _, result = namespace.eval_with_timeout("print(double(5))")
+    assert "1: (10,)" in result
@@ -0,0 +1,78 @@
+from types import SimpleNamespace
+
+import pytest
+
+from fle.env.namespace import FactorioNamespace
+from fle.env.utils.program_compiler import compile_program
+
+
+def _namespace(compiled):
+    # Enough of an instance for programs that don't call any tools
+    namespace = FactorioNamespace(SimpleNamespace(tcp_port=0), 0)
+    namespace.score = lambda: (0, 0)
+    namespace.compiled_execution = compiled
+    return namespace
+
+
+PROGRAMS = [
+    "x = 1\nprint(x)\ny = x + 1\nprint(x, y)",
+    "def f(a):\n    print('in f', a)\n    return a * 2\nz = f(3)\nprint(z)",
+    "a = 1\nb = undefined_thing\nc = 3",
+    "try:\n    1/0\nexcept ZeroDivisionError as e:\n    print('caught', e)\nprint('ok')",
+    "x = 2\nreturn x * 3\nprint('unreachable')",
+    "import math\nprint(math.sqrt(16))\nfrom math import floor as fl\nprint(fl(2.5))",
+    "data: list = [1, 2]\ndata.append(3)\nprint(data)",
+    "q = {k: k * k for k in range(3)}\nif q:\n    print(sorted(q.items()))",
+]
+
+
+@pytest.mark.parametrize("program", PROGRAMS)
+def test_compiled_matches_interpreted(program):
+    interpreted, compiled = _namespace(False), _namespace(True)
+
+    assert compiled.eval_with_timeout(program) == interpreted.eval_with_timeout(program)
+    assert compiled.persistent_vars.keys() == interpreted.persistent_vars.keys()
+
+
+def test_compiled_rolls_back_failed_statement():
+    namespace = _namespace(True)
+    _, _, result = namespace.eval_with_timeout(
+        "a = 1\nfor i in range(3):\n    a = i\n    if i == 2:\n        raise ValueError('boom')"
+    )
+
+    assert "ValueError: boom" in result
+    assert namespace.persistent_vars["a"] == 1
+
+
+def test_compiled_functions_persist_across_calls():
+    namespace = _namespace(True)
+    namespace.eval_with_timeout(
+        "def square(v):\n    print('square', v)\n    return v * v"
+    )
+
+    _, _, result = namespace.eval_with_timeout("print(square(4))")
+
+    assert result == "1: ('square', 4)\n1: (16,)"
+
+
+def test_compiled_persists_none_assignments():
+    namespace = _namespace(True)
+    namespace.eval_with_timeout("x = None")
+
+    _, _, result = namespace.eval_with_timeout("print(x)")
+
+    assert "x" in namespace.persistent_vars
+    assert result == "1: (None,)"
+
+
+def test_compiled_loops_stop_at_timeout():
+    _, _, result = _namespace(True).eval_with_timeout(
+        "while True:\n    pass", timeout=0.1
+    )
+
+    assert "TimeoutError" in result
+
+
+def test_compiled_programs_are_cached():
+    assert compile_program("x = 1") is compile_program("x = 1")
+    assert compile_program("x = 1").names == ("x",)
@@ -0,0 +1,40 @@
+from fle.env.entities import Chest
+from fle.env.game_types import Prototype, prototype_entry
+from fle.env.tools.agent.get_entities.client import GetEntities
+
+
+def test_prototype_entry_matches_enum_scan():
+    for prototype in Prototype:
+        entry = prototype_entry(prototype.value[0].replace("-", "_"))
+        entity_class = prototype.value[1]
+        while isinstance(entity_class, tuple):
+            entity_class = entity_class[1]
+
+        assert entry.prototype is prototype
+        assert entry.entity_class is entity_class
+
+    assert prototype_entry("entity-ghost") is None
+
+
+def test_materialize_uses_prototype_entries():
+    # `_materialize` only needs the response helpers, not a server connection
+    tool = GetEntities.__new__(GetEntities)
+    response = [
+        {
+            "name": "iron-chest",
+            "position": {"x": i + 0.5, "y": 0.5},
+            "direction": 0,
+            "energy": 0,
+            "health": 200,
+            "dimensions": {"width": 1, "height": 1},
+            "tile_dimensions": {"tile_width": 1, "tile_height": 1},
+            "inventory": {"coal": i},
+        }
+        for i in range(3)
+    ]
+
+    chests = tool._materialize(response, {Prototype.IronChest})
+
+    assert [type(chest) for chest in chests] == [Chest] * 3
+    assert chests[2].prototype is Prototype.IronChest
+    assert chests[2].inventory.get(Prototype.Coal) == 2
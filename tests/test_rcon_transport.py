@@ -0,0 +1,102 @@
+import asyncio
+import socket
+import struct
+import threading
+
+import pytest
+from factorio_rcon import RCONClosed
+
+from fle.env.utils.rcon_transport import PipelinedRCONClient, _build_packet
+
+
+def _read_packet(conn):
+    size = struct.unpack("<i", conn.recv(4, socket.MSG_WAITALL))[0]
+    data = conn.recv(size, socket.MSG_WAITALL)
+    packet_id, packet_type = struct.unpack_from("<ii", data)
+    return packet_id, packet_type, data[8:-2].decode()
+
+
+class FakeRCONServer:
+    """Answers commands with their own text, `batch` packets at a time and in reverse order"""
+
+    def __init__(self, batch=1):
+        self.batch = batch
+        self.listener = socket.create_server(("127.0.0.1", 0))
+        self.port = self.listener.getsockname()[1]
+        self.thread = threading.Thread(target=self._serve, daemon=True)
+        self.thread.start()
+
+    def _serve(self):
+        conn, _ = self.listener.accept()
+        with conn:
+            auth_id, _, _ = _read_packet(conn)
+            conn.sendall(_build_packet(auth_id, 2, ""))
+            while True:
+                try:
+                    packets = [_read_packet(conn) for _ in range(self.batch)]
+                except (struct.error, OSError):
+                    return
+                for packet_id, _, body in reversed(packets):
+                    conn.sendall(_build_packet(packet_id, 0, f"echo {body}\n"))
+
+    def close(self):
+        self.listener.close()
+
+
+@pytest.fixture
+def server():
+    server = FakeRCONServer(batch=3)
+    yield server
+    server.close()
+
+
+def test_replies_are_matched_by_packet_id(server):
+    client = PipelinedRCONClient("127.0.0.1", server.port, "", timeout=5)
+
+    results = client.send_commands({"a": "first", "b": "second", "c": "third"})
+
+    assert results == {"a": "echo first", "b": "echo second", "c": "echo third"}
+    client.close()
+
+
+def test_concurrent_send_command(server):
+    client = PipelinedRCONClient("127.0.0.1", server.port, "", timeout=5)
+    results = {}
+
+    def call(name):
+        results[name] = client.send_command(name)
+
+    threads = [threading.Thread(target=call, args=(name,)) for name in "xyz"]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == {name: f"echo {name}" for name in "xyz"}
+    client.close()
+
+
+def test_send_commands_async(server):
+    client = PipelinedRCONClient("127.0.0.1", server.port, "", timeout=5)
+
+    async def run():
+        return await asyncio.gather(
+            client.send_command_async("one"),
+            client.send_command_async("two"),
+            client.send_command_async("three"),
+        )
+
+    assert asyncio.run(run()) == ["echo one", "echo two", "echo three"]
+    client.close()
+
+
+def test_close_fails_pending_requests(server):
+    client = PipelinedRCONClient("127.0.0.1", server.port, "", timeout=5)
+
+    # The server waits for three packets before answering, so this stays in flight
+    future = client.submit("pending")
+    client.close()
+
+    with pytest.raises(RCONClosed):
+        future.result(timeout=1)
+    assert client.rcon_socket is None
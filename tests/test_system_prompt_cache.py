@@ -0,0 +1,52 @@
+import pytest
+
+from fle.env.utils.controller_loader import system_prompt_generator
+from fle.env.utils.controller_loader.system_prompt_generator import (
+    SystemPromptGenerator,
+)
+
+
+@pytest.fixture
+def generations(tmp_path, monkeypatch):
+    """Prompt sources in a temporary directory, with an empty prompt cache and generation stubbed out"""
+    tool = tmp_path / "env" / "tools" / "agent" / "move_to"
+    tool.mkdir(parents=True)
+    (tool / "client.py").write_text("class MoveTo: pass\n")
+    (tool / "agent.md").write_text("## move_to\n")
+    (tmp_path / "env" / "tools" / "agent.md").write_text("## Patterns\n")
+    (tmp_path / "env" / "game_types.py").write_text("")
+    (tmp_path / "env" / "entities.py").write_text("")
+
+    calls = []
+
+    def generate(self, multiagent_str=""):
+        calls.append(multiagent_str)
+        return f"prompt {len(calls)} {multiagent_str}"
+
+    monkeypatch.setattr(SystemPromptGenerator, "_generate", generate)
+    monkeypatch.setattr(system_prompt_generator, "_prompt_cache", {})
+    monkeypatch.setenv("FLE_PROMPT_CACHE_DIR", str(tmp_path / "cache"))
+    return calls
+
+
+def test_prompt_is_cached_until_a_source_changes(generations, tmp_path, monkeypatch):
+    env_path = tmp_path / "env"
+    generator = SystemPromptGenerator(str(env_path))
+    prompt = generator.generate_for_agent()
+    assert generator.generate_for_agent() == prompt
+    assert len(generations) == 1
+
+    # A new process reads the prompt from disk
+    monkeypatch.setattr(system_prompt_generator, "_prompt_cache", {})
+    assert SystemPromptGenerator(str(env_path)).generate_for_agent() == prompt
+    assert len(generations) == 1
+
+    # Each agent of a multiagent run has its own prompt
+    assert generator.generate_for_agent(0, 2) != generator.generate_for_agent(1, 2)
+    assert len(generations) == 3
+
+    # Editing a tool's manual invalidates the cached prompt
+    (env_path / "tools" / "agent" / "move_to" / "agent.md").write_text("## move\n")
+    assert generator.generate_for_agent() != prompt
+    assert len(generations) == 4
+    assert len(list((tmp_path / "cache").glob("*.txt"))) == 4